@@ -4,13 +4,23 @@ import argparse
 
 from ultralytics import YOLO
 import chess.engine
+from src.communication.arm_pool import MultiArmPieceMover, parse_arm_address
+from src.communication.async_tcp_robot import AsyncTCPRobotHand
 from src.communication.tcp_robot import TCPRobotHand
 from src.detection.basler_camera import (
     CameraBoardCapture,
     Orientation,
 )
 from src.ui.gui import gui_main
+from src.core import instrumentation
+from src.core.calibration import PlacementCalibration
+from src.core.engine_pool import EnginePool
 from src.core.game import Game
+from src.core.journal import MoveJournal
+from src.core.recording import GameRecorder, PGNArchive
+from src.core.move_cache import MoveCache
+from src.core.probing import OpeningBook, Tablebase
+from src.core.telemetry import TelemetryRecorder, TravelTimeModel
 
 
 def setup_logging() -> None:
@@ -42,6 +52,13 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--port", type=int, default=6001, help="Port for the robot hand"
     )
+    parser.add_argument(
+        "--arms",
+        type=parse_arm_address,
+        nargs="+",
+        default=None,
+        help="Robot arms sharing the board as ip:port:files, e.g. 192.168.1.6:6001:a-d, instead of --ip and --port",
+    )
     parser.add_argument(
         "--model_path",
         type=str,
@@ -54,6 +71,76 @@ def parse_arguments() -> argparse.Namespace:
         default="stockfish",
         help="Path to the chess engine executable",
     )
+    parser.add_argument(
+        "--max_engines",
+        type=int,
+        default=1,
+        help="Maximum number of chess engine processes sharing the host's cores",
+    )
+    parser.add_argument(
+        "--book_path",
+        type=str,
+        default=None,
+        help="Path to a Polyglot opening book consulted before the engine",
+    )
+    parser.add_argument(
+        "--syzygy_path",
+        type=str,
+        default=None,
+        help="Directory with Syzygy tablebases consulted before the engine",
+    )
+    parser.add_argument(
+        "--move_cache",
+        type=str,
+        default=None,
+        help="Path to a SQLite database caching engine moves across games",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default="logs/game.journal",
+        help="Path to the move journal used to resume a game after a crash",
+    )
+    parser.add_argument(
+        "--pgn_archive",
+        type=str,
+        default="logs/games.pgn",
+        help="Path to the rotating PGN archive games are recorded to",
+    )
+    parser.add_argument(
+        "--async_robot",
+        action="store_true",
+        help="Connect to the robot hand in the background, reconnecting with backoff",
+    )
+    parser.add_argument(
+        "--telemetry_dir",
+        type=str,
+        default="logs/telemetry",
+        help="Directory robot move telemetry is recorded to and travel times are fitted from",
+    )
+    parser.add_argument(
+        "--calibration",
+        type=str,
+        default="logs/placement.json",
+        help="Path to the learned placement bias of the robot hand, compensated in its moves",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Analyse human replies while the robot hand executes its move",
+    )
+    parser.add_argument(
+        "--metrics_interval",
+        type=float,
+        default=None,
+        help="Enable stage latency instrumentation and dump a summary every N seconds",
+    )
+    parser.add_argument(
+        "--metrics_json",
+        type=str,
+        default=None,
+        help="JSON file the latency summary is dumped to instead of the log",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     return parser.parse_args()
 
@@ -62,8 +149,34 @@ def main() -> None:
     setup_logging()
     args = parse_arguments()
 
+    if args.metrics_interval:
+        instrumentation.start_reporting(args.metrics_interval, args.metrics_json)
+
+    telemetry = None
     try:
-        robot_hand = TCPRobotHand(ip=args.ip, port=args.port, timeout=30)
+        telemetry = TelemetryRecorder(args.telemetry_dir)
+        travel_time_model = TravelTimeModel.from_directory(args.telemetry_dir)
+        logging.info(
+            "Travel time model fitted to %d robot moves", travel_time_model.sample_count
+        )
+        if args.arms:
+            robot_hand = MultiArmPieceMover.from_addresses(
+                args.arms, timeout=30, telemetry=telemetry
+            )
+        elif args.async_robot:
+            robot_hand = AsyncTCPRobotHand(
+                ip=args.ip, port=args.port, command_timeout=30, telemetry=telemetry
+            )
+            # The game resets the robot hand on construction, which must reach the hand
+            if not robot_hand.wait_connected(timeout=30):
+                robot_hand.close()
+                raise ConnectionError(
+                    f"Could not connect to the robot hand {args.ip}:{args.port}"
+                )
+        else:
+            robot_hand = TCPRobotHand(
+                ip=args.ip, port=args.port, timeout=30, telemetry=telemetry
+            )
         model = YOLO(args.model_path)
         board_capture = CameraBoardCapture(
             model=model,
@@ -73,21 +186,63 @@ def main() -> None:
             visualize_board=args.debug,
         )
 
-        with chess.engine.SimpleEngine.popen_uci(args.engine_path) as engine:
-            logging.info("Chess engine started from %s", args.engine_path)
+        opening_book = OpeningBook(args.book_path) if args.book_path else None
+        tablebase = Tablebase(args.syzygy_path) if args.syzygy_path else None
+        move_cache = MoveCache(args.move_cache) if args.move_cache else None
+        journal_state = MoveJournal.replay(args.journal)
 
+        engine_pool = EnginePool(
+            args.engine_path, skill_levels=[0], max_engines=args.max_engines
+        )
+        try:
+            logging.info(
+                "Chess engine started from %s with options %s",
+                args.engine_path,
+                engine_pool.options,
+            )
+
+            # The robot hand keeps counting the captured pieces of a resumed game
+            resume = (
+                journal_state is not None
+                and journal_state.result is None
+                and bool(journal_state.chess_board.move_stack)
+            )
             game = Game(
-                board_capture=board_capture, piece_mover=robot_hand, engine=engine
+                board_capture=board_capture,
+                piece_mover=robot_hand,
+                engine=None,
+                engine_pool=engine_pool,
+                pipelined=args.pipelined,
+                opening_book=opening_book,
+                tablebase=tablebase,
+                move_cache=move_cache,
+                journal=MoveJournal(args.journal),
+                recorder=GameRecorder(PGNArchive(args.pgn_archive)),
+                travel_time_model=travel_time_model,
+                calibration=PlacementCalibration(path=args.calibration),
+                reset_mover=not resume,
             )
+
+            resume = resume and game.resume(journal_state)
             logging.info("Game initialized, launching GUI...")
-            gui_main(game)
+            gui_main(game, resume=resume)
+            game.close()
+        finally:
+            engine_pool.close()
+            robot_hand.close()
 
     except chess.engine.EngineError:
         logging.exception("Failed to start chess engines")
     except FileNotFoundError:
         logging.exception("File not found")
+    except ConnectionError:
+        logging.exception("Robot hand unreachable!")
     except Exception:
         logging.exception("Unexpected error occurred")
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+        instrumentation.stop_reporting()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+import logging
+import os
+import argparse
+
+from ultralytics import YOLO
+import chess
+import chess.engine
+from src.communication.tcp_robot import TCPRobotHand
+from src.detection.basler_camera import (
+    CameraBoardCapture,
+    Orientation,
+    default_camera_setup,
+)
+from src.detection.batching import DetectionServer
+from src.core import instrumentation
+from src.core.engine_pool import EnginePool
+from src.core.game import Game
+from src.core.orchestrator import TableOrchestrator
+from src.core.recording import GameRecorder, PGNArchive
+
+
+def setup_logging() -> None:
+    log_dir = "logs"
+    log_file = os.path.join(log_dir, "run_tables.log")
+    os.makedirs(log_dir, exist_ok=True)
+
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
+
+    formatter = logging.Formatter(
+        "%(asctime)s %(levelname)s:%(threadName)s:%(name)s:%(message)s"
+    )
+
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
+
+    logging.getLogger("ultralytics").setLevel(logging.CRITICAL)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run several chess-playing robot tables without a GUI."
+    )
+    parser.add_argument(
+        "--table",
+        nargs=3,
+        action="append",
+        required=True,
+        metavar=("IP", "PORT", "CAMERA_SERIAL"),
+        help="Robot hand address and camera serial number of a table; repeat per table",
+    )
+    parser.add_argument(
+        "--model_path",
+        type=str,
+        default="training/models/yolo8_200.onnx",
+        help="Path to YOLO model shared by all tables",
+    )
+    parser.add_argument(
+        "--engine_path",
+        type=str,
+        default="stockfish",
+        help="Path to the chess engine executable",
+    )
+    parser.add_argument(
+        "--max_engines",
+        type=int,
+        default=None,
+        help="Maximum number of chess engine processes, acquired by the tables for each search; defaults to one per table",
+    )
+    parser.add_argument(
+        "--batch_delay",
+        type=float,
+        default=0.01,
+        help="Maximum time to wait for other tables' images to batch detections (seconds)",
+    )
+    parser.add_argument(
+        "--pgn_archive",
+        type=str,
+        default="logs/games.pgn",
+        help="Path to the rotating PGN archive games of all tables are recorded to",
+    )
+    parser.add_argument(
+        "--metrics_interval",
+        type=float,
+        default=None,
+        help="Enable stage latency instrumentation and dump a summary every N seconds",
+    )
+    parser.add_argument(
+        "--metrics_json",
+        type=str,
+        default=None,
+        help="JSON file the latency summary is dumped to instead of the log",
+    )
+    parser.add_argument("--depth", type=int, default=3, help="Engine search depth")
+    parser.add_argument(
+        "--skill_level", type=int, default=4, help="Engine skill level"
+    )
+    parser.add_argument(
+        "--thinking_time", type=float, default=0.5, help="Engine thinking time"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    setup_logging()
+    args = parse_arguments()
+
+    if args.metrics_interval:
+        instrumentation.start_reporting(args.metrics_interval, args.metrics_json)
+
+    engine_pool = EnginePool(
+        args.engine_path,
+        skill_levels=[args.skill_level] * len(args.table),
+        max_engines=args.max_engines or len(args.table),
+    )
+    games = []
+    detection_server = None
+
+    try:
+        model = YOLO(args.model_path)
+        detection_server = DetectionServer(
+            model, max_batch_size=len(args.table), max_delay=args.batch_delay
+        )
+
+        archive = PGNArchive(args.pgn_archive)
+
+        for ip, port, serial_number in args.table:
+            board_capture = CameraBoardCapture(
+                model=model,
+                physical_orientation=Orientation.HUMAN_BOTTOM,
+                max_piece_offset=0.99,
+                timeout=5000,
+                camera=default_camera_setup(serial_number),
+                detection_server=detection_server,
+            )
+            games.append(
+                Game(
+                    board_capture=board_capture,
+                    piece_mover=TCPRobotHand(ip=ip, port=int(port), timeout=30),
+                    engine=None,
+                    engine_pool=engine_pool,
+                    depth=args.depth,
+                    skill_level=args.skill_level,
+                    thinking_time=args.thinking_time,
+                    recorder=GameRecorder(
+                        archive, headers={"Site": f"Table {len(games)}"}
+                    ),
+                )
+            )
+            logging.info("Table %d initialized", len(games) - 1)
+
+        orchestrator = TableOrchestrator(games)
+
+        def on_move(table: int, move: chess.Move, legal: bool) -> None:
+            logging.info(
+                "Table %d: %s move %s", table, "legal" if legal else "illegal", move
+            )
+
+        def on_game_over(table: int, result: str) -> bool:
+            logging.info("Table %d: game over with %s, starting a new game", table, result)
+            games[table].reset_state()
+            return games[table].sync_board()
+
+        orchestrator.run(on_move=on_move, on_game_over=on_game_over)
+
+    except chess.engine.EngineError:
+        logging.exception("Failed to start chess engines")
+    except FileNotFoundError:
+        logging.exception("File not found")
+    except KeyboardInterrupt:
+        logging.info("Stopping tables")
+    except Exception:
+        logging.exception("Unexpected error occurred")
+    finally:
+        for game in games:
+            game.close()
+        if detection_server is not None:
+            detection_server.close()
+        engine_pool.close()
+        instrumentation.stop_reporting()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+import chess
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import PieceOffset, flip_square
+from src.core.telemetry import TelemetryRecorder
+from src.core.moves import (
+    OFF_BOARD_SQUARES,
+    MoveStep,
+    PieceMover,
+    ProgressCallback,
+    piece_move_str,
+)
+
+logger = logging.getLogger(__name__)
+
+# Grid cells of the robot's frame, off-board squares in a column left of the board
+Cell = Tuple[int, int]
+
+
+def square_cell(square: int) -> Cell:
+    """Returns the grid cell of a square in the robot's frame.
+
+    Args:
+        square (int): The square, negative for off-board squares.
+
+    Returns:
+        Cell: The file and rank, off-board squares at file -1 with ranks 0 to 5.
+    """
+    if square in chess.SQUARES:
+        return chess.square_file(square), chess.square_rank(square)
+    return -1, -square - 1
+
+
+def parse_arm_address(address: str) -> Tuple[str, int, chess.Bitboard]:
+    """Parses an arm address of the form "ip:port" or "ip:port:files".
+
+    Args:
+        address (str): The address, e.g. "192.168.1.6:6001:a-d" for an arm reaching files a to d.
+
+    Returns:
+        Tuple[str, int, chess.Bitboard]: IP address, port and reach of the arm, the whole board
+            if no files are given.
+
+    Raises:
+        ValueError: If the address is malformed.
+    """
+    ip, port, *files = address.split(":")
+    reach = chess.BB_ALL
+    if files:
+        first, _, last = files[0].partition("-")
+        first_file = chess.FILE_NAMES.index(first)
+        last_file = chess.FILE_NAMES.index(last or first)
+        reach = chess.BB_EMPTY
+        for file_index in range(first_file, last_file + 1):
+            reach |= chess.BB_FILES[file_index]
+    return ip, int(port), reach
+
+
+class Arm(NamedTuple):
+    """An arm of a `MultiArmPieceMover`.
+
+    Attributes:
+        mover (PieceMover): The arm's own connection, e.g. a `TCPRobotHand`.
+        reach (chess.Bitboard): Board squares the arm reaches, in the robot's frame.
+        off_board (FrozenSet[int]): Off-board squares the arm reaches.
+        home (chess.Square): Square in the robot's frame the arm waits in line with, at the robot's
+            edge of the board, after a reset.
+    """
+
+    mover: PieceMover
+    reach: chess.Bitboard = chess.BB_ALL
+    off_board: FrozenSet[int] = frozenset(OFF_BOARD_SQUARES.values())
+    home: chess.Square = chess.E1
+
+    def reaches(self, square: int) -> bool:
+        """Returns whether the arm reaches a square in the robot's frame."""
+        if square in chess.SQUARES:
+            return bool(self.reach & chess.BB_SQUARES[square])
+        return square in self.off_board
+
+
+class MultiArmPieceMover(PieceMover):
+    """Piece mover driving several arms sharing the board area, each over a connection of its own.
+
+    Every step of a plan is assigned to an arm reaching both of its squares, preferring the arm
+    that is closest to the piece. Steps are started in plan order, but a step does not wait for
+    earlier steps to finish unless they touch the same squares, so arms work in parallel. While
+    an arm executes a step it occupies a collision zone, the rectangles spanned by its approach
+    from its position to the piece and by the step's squares, grown by `clearance` squares. No
+    other arm starts a step overlapping it. An idle arm stays over the square it last placed a
+    piece on and is in the way of other arms' zones, so it is moved back to the robot's edge of
+    the board at its home with `prepare` when it blocks the next step.
+
+    To `Game` it is a single `PieceMover`. Reach, homes and collision zones are given in the
+    robot's frame, like the squares of the robot's commands.
+
+    Attributes:
+        arms (List[Arm]): The arms of the pool.
+        clearance (int): Squares kept clear around the rectangle of a step in progress.
+    """
+
+    def __init__(self, arms: List[Arm], clearance: int = 1) -> None:
+        """Initializes the pool.
+
+        Args:
+            arms (List[Arm]): The arms of the pool.
+            clearance (int): Squares kept clear around a step in progress. Defaults to 1.
+        """
+        self.arms = arms
+        self.clearance = clearance
+
+        self._positions: List[int] = [arm.home for arm in arms]
+        # Whether each arm stays over the board at its position, instead of waiting at the robot's edge
+        self._over_board: List[bool] = [False] * len(arms)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(arms), thread_name_prefix="arm"
+        )
+
+    @classmethod
+    def from_addresses(
+        cls,
+        addresses: List[Tuple[str, int, chess.Bitboard]],
+        timeout: int = 60,
+        clearance: int = 1,
+        telemetry: Optional[TelemetryRecorder] = None,
+    ) -> "MultiArmPieceMover":
+        """Creates a pool of `TCPRobotHand` arms.
+
+        Args:
+            addresses (List[Tuple[str, int, chess.Bitboard]]): IP address, port and reach of every arm.
+            timeout (int): The timeout for socket communication in seconds. Defaults to 60.
+            clearance (int): Squares kept clear around a step in progress. Defaults to 1.
+            telemetry (Optional[TelemetryRecorder]): Records the piece moves of all arms. Defaults to None.
+
+        Returns:
+            MultiArmPieceMover: The pool.
+        """
+        return cls(
+            [
+                Arm(
+                    TCPRobotHand(ip=ip, port=port, timeout=timeout, telemetry=telemetry),
+                    reach=reach,
+                )
+                for ip, port, reach in addresses
+            ],
+            clearance,
+        )
+
+    @property
+    def connected(self) -> bool:
+        """bool: Whether all arms are connected."""
+        return all(arm.mover.connected for arm in self.arms)
+
+    def move_piece(
+        self,
+        from_square: chess.Square,
+        to_square: chess.Square,
+        color: chess.Color,
+        origin_offset: PieceOffset,
+    ) -> bool:
+        """
+        Moves a piece with the closest arm reaching both squares, see `PieceMover.move_piece`.
+
+        Returns:
+            bool: True if the move was executed, False if it failed or no arm reaches the squares.
+        """
+        return self.plan([MoveStep(from_square, to_square, origin_offset)], color) == 1
+
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        """
+        Pre-positions the arm that would pick the piece up, see `PieceMover.prepare`.
+
+        Returns:
+            bool: True if the arm was pre-positioned, False if it failed or no arm reaches the square.
+        """
+        robot_square = self._robot_square(square, color)
+        index = self._closest_arm(robot_square, robot_square, set())
+        if index is None:
+            return False
+        if not self.arms[index].mover.prepare(square, color):
+            return False
+        self._positions[index] = robot_square
+        self._over_board[index] = False
+        return True
+
+    def reset(self) -> bool:
+        """
+        Resets all arms in parallel.
+
+        Returns:
+            bool: True if every arm was reset, False otherwise.
+        """
+        futures = [self._executor.submit(arm.mover.reset) for arm in self.arms]
+        results = [future.result() for future in futures]
+        self._positions = [arm.home for arm in self.arms]
+        self._over_board = [False] * len(self.arms)
+        return all(results)
+
+    def plan(
+        self,
+        steps: List[MoveStep],
+        color: chess.Color,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Executes a plan on the arms, running independent steps in parallel.
+
+        Once a step failed no further steps are started, steps already in progress are finished.
+        `on_progress` is called from the arms' threads, in the order the steps finish.
+
+        Args:
+            steps (List[MoveStep]): The moves to execute in order.
+            color (chess.Color): The color perspective of the mover (e.g., chess.WHITE or chess.BLACK).
+            on_progress (Optional[ProgressCallback]): Called with the index of every finished step and
+                whether it succeeded.
+
+        Returns:
+            int: The number of leading steps executed successfully.
+        """
+        results: List[Optional[bool]] = [None] * len(steps)
+        robot_steps = [
+            (
+                self._robot_square(step.from_square, color),
+                self._robot_square(step.to_square, color),
+            )
+            for step in steps
+        ]
+        # Collision zones of the arms in progress, moving a piece or moving out of the way
+        zones: Dict[int, Set[Cell]] = {}
+        # Arms that failed moving out of the way, not moved again
+        stuck: Set[int] = set()
+        condition = threading.Condition()
+
+        def execute(index: int, arm_index: int) -> None:
+            try:
+                success = self.arms[arm_index].mover.plan([steps[index]], color) == 1
+            except Exception:
+                logger.exception(f"Arm {arm_index} failed moving piece!")
+                success = False
+
+            with condition:
+                results[index] = success
+                del zones[arm_index]
+                if success:
+                    self._positions[arm_index] = robot_steps[index][1]
+                    self._over_board[arm_index] = True
+                condition.notify_all()
+            if on_progress:
+                on_progress(index, success)
+
+        def retract(arm_index: int) -> None:
+            arm = self.arms[arm_index]
+            try:
+                success = arm.mover.prepare(arm.home, chess.WHITE)
+            except Exception:
+                logger.exception(f"Arm {arm_index} failed moving out of the way!")
+                success = False
+
+            with condition:
+                del zones[arm_index]
+                if success:
+                    self._positions[arm_index] = arm.home
+                    self._over_board[arm_index] = False
+                else:
+                    stuck.add(arm_index)
+                condition.notify_all()
+
+        with condition:
+            for index, (from_square, to_square) in enumerate(robot_steps):
+                if not self._reachable(from_square, to_square):
+                    logger.error(
+                        f"No arm reaches piece move {piece_move_str(from_square, to_square)}!"
+                    )
+                    break
+
+                arm_index = None
+                while arm_index is None and False not in results:
+                    if self._depends_on_running(index, robot_steps, results):
+                        condition.wait()
+                        continue
+
+                    arm_index, zone, parked = self._assign_arm(
+                        from_square, to_square, zones
+                    )
+                    if arm_index is not None:
+                        break
+
+                    in_use = set().union(*zones.values())
+                    retractable = {
+                        parked_index
+                        for parked_index in parked - stuck
+                        if not self._zone(
+                            self._positions[parked_index], self.arms[parked_index].home
+                        )
+                        & in_use
+                    }
+                    if retractable:
+                        for parked_index in retractable:
+                            zones[parked_index] = self._zone(
+                                self._positions[parked_index], self.arms[parked_index].home
+                            )
+                            self._executor.submit(retract, parked_index)
+                    elif zones:
+                        condition.wait()
+                    else:
+                        logger.error(
+                            f"Arms in the way of piece move {piece_move_str(from_square, to_square)}!"
+                        )
+                        break
+
+                if arm_index is None:
+                    break
+
+                zones[arm_index] = zone
+                self._executor.submit(execute, index, arm_index)
+
+            condition.wait_for(lambda: not zones)
+
+        completed = 0
+        while completed < len(results) and results[completed]:
+            completed += 1
+        return completed
+
+    def close(self) -> None:
+        """Waits for steps in progress, stops the arms' threads and closes the arms' connections."""
+        self._executor.shutdown()
+        for arm in self.arms:
+            arm.mover.close()
+
+    @staticmethod
+    def _robot_square(square: int, color: chess.Color) -> int:
+        return flip_square(square) if color == chess.BLACK else square
+
+    def _reachable(self, from_square: int, to_square: int) -> bool:
+        return any(
+            arm.reaches(from_square) and arm.reaches(to_square) for arm in self.arms
+        )
+
+    def _candidates(self, from_square: int, to_square: int, busy: Set[int]) -> List[int]:
+        """Returns the idle arms reaching both squares, closest to `from_square` first."""
+        target = square_cell(from_square)
+        return sorted(
+            (
+                index
+                for index, arm in enumerate(self.arms)
+                if index not in busy
+                and arm.reaches(from_square)
+                and arm.reaches(to_square)
+            ),
+            key=lambda index: math.dist(square_cell(self._positions[index]), target),
+        )
+
+    def _closest_arm(
+        self, from_square: int, to_square: int, busy: Set[int]
+    ) -> Optional[int]:
+        """Returns the idle arm reaching both squares closest to `from_square`, None if there is none."""
+        candidates = self._candidates(from_square, to_square, busy)
+        return candidates[0] if candidates else None
+
+    def _assign_arm(
+        self, from_square: int, to_square: int, zones: Dict[int, Set[Cell]]
+    ) -> Tuple[Optional[int], Set[Cell], Set[int]]:
+        """Returns the closest idle arm that can move a piece without a collision and its zone.
+
+        If no arm can, the idle arms staying over the board in the zone of the closest arm are
+        returned instead, to be moved out of the way.
+        """
+        in_use = set().union(*zones.values())
+        blocking: Optional[Set[int]] = None
+        for index in self._candidates(from_square, to_square, set(zones)):
+            zone = self._zone(self._positions[index], from_square) | self._zone(
+                from_square, to_square
+            )
+            parked = {
+                other
+                for other in range(len(self.arms))
+                if other != index
+                and other not in zones
+                and self._over_board[other]
+                and square_cell(self._positions[other]) in zone
+            }
+            if not zone & in_use and not parked:
+                return index, zone, set()
+            if blocking is None:
+                blocking = parked
+        return None, set(), blocking or set()
+
+    def _zone(self, from_square: int, to_square: int) -> Set[Cell]:
+        """Returns the cells an arm may sweep over while moving between two squares."""
+        from_file, from_rank = square_cell(from_square)
+        to_file, to_rank = square_cell(to_square)
+        files = range(
+            min(from_file, to_file) - self.clearance,
+            max(from_file, to_file) + self.clearance + 1,
+        )
+        ranks = range(
+            min(from_rank, to_rank) - self.clearance,
+            max(from_rank, to_rank) + self.clearance + 1,
+        )
+        return {(file, rank) for file in files for rank in ranks}
+
+    @staticmethod
+    def _depends_on_running(
+        index: int,
+        robot_steps: List[Tuple[int, int]],
+        results: List[Optional[bool]],
+    ) -> bool:
+        """Returns whether a step touches a square of an earlier step that has not finished."""
+        squares = set(robot_steps[index])
+        return any(
+            results[earlier] is None and squares & set(robot_steps[earlier])
+            for earlier in range(index)
+        )
@@ -0,0 +1,380 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+import chess
+
+from src.communication.tcp_robot import (
+    form_move_command,
+    form_plan_command,
+    form_prepare_command,
+    parse_step_status,
+)
+from src.core import instrumentation
+from src.core.board import PieceOffset
+from src.core.moves import MoveStep, PieceMover, ProgressCallback
+from src.core.telemetry import TelemetryRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionState(Enum):
+    DISCONNECTED = 0
+    CONNECTING = 1
+    CONNECTED = 2
+
+
+class AsyncTCPRobotHand(PieceMover):
+    """Robot hand controlled over asyncio streams, speaking the framed protocol of `TCPRobotHand`.
+
+    The connection is owned by an event loop running on a thread of its own. A connection
+    manager task connects in the background and reconnects with exponential backoff whenever
+    the connection is lost. While no command is in flight, a "ping" heartbeat probes the
+    connection, so a dead robot is noticed between moves rather than on the next move.
+
+    Commands never wait for a connection: while disconnected they fail immediately, and every
+    awaited response has a deadline. The connection state can be read without blocking through
+    `state` and `connected`, or observed through the `on_state_change` callback.
+
+    The `PieceMover` methods block the calling thread until the command is answered.
+    `issue_command_async` can be awaited from any other event loop instead.
+
+    Attributes:
+        ip (str): The IP address of the robot hand.
+        port (int): The port of the robot hand.
+        command_timeout (float): Deadline for a command's response, per step for plans (seconds).
+        connect_timeout (float): Deadline for establishing a connection (seconds).
+        heartbeat_interval (float): Time between heartbeats of an idle connection (seconds).
+        heartbeat_timeout (float): Deadline for a heartbeat's response (seconds).
+        min_backoff (float): Delay before the first reconnection attempt (seconds).
+        max_backoff (float): Longest delay between reconnection attempts (seconds).
+    """
+
+    def __init__(
+        self,
+        ip: str = "192.168.1.6",
+        port: int = 6001,
+        command_timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        heartbeat_interval: float = 2.0,
+        heartbeat_timeout: float = 1.0,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        on_state_change: Optional[Callable[[ConnectionState], None]] = None,
+        telemetry: Optional[TelemetryRecorder] = None,
+    ) -> None:
+        """Starts the event loop thread and the connection manager.
+
+        Args:
+            ip (str): The IP address of the robot hand.
+            port (int): The port of the robot hand.
+            command_timeout (float): Deadline for a command's response, in seconds. Defaults to 60.0.
+            connect_timeout (float): Deadline for establishing a connection, in seconds. Defaults to 5.0.
+            heartbeat_interval (float): Time between heartbeats, in seconds. Defaults to 2.0.
+            heartbeat_timeout (float): Deadline for a heartbeat's response, in seconds. Defaults to 1.0.
+            min_backoff (float): Delay before the first reconnection attempt, in seconds. Defaults to 0.5.
+            max_backoff (float): Longest delay between reconnection attempts, in seconds. Defaults to 30.0.
+            on_state_change (Optional[Callable[[ConnectionState], None]]): Called from the event loop
+                thread on every change of the connection state.
+            telemetry (Optional[TelemetryRecorder]): Records the timing and result of every piece move.
+        """
+        self.ip = ip
+        self.port = port
+        self.command_timeout = command_timeout
+        self.connect_timeout = connect_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.on_state_change = on_state_change
+        self.telemetry = telemetry
+
+        self._state = ConnectionState.DISCONNECTED
+        self._state_condition = threading.Condition()
+
+        # Only touched from the event loop thread
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, "asyncio.Queue[Optional[str]]"] = {}
+        self._request_ids = itertools.count(1)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"robot {ip}:{port}", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._manage_connection(), self._loop)
+
+    @property
+    def state(self) -> ConnectionState:
+        """ConnectionState: The state of the connection to the robot hand."""
+        return self._state
+
+    @property
+    def connected(self) -> bool:
+        """bool: Whether the robot hand is connected and can execute commands."""
+        return self._state == ConnectionState.CONNECTED
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the robot hand is connected.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait, in seconds. Defaults to waiting forever.
+
+        Returns:
+            bool: True if connected, False if the timeout passed first.
+        """
+        with self._state_condition:
+            return self._state_condition.wait_for(lambda: self.connected, timeout)
+
+    def reset(self) -> bool:
+        """
+        Resets the robot hand to its initial state by issuing a reset command.
+
+        Returns:
+            bool: True if the reset command succeeded and was acknowledged by the robot; False otherwise.
+        """
+        return self.issue_command("reset")
+
+    def move_piece(
+        self,
+        from_square: int,
+        to_square: int,
+        color: chess.Color,
+        origin_offset: PieceOffset,
+    ) -> bool:
+        """
+        Moves a piece from one square to another using the robot hand, see `TCPRobotHand.move_piece`.
+
+        Returns:
+            bool: True if the move command succeeded and was acknowledged by the robot; False otherwise.
+        """
+        sent = time.time()
+        success = self.issue_command(
+            form_move_command(from_square, to_square, color, origin_offset)
+        )
+        if self.telemetry:
+            self.telemetry.record(
+                from_square, to_square, color, origin_offset, sent, time.time(), success
+            )
+        return success
+
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        """
+        Moves the robot hand to its edge of the board next to a square, see `PieceMover.prepare`.
+
+        Returns:
+            bool: True if the prepare command succeeded and was acknowledged by the robot; False otherwise.
+        """
+        return self.issue_command(form_prepare_command(square, color))
+
+    @instrumentation.timed("robot.plan")
+    def plan(
+        self,
+        steps: List[MoveStep],
+        color: chess.Color,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Sends all piece moves to the robot hand as one plan command, see `TCPRobotHand.plan`.
+
+        Every step has its own deadline. `on_progress` is called from the event loop thread.
+
+        Returns:
+            int: The number of moves acknowledged with success before the first failure.
+        """
+        if not steps:
+            return 0
+
+        completed = 0
+        step_started = time.time()
+
+        def on_frame(status: str) -> None:
+            nonlocal completed, step_started
+            index, success = parse_step_status(status)
+            if success and index == completed:
+                completed += 1
+            if self.telemetry and 0 <= index < len(steps):
+                step = steps[index]
+                step_finished = time.time()
+                self.telemetry.record(
+                    step.from_square,
+                    step.to_square,
+                    color,
+                    step.origin_offset,
+                    step_started,
+                    step_finished,
+                    success,
+                )
+                step_started = step_finished
+            if on_progress:
+                on_progress(index, success)
+
+        self._run(self._command(form_plan_command(steps, color), on_frame))
+        return completed
+
+    @instrumentation.timed("robot.issue_command")
+    def issue_command(self, command: str) -> bool:
+        """
+        Sends a command to the robot hand and waits for its response or deadline.
+
+        Args:
+            command (str): The command string to send to the robot.
+
+        Returns:
+            bool: True if the command was acknowledged with a "success" response; False if it failed,
+                its deadline passed or the robot hand is disconnected.
+        """
+        return self._run(self._command(command)) == "success"
+
+    async def issue_command_async(self, command: str) -> bool:
+        """
+        Sends a command to the robot hand without blocking the calling event loop.
+
+        Args:
+            command (str): The command string to send to the robot.
+
+        Returns:
+            bool: True if the command was acknowledged with a "success" response; False otherwise.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._command(command), self._loop)
+        return await asyncio.wrap_future(future) == "success"
+
+    def close(self) -> None:
+        """Closes the connection and stops the event loop thread."""
+        if not self._loop.is_running():
+            return
+
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _shutdown(self) -> None:
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run(self, coroutine) -> Optional[str]:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _set_state(self, state: ConnectionState) -> None:
+        if state == self._state:
+            return
+
+        logger.info(f"TCP robot hand {self.ip}:{self.port} {state.name.lower()}")
+        with self._state_condition:
+            self._state = state
+            self._state_condition.notify_all()
+        if self.on_state_change:
+            self.on_state_change(state)
+
+    async def _manage_connection(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            self._set_state(ConnectionState.CONNECTING)
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.ip, self.port), self.connect_timeout
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                logger.warning(
+                    f"Could not connect to TCP robot hand {self.ip}:{self.port}, "
+                    f"retrying in {backoff:.1f}s! Error: {e!r}"
+                )
+                self._set_state(ConnectionState.DISCONNECTED)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.min_backoff
+            self._writer = writer
+            self._set_state(ConnectionState.CONNECTED)
+            heartbeat = asyncio.create_task(self._heartbeat())
+            try:
+                await self._read_responses(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                logger.error(
+                    f"Lost connection to TCP robot hand {self.ip}:{self.port}! Error: {e!r}"
+                )
+            finally:
+                heartbeat.cancel()
+                self._writer = None
+                writer.close()
+                # Commands in flight fail instead of waiting for their deadline
+                for queue in self._pending.values():
+                    queue.put_nowait(None)
+                self._set_state(ConnectionState.DISCONNECTED)
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        while line := await reader.readline():
+            response_id, _, status = line.decode("utf-8").strip().partition(" ")
+            try:
+                queue = self._pending.get(int(response_id))
+            except ValueError:
+                logger.warning(f"Received malformed TCP response: {line!r}")
+                continue
+            if queue is None:
+                logger.debug(f"Skipping stale TCP response {response_id}: {status}")
+                continue
+            queue.put_nowait(status)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            # A busy controller answers in order, behind the commands it executes
+            if self._pending:
+                continue
+
+            if await self._command("ping", timeout=self.heartbeat_timeout) is None:
+                logger.error(f"TCP robot hand {self.ip}:{self.port} missed a heartbeat!")
+                if self._writer is not None:
+                    self._writer.transport.abort()
+                return
+
+    async def _command(
+        self,
+        command: str,
+        on_frame: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """Sends a command and returns its final status, None if disconnected or past the deadline."""
+        if self._writer is None:
+            logger.error(
+                f"Not sending TCP command {command}, robot hand {self.ip}:{self.port} is disconnected!"
+            )
+            return None
+
+        request_id = next(self._request_ids)
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._pending[request_id] = queue
+        if command != "ping":
+            logger.info(f"Sending TCP command {request_id}: {command}")
+
+        try:
+            self._writer.write(f"{request_id} {command}\n".encode("utf-8"))
+            await self._writer.drain()
+            while True:
+                status = await asyncio.wait_for(
+                    queue.get(), timeout or self.command_timeout
+                )
+                if status is None:
+                    return None
+                if on_frame is not None and parse_step_status(status) is not None:
+                    on_frame(status)
+                    continue
+                if command != "ping":
+                    logger.info(f"Received TCP response {request_id}: {status}")
+                return status
+        except asyncio.TimeoutError:
+            logger.error(f"TCP command {request_id} missed its deadline!")
+        except OSError as e:
+            logger.error(f"Failed sending TCP command {request_id}! Error: {e!r}")
+        finally:
+            del self._pending[request_id]
+
+        return None
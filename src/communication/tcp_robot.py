@@ -1,15 +1,144 @@
+import itertools
 import socket
+import time
 import chess
 import logging
+from typing import List, Optional, Tuple
 
-from src.core.board import PieceOffset, flip_square
-from src.core.moves import PieceMover
+from src.core import instrumentation
+from src.core.board import OFFSET_SQUARE_CENTER, PieceOffset, flip_square
+from src.core.moves import MoveStep, PieceMover, ProgressCallback
+from src.core.telemetry import TelemetryRecorder
 
 logger = logging.getLogger(__name__)
 
 
+def form_move_command(
+    from_square: chess.Square,
+    to_square: chess.Square,
+    color: chess.Color,
+    origin_offset: PieceOffset,
+    target_offset: PieceOffset = OFFSET_SQUARE_CENTER,
+) -> str:
+    """
+    Forms a command string for moving a piece, accounting for offset and color perspective.
+
+    Note: First row is at the bottom of the robot hand's perspective. A target offset other
+    than the center is appended as two more integer percentages, "move <from> <dx> <dy> <to> <tx> <ty>".
+
+    Args:
+        from_square (chess.Square): The starting square in 0-63 notation.
+        to_square (chess.Square): The destination square in 0-63 notation.
+        color (chess.Color): The color perspective (chess.WHITE or chess.BLACK), flipping board orientation if black.
+        origin_offset (PieceOffset): Offset for piece placement in x and y directions, relative to the square's center.
+        target_offset (PieceOffset): Offset the piece is placed at on `to_square`, relative to the square's center.
+            Defaults to the center.
+
+    Returns:
+        str: The formatted command string for the robot, including square positions and offsets.
+    """
+    # Last row is next to the robot hand
+    if color == chess.BLACK:
+        from_square = flip_square(from_square)
+        to_square = flip_square(to_square)
+
+    # Convert offsets to integer percentages
+    offset_x, offset_y = _offset_percentages(origin_offset)
+
+    # Form command parts as space-separated string
+    command_parts = [from_square, offset_x, offset_y, to_square]
+    target_x, target_y = _offset_percentages(target_offset)
+    if target_x or target_y:
+        command_parts += [target_x, target_y]
+    move_string = " ".join(map(str, command_parts))
+    command_string = "move " + move_string
+
+    return command_string
+
+
+def _offset_percentages(offset: PieceOffset) -> Tuple[int, int]:
+    return (
+        int(max(min(offset.x * 100, 100), -100)),
+        int(max(min(offset.y * 100, 100), -100)),
+    )
+
+
+def form_plan_command(steps: List[MoveStep], color: chess.Color) -> str:
+    """
+    Forms a plan command string executing several piece moves in order.
+
+    Args:
+        steps (List[MoveStep]): The moves to execute in order.
+        color (chess.Color): The color perspective (chess.WHITE or chess.BLACK), flipping board orientation if black.
+
+    Returns:
+        str: The command, e.g. "plan 35 0 0 -6;28 50 50 35".
+    """
+    return "plan " + ";".join(
+        form_move_command(
+            step.from_square,
+            step.to_square,
+            color,
+            step.origin_offset,
+            step.target_offset,
+        ).removeprefix("move ")
+        for step in steps
+    )
+
+
+def form_prepare_command(square: chess.Square, color: chess.Color) -> str:
+    """
+    Forms a command string moving the hand towards a square it is expected to pick a piece up from.
+
+    Args:
+        square (chess.Square): The square in 0-63 notation.
+        color (chess.Color): The color perspective (chess.WHITE or chess.BLACK), flipping board orientation if black.
+
+    Returns:
+        str: The command, e.g. "prepare 12".
+    """
+    if color == chess.BLACK:
+        square = flip_square(square)
+    return f"prepare {square}"
+
+
+def parse_step_status(status: str) -> Optional[Tuple[int, bool]]:
+    """
+    Parses a plan progress response.
+
+    Args:
+        status (str): The response without its request ID, e.g. "step 2 success".
+
+    Returns:
+        Optional[Tuple[int, bool]]: The index of the finished step and whether it succeeded, or None
+            if the response is the plan's final status.
+    """
+    kind, _, progress = status.partition(" ")
+    if kind != "step":
+        return None
+
+    index, _, step_status = progress.partition(" ")
+    return int(index), step_status == "success"
+
+
 class TCPRobotHand(PieceMover):
-    def __init__(self, ip: str = "192.168.1.6", port: int = 6001, timeout: int = 60):
+    """Robot hand controlled over a TCP connection.
+
+    Commands and responses are newline-delimited frames tagged with a request ID: the command
+    "<id> <command>\n" is answered with "<id> <status>\n", where the status is "success" if the
+    command succeeded. Frames are reassembled from the stream, so partial and merged reads are
+    handled. Several commands may be sent before the first one is answered; the controller
+    executes them in order and answers every request, aborting the remaining queued commands
+    once one fails.
+    """
+
+    def __init__(
+        self,
+        ip: str = "192.168.1.6",
+        port: int = 6001,
+        timeout: int = 60,
+        telemetry: Optional[TelemetryRecorder] = None,
+    ):
         """
         Initializes the TCPRobotHand with IP address, port, and timeout for socket connection.
 
@@ -17,16 +146,24 @@ class TCPRobotHand(PieceMover):
             ip (str): The IP address of the robot hand.
             port (int): The port number for communication with the robot hand.
             timeout (int): The timeout for socket communication in seconds.
+            telemetry (Optional[TelemetryRecorder]): Records the timing and result of every piece move.
         """
         self.ip = ip
         self.port = port
         self.timeout = timeout
+        self.telemetry = telemetry
 
-        self.robot_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.robot_socket.settimeout(timeout)
+        self.robot_socket = None
+        self._request_ids = itertools.count(1)
         self._connect()
 
     def _connect(self) -> bool:
+        if self.robot_socket is not None:
+            self.robot_socket.close()
+
+        self.robot_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.robot_socket.settimeout(self.timeout)
+        self._buffer = b""
         try:
             self.robot_socket.connect((self.ip, self.port))
             logger.info(f"Connected to TCP robot hand {self.ip}:{self.port}")
@@ -38,7 +175,12 @@ class TCPRobotHand(PieceMover):
             return False
 
     def __del__(self):
-        self.robot_socket.close()
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection to the robot hand."""
+        if self.robot_socket is not None:
+            self.robot_socket.close()
 
     def reset(self) -> bool:
         """
@@ -71,45 +213,112 @@ class TCPRobotHand(PieceMover):
             bool: True if the move command succeeded and was acknowledged by the robot; False otherwise.
         """
         command = self.form_move_command(from_square, to_square, color, origin_offset)
-        return self.issue_command(command)
+        sent = time.time()
+        success = self.issue_command(command)
+        if self.telemetry:
+            self.telemetry.record(
+                from_square, to_square, color, origin_offset, sent, time.time(), success
+            )
+        return success
 
-    def form_move_command(
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        """
+        Moves the robot hand to its edge of the board next to a square, see `PieceMover.prepare`.
+
+        Args:
+            square (chess.Square): The square of the expected pick-up.
+            color (chess.Color): The color perspective (chess.WHITE or chess.BLACK) affecting board orientation.
+
+        Returns:
+            bool: True if the prepare command succeeded and was acknowledged by the robot; False otherwise.
+        """
+        return self.issue_command(form_prepare_command(square, color))
+
+    @instrumentation.timed("robot.plan")
+    def plan(
         self,
-        from_square: chess.Square,
-        to_square: chess.Square,
+        steps: List[MoveStep],
         color: chess.Color,
-        origin_offset: PieceOffset,
-    ) -> str:
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> int:
         """
-        Forms a command string for moving a piece, accounting for offset and color perspective.
+        Sends all piece moves to the robot hand as one plan command and follows its progress.
 
-        Note: First row is at the bottom of the robot hand's perspective.
+        The plan is sent as "plan <from> <dx> <dy> <to>;<from> <dx> <dy> <to>;...", so the robot
+        controller can blend its motions between steps. The controller reports every finished step
+        with "step <index> <status>" under the plan's request ID, and the whole plan with a final
+        status.
 
         Args:
-            from_square (chess.Square): The starting square in 0-63 notation.
-            to_square (chess.Square): The destination square in 0-63 notation.
-            color (chess.Color): The color perspective (chess.WHITE or chess.BLACK), flipping board orientation if black.
-            origin_offset (PieceOffset): Offset for piece placement in x and y directions, relative to the square's center.
+            steps (List[MoveStep]): The moves to execute in order.
+            color (chess.Color): The color perspective (chess.WHITE or chess.BLACK) affecting board orientation.
+            on_progress (Optional[ProgressCallback]): Called with the index of every finished step
+                and whether it succeeded.
 
         Returns:
-            str: The formatted command string for the robot, including square positions and offsets.
+            int: The number of moves acknowledged with success before the first failure.
         """
-        # Last row is next to the robot hand
-        if color == chess.BLACK:
-            from_square = flip_square(from_square)
-            to_square = flip_square(to_square)
+        if not steps:
+            return 0
 
-        # Convert offsets to integer percentages
-        offset_x = int(max(min(origin_offset.x * 100, 100), -100))
-        offset_y = int(max(min(origin_offset.y * 100, 100), -100))
+        command = form_plan_command(steps, color)
+        request_id = next(self._request_ids)
+        logger.info(f"Sending TCP command {request_id}: {command}")
 
-        # Form command parts as space-separated string
-        command_parts = [from_square, offset_x, offset_y, to_square]
-        move_string = " ".join(map(str, command_parts))
-        command_string = "move " + move_string
+        completed = 0
+        try:
+            step_started = time.time()
+            self.robot_socket.sendall(f"{request_id} {command}\n".encode("utf-8"))
+            while True:
+                status = self._await_response(request_id)
+                step_status = parse_step_status(status)
+                if step_status is None:
+                    logger.info(f"Received TCP response {request_id}: {status}")
+                    break
+
+                index, success = step_status
+                if success and index == completed:
+                    completed += 1
+                if self.telemetry and 0 <= index < len(steps):
+                    # Steps run back to back, each starts when the previous one finished
+                    step = steps[index]
+                    step_finished = time.time()
+                    self.telemetry.record(
+                        step.from_square,
+                        step.to_square,
+                        color,
+                        step.origin_offset,
+                        step_started,
+                        step_finished,
+                        success,
+                    )
+                    step_started = step_finished
+                if on_progress:
+                    on_progress(index, success)
+        except socket.error as e:
+            logger.error(
+                f"Lost connection to TCP robot hand {self.ip}:{self.port} during plan! Error: {e}"
+            )
+            self._connect()
+
+        return completed
+
+    def form_move_command(
+        self,
+        from_square: chess.Square,
+        to_square: chess.Square,
+        color: chess.Color,
+        origin_offset: PieceOffset,
+    ) -> str:
+        """
+        Forms a command string for moving a piece, see `form_move_command`.
 
-        return command_string
+        Returns:
+            str: The formatted command string for the robot, including square positions and offsets.
+        """
+        return form_move_command(from_square, to_square, color, origin_offset)
 
+    @instrumentation.timed("robot.issue_command")
     def issue_command(self, command: str) -> bool:
         """
         Sends a command to the robot hand and waits for a response, confirming command success or failure.
@@ -121,26 +330,69 @@ class TCPRobotHand(PieceMover):
             bool: True if the command was successfully acknowledged by the robot server with a "success" response;
                   False otherwise.
         """
-        logger.info(f"Sending TCP command: {command}")
+        return self.issue_commands([command]) == 1
+
+    def issue_commands(self, commands: List[str], retry: bool = True) -> int:
+        """
+        Sends several commands to the robot hand in one write and waits for their responses.
 
+        Args:
+            commands (List[str]): The command strings to send to the robot, executed in order.
+            retry (bool): Whether to reconnect and resend the commands if the connection was lost
+                before any command was acknowledged. Defaults to True.
+
+        Returns:
+            int: The number of commands acknowledged with a "success" response before the first failure.
+        """
+        request_ids = [next(self._request_ids) for _ in commands]
+        frames = "".join(
+            f"{request_id} {command}\n"
+            for request_id, command in zip(request_ids, commands)
+        )
+        for request_id, command in zip(request_ids, commands):
+            logger.info(f"Sending TCP command {request_id}: {command}")
+
+        completed = 0
         try:
-            self.robot_socket.sendall(command.encode("utf-8"))
-            response = self.robot_socket.recv(1024)
-            if response:
-                decoded_response = response.decode("utf-8").strip()
-                logger.info(f"Received TCP response: {decoded_response}")
-                return decoded_response == "success"
-            else:
-                logger.warning("Received no TCP response")
+            self.robot_socket.sendall(frames.encode("utf-8"))
+            for request_id in request_ids:
+                status = self._await_response(request_id)
+                logger.info(f"Received TCP response {request_id}: {status}")
+                if status != "success":
+                    break
+                completed += 1
         except (ConnectionResetError, BrokenPipeError) as e:
             logger.error(
                 f"No connection to TCP robot hand {self.ip}:{self.port}, attempting reconnect! Error: {e}"
             )
-            if self._connect():
-                return self.issue_command(command)
+            if retry and completed == 0 and self._connect():
+                return self.issue_commands(commands, retry=False)
         except socket.error as e:
             logger.error(
                 f"Could not connect to TCP robot hand {self.ip}:{self.port}! Error: {e}"
             )
 
-        return False
+        return completed
+
+    def _await_response(self, request_id: int) -> str:
+        """Reads responses until the one to `request_id`, skipping responses to abandoned requests."""
+        while True:
+            response_id, status = self._read_response()
+            if response_id == request_id:
+                return status
+            logger.debug(f"Skipping stale TCP response {response_id}: {status}")
+
+    def _read_response(self) -> Tuple[int, str]:
+        while b"\n" not in self._buffer:
+            chunk = self.robot_socket.recv(4096)
+            if not chunk:
+                raise ConnectionResetError("Connection closed by the robot hand")
+            self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        response_id, _, status = line.decode("utf-8").strip().partition(" ")
+        try:
+            return int(response_id), status
+        except ValueError:
+            logger.warning(f"Received malformed TCP response: {line!r}")
+            return -1, status
@@ -1,5 +1,6 @@
 from typing import Optional, NamedTuple, List
 from abc import ABC, abstractmethod
+import time
 
 import chess
 
@@ -134,7 +135,45 @@ class PhysicalBoard:
 
 
 class BoardCapture(ABC):
-    """Abstract base class for capturing the state of a physical chessboard."""
+    """Abstract base class for capturing the state of a physical chessboard.
+
+    Attributes:
+        watch_squares (chess.Bitboard): Squares involved in a move currently in progress,
+            `chess.BB_EMPTY` when the board is expected to be at rest.
+        inference_count (int): Number of detection model inferences run so far, for implementations
+            that run a model.
+    """
+
+    watch_squares: chess.Bitboard = chess.BB_EMPTY
+    inference_count: int = 0
+
+    def watch(self, squares: chess.Bitboard) -> None:
+        """Informs the capture system which squares a move in progress involves.
+
+        Implementations may use this to slow down capturing while a hand is over the
+        board. Passing `chess.BB_EMPTY` signals that no move is in progress.
+
+        Args:
+            squares (chess.Bitboard): Mask of squares to watch.
+        """
+        self.watch_squares = squares
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Blocks until the board may have changed since the last capture, or the timeout passed.
+
+        Implementations with a cheap change check, e.g. frame differencing, return as soon as
+        something moves and False if nothing did, so callers only run a full capture when needed.
+        The default implementation cannot detect changes, so it waits for the timeout and
+        reports a possible change.
+
+        Args:
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            bool: True if the board may have changed, False if it certainly did not.
+        """
+        time.sleep(timeout)
+        return True
 
     @abstractmethod
     def capture_board(self, human_color: chess.Color) -> Optional[PhysicalBoard]:
@@ -152,21 +191,77 @@ class BoardCapture(ABC):
         """
         pass
 
+    def capture_squares(
+        self, squares: chess.Bitboard, human_color: chess.Color
+    ) -> Optional[PhysicalBoard]:
+        """Captures the pieces on a few squares, e.g. to verify a single robot step.
+
+        Implementations may detect the region around the squares only, which is cheaper than
+        a full capture. The default implementation captures the whole board.
+
+        Args:
+            squares (chess.Bitboard): Mask of squares to capture.
+            human_color (chess.Color): The color perspective (`chess.WHITE` or `chess.BLACK`) of the capture,
+                see `capture_board`.
+
+        Returns:
+            Optional[PhysicalBoard]: The captured board, only reliable on `squares`, or `None` if the
+                capture failed.
+        """
+        return self.capture_board(human_color)
+
+
+def changed_squares(board1: chess.BaseBoard, board2: chess.BaseBoard) -> chess.Bitboard:
+    """Computes the set of squares whose contents differ between two boards.
+
+    The boards are compared through their color and piece type bitboards, so the whole
+    board is diffed with a few integer operations instead of a lookup per square.
+
+    Args:
+        board1 (chess.BaseBoard): The first board to compare.
+        board2 (chess.BaseBoard): The second board to compare.
 
-def are_boards_equal(board1: chess.Board, board2: chess.Board) -> bool:
+    Returns:
+        chess.Bitboard: A mask with a bit set for every square where the pieces differ,
+            `chess.BB_EMPTY` if both boards have identical piece placement.
+    """
+    return (
+        (board1.occupied_co[chess.WHITE] ^ board2.occupied_co[chess.WHITE])
+        | (board1.occupied_co[chess.BLACK] ^ board2.occupied_co[chess.BLACK])
+        | (board1.pawns ^ board2.pawns)
+        | (board1.knights ^ board2.knights)
+        | (board1.bishops ^ board2.bishops)
+        | (board1.rooks ^ board2.rooks)
+        | (board1.queens ^ board2.queens)
+        | (board1.kings ^ board2.kings)
+    )
+
+
+def are_boards_equal(board1: chess.BaseBoard, board2: chess.BaseBoard) -> bool:
     """Compares two chess boards to check if they are identical in piece positions.
 
     Args:
-        board1 (chess.Board): The first board to compare.
-        board2 (chess.Board): The second board to compare.
+        board1 (chess.BaseBoard): The first board to compare.
+        board2 (chess.BaseBoard): The second board to compare.
 
     Returns:
         bool: True if both boards have the same pieces on each square, False otherwise.
     """
-    for square in chess.SQUARES:
-        if board1.piece_at(square) != board2.piece_at(square):
-            return False
-    return True
+    return changed_squares(board1, board2) == chess.BB_EMPTY
+
+
+def format_squares(squares: chess.Bitboard) -> str:
+    """Formats a square mask as a readable, comma separated list of square names.
+
+    Args:
+        squares (chess.Bitboard): The mask of squares to format.
+
+    Returns:
+        str: Square names in ascending order (e.g. "e2, e4"), or "none" for an empty mask.
+    """
+    if not squares:
+        return "none"
+    return ", ".join(chess.square_name(square) for square in chess.scan_forward(squares))
 
 
 def flip_square(chess_square: chess.Square) -> chess.Square:
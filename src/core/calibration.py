@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import chess
+
+from src.core.board import OFFSET_SQUARE_CENTER, PhysicalBoard, PieceOffset, flip_square
+
+logger = logging.getLogger(__name__)
+
+
+class PlacementCalibration:
+    """Learns where the robot hand systematically places pieces off center, per square.
+
+    Every capture following a robot move shows where the placed pieces ended up. The offsets of
+    those pieces are averaged per square with an exponential moving average, and the negated
+    average is sent as the target offset of later moves onto the square, so the pieces end up
+    centered and the board needs fewer corrections over a long session.
+
+    Squares and offsets are kept in the robot's frame, so the calibration holds for either
+    color. Safe to share between threads.
+
+    Attributes:
+        learning_rate (float): Weight of a new observation in the average.
+        max_correction (float): Largest target offset sent, in each direction.
+        path (Optional[str]): JSON file the calibration is saved to after every update, None to keep it in memory.
+    """
+
+    def __init__(
+        self,
+        learning_rate: float = 0.2,
+        max_correction: float = 0.5,
+        path: Optional[str] = None,
+    ) -> None:
+        """Initializes the calibration, loading it from `path` if the file exists.
+
+        Args:
+            learning_rate (float): Weight of a new observation in the average. Defaults to 0.2.
+            max_correction (float): Largest target offset sent, in each direction. Defaults to 0.5.
+            path (Optional[str]): JSON file the calibration is saved to. Defaults to None.
+        """
+        self.learning_rate = learning_rate
+        self.max_correction = max_correction
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._bias: Dict[chess.Square, PieceOffset] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def bias(self, square: chess.Square, color: chess.Color) -> PieceOffset:
+        """Returns the average offset of pieces placed on a square.
+
+        Args:
+            square (chess.Square): The square, from `color`'s perspective.
+            color (chess.Color): The color perspective of the robot hand.
+
+        Returns:
+            PieceOffset: The average placement offset, from `color`'s perspective.
+        """
+        if color == chess.BLACK:
+            square = flip_square(square)
+        with self._lock:
+            return self._bias.get(square, OFFSET_SQUARE_CENTER)
+
+    def target_offset(self, square: int, color: chess.Color) -> PieceOffset:
+        """Returns the offset to place a piece at so it ends up in the center of the square.
+
+        Args:
+            square (int): The square the piece is placed on, negative for off-board squares.
+            color (chess.Color): The color perspective of the robot hand.
+
+        Returns:
+            PieceOffset: The compensating target offset, the center for off-board squares.
+        """
+        if square not in chess.SQUARES:
+            return OFFSET_SQUARE_CENTER
+
+        bias = self.bias(square, color)
+        return PieceOffset(
+            max(min(-bias.x, self.max_correction), -self.max_correction),
+            max(min(-bias.y, self.max_correction), -self.max_correction),
+        )
+
+    def observe(
+        self, board: PhysicalBoard, squares: chess.Bitboard, color: chess.Color
+    ) -> None:
+        """Updates the calibration with the captured offsets of pieces the robot hand placed.
+
+        The observed offsets are the result of placing with the current target offsets, so the
+        correction that was applied is added back to get the hand's bias.
+
+        Args:
+            board (PhysicalBoard): A board captured after the pieces were placed.
+            squares (chess.Bitboard): Squares the robot hand placed pieces on, empty squares are skipped.
+            color (chess.Color): The color perspective of the robot hand.
+        """
+        updated = False
+        for square in chess.scan_forward(squares):
+            if board.chess_board.piece_at(square) is None:
+                continue
+
+            offset = board.get_piece_offset(square, color)
+            target = self.target_offset(square, color)
+            observed_bias = PieceOffset(offset.x - target.x, offset.y - target.y)
+
+            robot_square = flip_square(square) if color == chess.BLACK else square
+            with self._lock:
+                bias = self._bias.get(robot_square, OFFSET_SQUARE_CENTER)
+                self._bias[robot_square] = PieceOffset(
+                    bias.x + self.learning_rate * (observed_bias.x - bias.x),
+                    bias.y + self.learning_rate * (observed_bias.y - bias.y),
+                )
+            updated = True
+
+        if updated and self.path:
+            self.save(self.path)
+
+    def save(self, path: str) -> None:
+        """Atomically writes the calibration to a JSON file.
+
+        Args:
+            path (str): The file to write.
+        """
+        with self._lock:
+            data = {
+                chess.square_name(square): [bias.x, bias.y]
+                for square, bias in self._bias.items()
+            }
+
+        temporary_path = path + ".tmp"
+        try:
+            with open(temporary_path, "w") as file:
+                json.dump(data, file, indent=2)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logger.error(f"Failed saving placement calibration {path}! Error: {e}")
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path) as file:
+                data = json.load(file)
+            self._bias = {
+                chess.parse_square(name): PieceOffset(*bias) for name, bias in data.items()
+            }
+            logger.info(f"Loaded placement calibration of {len(self._bias)} squares")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable placement calibration {path}! Error: {e}")
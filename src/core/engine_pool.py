@@ -0,0 +1,235 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import chess.engine
+
+logger = logging.getLogger(__name__)
+
+# Transposition table size per search thread (MB)
+HASH_PER_THREAD = 16
+
+
+class EnginePool:
+    """Hands out pre-spawned, pre-configured chess engines to concurrently running games.
+
+    Engines are kept idle per skill level, so a game acquiring an engine for its skill level
+    usually gets one that needs no reconfiguration. When no engine of that level is idle, a new
+    one is spawned up to `max_engines`, after which an idle engine of another level is
+    reconfigured, and otherwise the caller waits for an engine to be released. Engines that
+    crashed are restarted when they are acquired or released.
+
+    The host's cores are split between the engines, so every engine gets `threads` search
+    threads and a `hash_size` MB transposition table unless set explicitly.
+
+    Attributes:
+        engine_path (str): Path to the chess engine executable.
+        max_engines (int): Maximum number of engine processes.
+        threads (int): Search threads per engine.
+        hash_size (int): Transposition table size per engine (MB).
+    """
+
+    def __init__(
+        self,
+        engine_path: str,
+        skill_levels: Iterable[int] = (),
+        max_engines: int = 4,
+        threads: Optional[int] = None,
+        hash_size: Optional[int] = None,
+    ) -> None:
+        """Spawns one engine for each of the given skill levels.
+
+        Args:
+            engine_path (str): Path to the chess engine executable.
+            skill_levels (Iterable[int]): Skill levels to pre-spawn an engine for. Defaults to none.
+            max_engines (int): Maximum number of engine processes. Defaults to 4.
+            threads (Optional[int]): Search threads per engine. Defaults to the host's cores
+                divided between `max_engines` engines.
+            hash_size (Optional[int]): Transposition table size per engine in MB. Defaults to
+                `HASH_PER_THREAD` MB per search thread.
+        """
+        self.engine_path = engine_path
+        self.max_engines = max_engines
+        self.threads = threads or max(1, (os.cpu_count() or 1) // max_engines)
+        self.hash_size = hash_size or HASH_PER_THREAD * self.threads
+
+        self._condition = threading.Condition()
+        self._idle: Dict[int, List[chess.engine.SimpleEngine]] = {}
+        self._skill_levels: Dict[chess.engine.SimpleEngine, int] = {}
+        self._spawning = 0
+        self._closed = False
+
+        for skill_level in skill_levels:
+            if len(self._skill_levels) < max_engines:
+                engine = self._spawn(skill_level)
+                self._idle.setdefault(skill_level, []).append(engine)
+
+    @property
+    def options(self) -> Dict[str, int]:
+        """Dict[str, int]: The UCI options every engine is started with."""
+        return {"Threads": self.threads, "Hash": self.hash_size}
+
+    def acquire(
+        self, skill_level: int, timeout: Optional[float] = None
+    ) -> chess.engine.SimpleEngine:
+        """Takes an engine configured for a skill level out of the pool.
+
+        Args:
+            skill_level (int): The skill level the engine must be configured for.
+            timeout (Optional[float]): Maximum time to wait for an engine (seconds). Defaults to no limit.
+
+        Returns:
+            chess.engine.SimpleEngine: The engine, to be returned with `release`.
+
+        Raises:
+            TimeoutError: If no engine became available within the timeout.
+            RuntimeError: If the pool is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        engine = None
+        with self._condition:
+            while engine is None:
+                if self._closed:
+                    raise RuntimeError("Engine pool is closed.")
+
+                if self._idle.get(skill_level):
+                    engine = self._idle[skill_level].pop()
+                elif len(self._skill_levels) + self._spawning < self.max_engines:
+                    # Reserve the slot, the engine is started outside the lock
+                    self._spawning += 1
+                    break
+                else:
+                    engine = self._take_other_level()
+                    if engine is None:
+                        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                        if not self._condition.wait(remaining):
+                            raise TimeoutError("No chess engine available in the pool.")
+
+        if engine is None:
+            try:
+                return self._spawn(skill_level)
+            finally:
+                with self._condition:
+                    self._spawning -= 1
+                    self._condition.notify()
+
+        if not self._is_alive(engine):
+            engine = self.restart(engine)
+        if self._skill_levels[engine] != skill_level:
+            self._configure(engine, skill_level)
+        return engine
+
+    def release(self, engine: chess.engine.SimpleEngine) -> None:
+        """Returns an engine to the pool, restarting it if it crashed.
+
+        Args:
+            engine (chess.engine.SimpleEngine): An engine previously acquired from the pool.
+        """
+        if not self._is_alive(engine):
+            engine = self.restart(engine)
+
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._idle.setdefault(self._skill_levels[engine], []).append(engine)
+                self._condition.notify()
+
+        if closed:
+            self._quit(engine)
+
+    @contextmanager
+    def engine(
+        self, skill_level: int, timeout: Optional[float] = None
+    ) -> Iterator[chess.engine.SimpleEngine]:
+        """Acquires an engine for the duration of a `with` block.
+
+        Args:
+            skill_level (int): The skill level the engine must be configured for.
+            timeout (Optional[float]): Maximum time to wait for an engine (seconds). Defaults to no limit.
+
+        Yields:
+            chess.engine.SimpleEngine: The engine.
+
+        Raises:
+            TimeoutError: If no engine became available within the timeout.
+            RuntimeError: If the pool is closed.
+        """
+        engine = self.acquire(skill_level, timeout)
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def restart(self, engine: chess.engine.SimpleEngine) -> chess.engine.SimpleEngine:
+        """Replaces a crashed engine with a new process of the same skill level.
+
+        Args:
+            engine (chess.engine.SimpleEngine): The acquired engine to replace.
+
+        Returns:
+            chess.engine.SimpleEngine: The new engine, acquired in place of the old one.
+        """
+        with self._condition:
+            skill_level = self._skill_levels.pop(engine)
+
+        logger.warning("Restarting chess engine at skill level %d", skill_level)
+        self._quit(engine)
+        return self._spawn(skill_level)
+
+    def close(self) -> None:
+        """Shuts down all idle engines. Engines still in use are shut down on release."""
+        with self._condition:
+            self._closed = True
+            engines = [engine for engines in self._idle.values() for engine in engines]
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for engine in engines:
+            self._quit(engine)
+
+    def _spawn(self, skill_level: int) -> chess.engine.SimpleEngine:
+        engine = self._popen()
+        engine.configure(
+            {
+                name: value
+                for name, value in self.options.items()
+                if name in engine.options
+            }
+        )
+        with self._condition:
+            self._skill_levels[engine] = skill_level
+        self._configure(engine, skill_level)
+        return engine
+
+    def _popen(self) -> chess.engine.SimpleEngine:
+        return chess.engine.SimpleEngine.popen_uci(self.engine_path)
+
+    def _configure(self, engine: chess.engine.SimpleEngine, skill_level: int) -> None:
+        engine.configure({"Skill Level": skill_level})
+        with self._condition:
+            self._skill_levels[engine] = skill_level
+
+    def _take_other_level(self) -> Optional[chess.engine.SimpleEngine]:
+        for engines in self._idle.values():
+            if engines:
+                return engines.pop()
+        return None
+
+    @staticmethod
+    def _is_alive(engine: chess.engine.SimpleEngine) -> bool:
+        try:
+            engine.ping()
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            return False
+        return True
+
+    def _quit(self, engine: chess.engine.SimpleEngine) -> None:
+        with self._condition:
+            self._skill_levels.pop(engine, None)
+        try:
+            engine.quit()
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            pass
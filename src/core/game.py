@@ -1,12 +1,31 @@
-from typing import Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
 
 import chess
 import chess.engine
 
-from src.core.board import PhysicalBoard, BoardCapture, are_boards_equal
-from src.core.moves import PieceMover, execute_move, identify_move, iter_reset_board
+from src.core import instrumentation
+from src.core.board import PhysicalBoard, BoardCapture, changed_squares, format_squares
+from src.core.calibration import PlacementCalibration
+from src.core.engine_pool import EnginePool
+from src.core.journal import JournalState, MoveJournal
+from src.core.moves import (
+    PieceMover,
+    execute_move_verified,
+    expand_moves,
+    iter_reset_board,
+)
+from src.core.move_cache import MoveCache
+from src.core.ponder import Ponderer
+from src.core.probing import OpeningBook, Tablebase
+from src.core.recording import GameRecorder, MoveTiming
+from src.core.recognition import MoveState, MoveTracker, find_move_sequence
+from src.core.telemetry import TravelTimeModel
 
 logger = logging.getLogger(__name__)
 
@@ -23,34 +42,98 @@ class Game:
         board_capture (BoardCapture): Responsible for capturing the current board state.
         piece_mover (PieceMover): Responsible for physically moving pieces on the board.
         depth (int): The depth of search for the engine's move calculations.
-        engine (chess.engine.SimpleEngine): The chess engine used to calculate moves.
+        engine (Optional[chess.engine.SimpleEngine]): The dedicated chess engine used to calculate moves.
         physical_board (PhysicalBoard): Current physical state of the chess board.
         current_player (int): Indicates the current player (HUMAN or ROBOT).
         human_color (chess.Color): The color that the human player controls (chess.WHITE or chess.BLACK).
         robot_color (chess.Color): The color assigned to the robot player, opposite of `player_color`.
         resigned (bool): Flag indicating if the human player has resigned.
+        move_tracker (MoveTracker): Tracks the human's move across captures while it is in progress.
+        catch_up_depth (int): Maximum number of unobserved moves searched for when the captured
+            board does not match the expected board on the robot's turn, including the robot's
+            unconfirmed move.
+        pipelined (bool): Whether the robot's move is executed on a worker thread while the
+            engine analyses the human's likely replies.
+        reply_count (int): Number of likely human replies to analyse in pipelined mode.
+        expected_replies (List[chess.Move]): Human replies the engine expects after the robot's
+            last move, most likely first.
+        ponderer (Optional[Ponderer]): Searches replies to the human's likely moves during the
+            human's turn, None if pondering is disabled.
+        ponder_miss_factor (float): Fraction of the thinking time used when the human's move was
+            not pondered on.
+        opening_book (Optional[OpeningBook]): Opening book consulted before the engine.
+        tablebase (Optional[Tablebase]): Endgame tablebases consulted before the engine.
+        move_cache (Optional[MoveCache]): Persistent cache of engine moves consulted before the engine.
+        engine_pool (Optional[EnginePool]): Pool an engine of the current skill level is acquired from
+            for each search.
+        journal (Optional[MoveJournal]): Journal of the game in progress, used to resume it after a crash.
+        recorder (Optional[GameRecorder]): Records every game to PGN with per-move timings.
+        travel_time_model (Optional[TravelTimeModel]): Measured robot move durations, used to plan
+            quick board resets.
+        grasp_retries (int): Failed robot steps per move recovered from by capturing the step's squares.
+        calibration (Optional[PlacementCalibration]): Learns the robot hand's placement bias from the
+            capture following each robot move, and compensates it in later moves.
     """
 
     def __init__(
         self,
         board_capture: BoardCapture,
         piece_mover: PieceMover,
-        engine: chess.engine.SimpleEngine,
+        engine: Optional[chess.engine.SimpleEngine],
         chess_board: Optional[chess.Board] = None,
         human_color: chess.Color = chess.WHITE,
         depth: int = 4,
         skill_level: int = 0,
         thinking_time: float = 1.0,
+        catch_up_depth: int = 2,
+        pipelined: bool = False,
+        reply_count: int = 3,
+        ponder: bool = False,
+        ponder_miss_factor: float = 0.5,
+        opening_book: Optional[OpeningBook] = None,
+        tablebase: Optional[Tablebase] = None,
+        move_cache: Optional[MoveCache] = None,
+        engine_pool: Optional[EnginePool] = None,
+        journal: Optional[MoveJournal] = None,
+        recorder: Optional[GameRecorder] = None,
+        travel_time_model: Optional[TravelTimeModel] = None,
+        grasp_retries: int = 2,
+        calibration: Optional[PlacementCalibration] = None,
+        reset_mover: bool = True,
     ) -> None:
         """Initializes the Game with board capture, movement, engine, player color, and depth.
 
         Args:
             board_capture (BoardCapture): The system to capture the board's state.
             piece_mover (PieceMover): The system that physically moves pieces.
-            engine (chess.engine.SimpleEngine): The chess engine used for move calculations.
+            engine (Optional[chess.engine.SimpleEngine]): The chess engine used for move calculations.
+                None if engines are acquired from `engine_pool` for each search, or if the robot's moves are always
+                given to `robot_makes_move`.
             chess_board (Optional[chess.Board]): The current logical board state. Defaults to a new game.
             human_color (chess.Color): The color the human player controls (chess.WHITE or chess.BLACK).
             depth (int): The search depth for the engine's move calculations. Defaults to 4.
+            catch_up_depth (int): Maximum number of unobserved moves to recover from a captured board. Defaults to 2.
+            pipelined (bool): Execute robot moves on a worker thread overlapped with engine analysis. Defaults to False.
+            reply_count (int): Number of likely human replies to analyse in pipelined mode. Defaults to 3.
+            ponder (bool): Ponder on the human's likely moves during the human's turn. Defaults to False.
+            ponder_miss_factor (float): Fraction of the thinking time used on a ponder miss. Defaults to 0.5.
+            opening_book (Optional[OpeningBook]): Opening book consulted before the engine. Defaults to None.
+            tablebase (Optional[Tablebase]): Endgame tablebases consulted before the engine. Defaults to None.
+            move_cache (Optional[MoveCache]): Persistent cache of engine moves consulted before the engine. Defaults to None.
+            engine_pool (Optional[EnginePool]): Pool to acquire an engine of the current skill level from
+                for each search, instead of reconfiguring a dedicated engine. Defaults to None.
+            journal (Optional[MoveJournal]): Journal of the game in progress. A new journal is begun for the
+                initial board. Defaults to None.
+            recorder (Optional[GameRecorder]): Records every game to PGN with per-move timings. Defaults to None.
+            travel_time_model (Optional[TravelTimeModel]): Measured robot move durations, used to plan
+                quick board resets. Defaults to None.
+            grasp_retries (int): Failed robot steps per move recovered from by capturing the step's
+                squares, instead of failing the move. Defaults to 2.
+            calibration (Optional[PlacementCalibration]): Learns and compensates the robot hand's
+                placement bias. Defaults to None, placing pieces at the center.
+            reset_mover (bool): Whether to reset the piece mover, clearing its off-board piece counts.
+                Disabled for a game that will be resumed with its captured pieces still off the board.
+                Defaults to True.
         """
         if not chess_board:
             chess_board = chess.Board()
@@ -70,14 +153,46 @@ class Game:
         self.human_color = human_color
         self.physical_board = PhysicalBoard(chess_board)
         self.resigned = False
-        self.piece_mover.reset()
+        self._resignation_recorded = False
+        self.move_tracker = MoveTracker()
+        self.catch_up_depth = catch_up_depth
+        self.pipelined = pipelined
+        self.reply_count = reply_count
+        self.expected_replies: List[chess.Move] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.ponderer: Optional[Ponderer] = None
+        # The robot's search in progress, stopped when the human resigns
+        self._search: Optional[chess.engine.SimpleAnalysisResult] = None
+        self._search_lock = threading.Lock()
+        self._prepared_square: Optional[chess.Square] = None
+        self.ponder_miss_factor = ponder_miss_factor
+        self.opening_book = opening_book
+        self.tablebase = tablebase
+        self.move_cache = move_cache
+        self.engine_pool = engine_pool
+        self.journal = journal
+        self.recorder = recorder
+        self.travel_time_model = travel_time_model
+        self.grasp_retries = grasp_retries
+        self.calibration = calibration
+        # Squares the robot placed pieces on in its last move, observed on the next capture
+        self._placed_squares = chess.BB_EMPTY
+        # Robot move sent to the piece mover but not confirmed, the only move catch_up may start with
+        self._sent_move: Optional[chess.Move] = None
+        self._reset_timing()
+        if reset_mover:
+            self.piece_mover.reset()
 
         self.set_skill_level(self.skill_level)
+        self.set_pondering(ponder)
+        self._begin_journal()
+        self._begin_recording()
 
     def reset_state(
         self,
         chess_board: Optional[chess.Board] = None,
         human_color: Optional[chess.Color] = None,
+        reset_mover: bool = True,
     ) -> None:
         """Resets the game to a specified or new board position.
 
@@ -90,6 +205,8 @@ class Game:
                 If None, defaults to a new game state with an initial position.
             human_color (Optional[chess.Color]): The color that the human player controls
                 (chess.WHITE or chess.BLACK). Defaults to the previously set `player_color`.
+            reset_mover (bool): Whether to reset the piece mover, clearing its off-board piece counts.
+                Defaults to True.
         """
         if not chess_board:
             chess_board = chess.Board()
@@ -106,14 +223,54 @@ class Game:
         self.human_color = human_color
         self.physical_board = PhysicalBoard(chess_board)
         self.resigned = False
+        self._resignation_recorded = False
+        self.expected_replies = []
+        self._placed_squares = chess.BB_EMPTY
+        self._sent_move = None
+        self.move_tracker.reset()
+        self.board_capture.watch(chess.BB_EMPTY)
+        self._start_pondering()
+        self._begin_journal()
+        self._begin_recording()
+        self._reset_timing()
 
         fen = chess_board.fen()
         logger.info(
             f"Resetting board to {'white' if human_color == chess.WHITE else 'black'} perspective with FEN {fen}"
         )
 
-        self.piece_mover.reset()
+        if reset_mover:
+            self.piece_mover.reset()
+
+    def resume(self, state: JournalState) -> bool:
+        """Continues a game recovered from a move journal.
+
+        Restores the board, the human's color, the piece offsets and the engine settings, then
+        synchronizes the physical board with the recovered position. The piece mover is not reset,
+        so it keeps counting the captured pieces still stacked off the board; the game should be
+        constructed with `reset_mover=False` for the same reason.
 
+        Args:
+            state (JournalState): The state replayed from the journal, see `MoveJournal.replay`.
+
+        Returns:
+            bool: True if the physical board was synchronized with the recovered position.
+        """
+        logger.info(
+            "Resuming game after %d moves with %d pieces off the board and FEN %s",
+            len(state.chess_board.move_stack),
+            len(state.reserve),
+            state.chess_board.fen(),
+        )
+        self.set_depth(int(state.settings.get("depth", self.depth)))
+        self.set_skill_level(int(state.settings.get("skill_level", self.skill_level)))
+        self.set_thinking_time(state.settings.get("thinking_time", self.thinking_time))
+        self.reset_state(state.chess_board, state.human_color, reset_mover=False)
+        self.physical_board.piece_offsets = state.piece_offsets
+        self._begin_journal()
+        return self.sync_board()
+
+    @instrumentation.timed("game.sync_board")
     def sync_board(self) -> bool:
         """Synchronizes the physical board with the logical board state.
 
@@ -127,6 +284,9 @@ class Game:
         logger.info("Synchronizing physical board...")
 
         captured_board = None
+        travel_time = None
+        if self.travel_time_model:
+            travel_time = self.travel_time_model.travel_time(self.robot_color)
 
         done = False
         while not done:
@@ -135,7 +295,12 @@ class Game:
                 return False
 
             moved, done = iter_reset_board(
-                self.piece_mover, captured_board, self.physical_board, self.robot_color
+                self.piece_mover,
+                captured_board,
+                self.physical_board,
+                self.robot_color,
+                travel_time=travel_time,
+                calibration=self.calibration,
             )
             if not moved:
                 break
@@ -151,11 +316,42 @@ class Game:
     def set_skill_level(self, skill_level: int = 0) -> None:
         """Configures engine's skill level.
 
+        With an engine pool, the next searches acquire engines configured for the skill level.
+        Pondering is stopped first, so the engine is not reconfigured during an analysis; it
+        resumes on the human's next turn.
+
         Args:
             skill_level (int): The depth level for the chess engine calculations. Defaults to 0.
         """
         self.skill_level = skill_level
-        self.engine.configure({"Skill Level": skill_level})
+        self._journal_settings()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.engine_pool is None and self.engine is not None:
+            self.engine.configure({"Skill Level": skill_level})
+
+    @property
+    def has_engine(self) -> bool:
+        """Whether the game has a dedicated or pooled engine to search with."""
+        return self.engine is not None or self.engine_pool is not None
+
+    @contextmanager
+    def _acquire_engine(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[chess.engine.SimpleEngine]:
+        """Yields the dedicated engine, or a pooled engine of the current skill level for one search.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for a pooled engine (seconds). Defaults to no limit.
+
+        Raises:
+            TimeoutError: If no pooled engine became available within the timeout.
+        """
+        if self.engine_pool is None:
+            yield self.engine
+        else:
+            with self.engine_pool.engine(self.skill_level, timeout) as engine:
+                yield engine
 
     def set_depth(self, depth: int = 4) -> None:
         """Sets the depth for engine's move calculations
@@ -164,6 +360,7 @@ class Game:
             depth (int): The depth level for the chess engine calculations. Defaults to 4.
         """
         self.depth = depth
+        self._journal_settings()
 
     def set_thinking_time(self, thinking_time: float = 1.0) -> None:
         """Sets the thinking time for the engine's move calculations.
@@ -173,9 +370,275 @@ class Game:
                                 will use to think before making a move. Defaults to 1.0.
         """
         self.thinking_time = thinking_time
+        self._journal_settings()
+
+    def settings(self) -> Dict[str, float]:
+        """Returns the engine settings saved with the game's journal.
+
+        Returns:
+            Dict[str, float]: The search depth, skill level and thinking time.
+        """
+        return {
+            "depth": self.depth,
+            "skill_level": self.skill_level,
+            "thinking_time": self.thinking_time,
+        }
+
+    def _begin_journal(self) -> None:
+        if self.journal is not None:
+            self.journal.begin(
+                self.physical_board.chess_board,
+                self.human_color,
+                self.settings(),
+                self.physical_board.piece_offsets,
+            )
+
+    def _journal_settings(self) -> None:
+        if self.journal is not None:
+            self.journal.record_settings(self.settings())
+
+    def _push_move(self, move: chess.Move) -> None:
+        """Pushes a move to the board in memory, appending it to the journal and recording it."""
+        chess_board = self.physical_board.chess_board
+        if self.journal is not None:
+            self.journal.record_move(
+                chess_board, move, self.physical_board.piece_offsets
+            )
+        chess_board.push(move)
+
+        if self.recorder is not None:
+            self.recorder.add_move(move, self._move_timing())
+            if chess_board.is_game_over():
+                self.recorder.finish(chess_board.result())
+        self._reset_timing()
+
+    def _begin_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.begin(
+                self.physical_board.chess_board,
+                self.human_color,
+                f"Robot (skill {self.skill_level}, depth {self.depth})",
+            )
+
+    def _reset_timing(self) -> None:
+        self._turn_started = time.monotonic()
+        self._capture_time = 0.0
+        self._inference_count = 0
+        self._engine_time = 0.0
+        self._execution_time = 0.0
+
+    def _move_timing(self) -> MoveTiming:
+        return MoveTiming(
+            turn_time=time.monotonic() - self._turn_started,
+            capture_time=self._capture_time,
+            inference_count=self._inference_count,
+            engine_time=self._engine_time,
+            execution_time=self._execution_time,
+        )
+
+    def capture_board(self) -> Optional[PhysicalBoard]:
+        """Captures the board from the human's perspective, accounting the time to the current turn.
+
+        Returns:
+            Optional[PhysicalBoard]: The captured board, or None if capturing failed.
+        """
+        inference_count = self.board_capture.inference_count
+        started = time.monotonic()
+        try:
+            return self.board_capture.capture_board(self.human_color)
+        finally:
+            self._capture_time += time.monotonic() - started
+            self._inference_count += self.board_capture.inference_count - inference_count
+
+    def set_pondering(self, enabled: bool = True) -> None:
+        """Enables or disables pondering during the human's turn.
+
+        Args:
+            enabled (bool): Whether the engine should ponder while the human is thinking. Defaults to True.
+        """
+        if enabled and self.ponderer is None and self.has_engine:
+            # Pondering is opportunistic, it never waits for a pooled engine another table uses
+            self.ponderer = Ponderer(lambda: self._acquire_engine(timeout=0), self.reply_count)
+        elif not enabled and self.ponderer is not None:
+            self.ponderer.stop()
+            self.ponderer = None
+
+    def _start_pondering(self) -> None:
+        self._prepared_square = None
+        if self.ponderer is None:
+            return
+
+        if self.current_player != Player.HUMAN or self.resigned:
+            self.ponderer.stop()
+            return
+
+        self.ponderer.start(
+            self.physical_board.chess_board,
+            chess.engine.Limit(depth=self.depth, time=self.thinking_time),
+            self.expected_replies,
+        )
+
+    def prepare_robot_move(self) -> bool:
+        """Moves the robot hand towards the pick-up square of its likely reply during the human's turn.
+
+        The likely reply is the pondered reply to the human's most likely move. The hand is only
+        sent once per expected pick-up square, so this is cheap to call on every idle check.
+
+        Returns:
+            bool: True if the hand was sent towards a new square.
+        """
+        if self.ponderer is None or self.current_player != Player.HUMAN or self.resigned:
+            return False
+
+        prediction = self.ponderer.likely_reply()
+        if prediction is None:
+            return False
+
+        human_move, reply = prediction
+        chess_board = self.physical_board.chess_board.copy(stack=False)
+        if human_move not in chess_board.legal_moves:
+            return False
+        chess_board.push(human_move)
+
+        steps = expand_moves(chess_board, reply)
+        if not steps or steps[0][0] not in chess.SQUARES:
+            return False
+
+        square = steps[0][0]
+        if square == self._prepared_square:
+            return False
+
+        self._prepared_square = square
+        logger.info(
+            f"Preparing robot hand at {chess.square_name(square)} for {reply.uci()} after {human_move.uci()}"
+        )
+        return self.piece_mover.prepare(square, self.robot_color)
+
+    def probe_move(self, chess_board: chess.Board) -> Optional[chess.Move]:
+        """Looks the robot's move up in the opening book, endgame tablebases and move cache.
+
+        Args:
+            chess_board (chess.Board): The board with the robot to move.
+
+        Returns:
+            Optional[chess.Move]: The book, tablebase or cached move, or None if the position is in none of them.
+        """
+        if self.opening_book is not None:
+            move = self.opening_book.choose(chess_board, self.skill_level)
+            if move is not None:
+                logger.info("Book move %s", move.uci())
+                return move
+
+        if self.tablebase is not None:
+            move = self.tablebase.choose(chess_board, self.skill_level)
+            if move is not None:
+                logger.info("Tablebase move %s", move.uci())
+                return move
+
+        if self.move_cache is not None:
+            move = self.move_cache.lookup(
+                chess_board, self.depth, self.skill_level, self.thinking_time
+            )
+            if move is not None:
+                logger.info("Cached move %s", move.uci())
+                return move
+
+        return None
+
+    def record_engine_move(self, chess_board: chess.Board, move: chess.Move) -> None:
+        """Saves a move the engine chose with the game's full search settings to the move cache.
+
+        Args:
+            chess_board (chess.Board): The board the move was chosen for.
+            move (chess.Move): The move chosen by the engine.
+        """
+        if self.move_cache is not None:
+            self.move_cache.record(
+                chess_board, self.depth, self.skill_level, self.thinking_time, move
+            )
+
+    def _engine_move(self) -> Optional[chess.Move]:
+        """Calculates the robot's move, answering from the book, tablebases or ponder cache when possible.
+
+        Returns:
+            Optional[chess.Move]: The move chosen by the engine.
+
+        Raises:
+            RuntimeError: If the game has no engine.
+        """
+        if not self.has_engine:
+            raise RuntimeError("No chess engine set to calculate the robot's move.")
+
+        chess_board = self.physical_board.chess_board
+        thinking_time = self.thinking_time
+
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+        move = self.probe_move(chess_board)
+        if move is not None:
+            return move
+
+        if self.ponderer is not None:
+            move = self.ponderer.lookup(chess_board)
+            if move is not None:
+                logger.info("Ponder hit, playing %s", move.uci())
+                # Pondered replies are searched with the full thinking time
+                self.record_engine_move(chess_board, move)
+                return move
+            thinking_time *= self.ponder_miss_factor
+
+        limit = chess.engine.Limit(depth=self.depth, time=thinking_time)
+        try:
+            with self._acquire_engine() as engine:
+                move = self._search_move(engine, chess_board, limit)
+        except chess.engine.EngineTerminatedError:
+            if self.engine_pool is None:
+                raise
+            # The pool restarts the terminated engine when it is released
+            logger.error("Chess engine terminated, retrying with a restarted engine")
+            with self._acquire_engine() as engine:
+                move = self._search_move(engine, chess_board, limit)
+
+        if move is not None and thinking_time == self.thinking_time:
+            self.record_engine_move(chess_board, move)
+        return move
+
+    def _search_move(
+        self,
+        engine: chess.engine.SimpleEngine,
+        chess_board: chess.Board,
+        limit: chess.engine.Limit,
+    ) -> Optional[chess.Move]:
+        """Searches the robot's move as an analysis that `resign_human` can stop.
+
+        Args:
+            engine (chess.engine.SimpleEngine): The engine to search with.
+            chess_board (chess.Board): The board with the robot to move.
+            limit (chess.engine.Limit): The search limit.
+
+        Returns:
+            Optional[chess.Move]: The engine's best move, None if the human resigned before or during the search.
+        """
+        with self._search_lock:
+            if self.resigned:
+                return None
+            search = engine.analysis(chess_board, limit)
+            self._search = search
+
+        try:
+            with search, instrumentation.timer("engine.play"):
+                best = search.wait()
+        finally:
+            with self._search_lock:
+                self._search = None
+
+        return None if self.resigned else best.move
 
     def robot_makes_move(
-        self, move: Optional[chess.Move] = None
+        self,
+        move: Optional[chess.Move] = None,
+        captured_board: Optional[PhysicalBoard] = None,
     ) -> Optional[chess.Move]:
         """Executes the robot's move on the physical board.
 
@@ -183,29 +646,69 @@ class Game:
 
         Args:
             move (Optional[chess.Move]): The move to execute. If None, the engine calculates the move.
+            captured_board (Optional[PhysicalBoard]): A board captured since the board last changed, e.g.
+                the capture completing the human's move. If None, the board is captured first.
 
         Returns:
             Optional[chess.Move]: The move made by the robot, or None if an error occurs.
         """
-        captured_board = self.board_capture.capture_board(self.human_color)
+        if captured_board is None:
+            captured_board = self.capture_board()
         if captured_board is None:
             return None
 
-        if not are_boards_equal(
-            self.physical_board.chess_board, captured_board.chess_board
-        ):
-            logger.info(
-                "Captured board does not match previous legal board for robot to move; waiting for realignment"
-            )
+        if not self.verify_robot_position(captured_board):
             return None
 
         if move is None:
-            result = self.engine.play(
-                self.physical_board.chess_board,
-                chess.engine.Limit(depth=self.depth, time=self.thinking_time),
+            started = time.monotonic()
+            move = self._engine_move()
+            self._engine_time += time.monotonic() - started
+            if self.resigned:
+                logger.info("Human resigned during the robot's search, not moving")
+                return None
+        elif self.ponderer is not None:
+            self.ponderer.stop()
+
+        return self.apply_robot_move(move, captured_board)
+
+    def verify_robot_position(self, captured_board: PhysicalBoard) -> bool:
+        """Checks that the captured board matches the board in memory before the robot moves.
+
+        Unregistered moves are recovered with `catch_up` when possible, but the robot still
+        waits for the next capture in that case.
+
+        Args:
+            captured_board (PhysicalBoard): The board captured on the robot's turn.
+
+        Returns:
+            bool: True if the robot may move on this board.
+        """
+        changed = changed_squares(
+            self.physical_board.chess_board, captured_board.chess_board
+        )
+        if not changed:
+            return True
+
+        if not self.catch_up(captured_board):
+            logger.info(
+                "Captured board does not match previous legal board for robot to move on squares %s; waiting for realignment",
+                format_squares(changed),
             )
-            move = result.move
+        return False
+
+    def apply_robot_move(
+        self, move: Optional[chess.Move], captured_board: PhysicalBoard
+    ) -> Optional[chess.Move]:
+        """Executes a calculated robot move on the physical board and saves it.
 
+        Args:
+            move (Optional[chess.Move]): The move to execute.
+            captured_board (PhysicalBoard): The verified board captured on the robot's turn.
+
+        Returns:
+            Optional[chess.Move]: The move made by the robot, or None if an error occurs.
+        """
         logger.info(f"Current board: {self.physical_board.chess_board.fen()}")
         logger.info("Robot is making move %s", move and move.uci())
 
@@ -214,39 +717,211 @@ class Game:
             return None
 
         self.physical_board.piece_offsets = captured_board.piece_offsets
-        if not execute_move(
-            self.piece_mover, self.physical_board, move, self.robot_color
-        ):
+        placed_squares = chess.BB_EMPTY
+        for _, to_square in expand_moves(self.physical_board.chess_board, move):
+            if to_square in chess.SQUARES:
+                placed_squares |= chess.BB_SQUARES[to_square]
+
+        self._sent_move = move
+        started = time.monotonic()
+        if self.pipelined:
+            executed = self._execute_pipelined(move)
+        else:
+            executed = self._execute_move(move)
+        self._execution_time += time.monotonic() - started
+        if not executed:
             return None
 
+        self._sent_move = None
+        self._placed_squares = placed_squares
         self.current_player = Player.HUMAN
-        self.physical_board.chess_board.push(move)
+        self._push_move(move)
+        self._start_pondering()
         return move
 
+    def _execute_pipelined(self, move: chess.Move) -> bool:
+        """Executes the robot's move on a worker thread while the engine analyses the human's replies.
+
+        The engine analysis is stopped as soon as the robot hand reports the move done. A failed
+        analysis only loses the expected replies, the move's execution is always awaited.
+
+        Args:
+            move (chess.Move): The legal robot move to execute.
+
+        Returns:
+            bool: True if the move was successfully executed on the physical board.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="robot-move"
+            )
+
+        next_board = self.physical_board.chess_board.copy()
+        next_board.push(move)
+
+        execution = self._executor.submit(self._execute_move, move)
+        try:
+            self.expected_replies = self._analyse_replies(next_board, execution)
+        except Exception:
+            logger.exception("Analysing the human's replies failed!")
+            self.expected_replies = []
+        finally:
+            executed = execution.result()
+
+        if self.expected_replies:
+            logger.info(
+                "Expected human replies: %s",
+                " ".join(reply.uci() for reply in self.expected_replies),
+            )
+        return executed
+
+    def _execute_move(self, move: chess.Move) -> bool:
+        return execute_move_verified(
+            self.piece_mover,
+            self.physical_board,
+            move,
+            self.robot_color,
+            self.board_capture,
+            self.grasp_retries,
+            calibration=self.calibration,
+        )
+
+    def _analyse_replies(
+        self, chess_board: chess.Board, execution: "Future[bool]"
+    ) -> List[chess.Move]:
+        """Analyses the most likely human replies until the robot's move is executed.
+
+        Args:
+            chess_board (chess.Board): The board after the robot's move.
+            execution (Future[bool]): The pending robot move execution, stops the analysis once done.
+
+        Returns:
+            List[chess.Move]: Likely human replies, best first. Empty if the game is over.
+        """
+        if chess_board.is_game_over() or not self.has_engine:
+            return []
+
+        with self._acquire_engine() as engine, engine.analysis(
+            chess_board,
+            chess.engine.Limit(depth=self.depth),
+            multipv=self.reply_count,
+        ) as analysis:
+            execution.add_done_callback(lambda _: analysis.stop())
+            analysis.wait()
+
+            return [info["pv"][0] for info in analysis.multipv if info.get("pv")]
+
+    def catch_up(self, captured_board: PhysicalBoard) -> bool:
+        """Recovers moves that were made between captures without being registered.
+
+        This happens when the robot's move was physically executed but not confirmed,
+        e.g. after a lost acknowledgement, possibly followed by the human's reply. Only sequences
+        starting with the robot's unconfirmed move are accepted, so the human moving the robot's
+        pieces or a partly executed robot move is never taken for a move the engine chose.
+
+        Args:
+            captured_board (PhysicalBoard): The captured board that differs from the board in memory.
+
+        Returns:
+            bool: True if a sequence of legal moves explaining the captured board was found and applied.
+        """
+        sent_move = self._sent_move
+        if sent_move is None or self.catch_up_depth < 1:
+            return False
+
+        chess_board = self.physical_board.chess_board.copy(stack=False)
+        if sent_move not in chess_board.legal_moves:
+            return False
+        chess_board.push(sent_move)
+
+        replies = find_move_sequence(
+            chess_board, captured_board.chess_board, self.catch_up_depth - 1
+        )
+        if replies is None:
+            return False
+
+        moves = [sent_move] + replies
+        self._sent_move = None
+
+        logger.warning(
+            "Recovered unregistered moves %s", " ".join(move.uci() for move in moves)
+        )
+
+        self.physical_board.piece_offsets = captured_board.piece_offsets
+        for move in moves:
+            self._push_move(move)
+        self.move_tracker.reset()
+
+        if self.physical_board.chess_board.turn == self.human_color:
+            self.current_player = Player.HUMAN
+        else:
+            self.current_player = Player.ROBOT
+
+        self.expected_replies = []
+        self._start_pondering()
+        return True
+
     def human_made_move(self) -> Tuple[Optional[chess.Move], bool]:
         """Detects and validates the move made by the human player.
 
+        Intermediate states of a legal move, such as a lifted piece or a half-done capture,
+        are not reported as moves; the capture system is told which squares to watch instead.
+
         Returns:
             Tuple[Optional[chess.Move], bool]: The detected move and a boolean indicating if it was legal.
         """
-        captured_board = self.board_capture.capture_board(self.human_color)
+        captured_board = self.capture_board()
         if captured_board is None:
             return None, False
 
-        move, legal = identify_move(
+        return self.apply_human_capture(captured_board)
+
+    def apply_human_capture(
+        self, captured_board: PhysicalBoard
+    ) -> Tuple[Optional[chess.Move], bool]:
+        """Recognizes the human's move on a captured board and saves it if legal.
+
+        Args:
+            captured_board (PhysicalBoard): The board captured on the human's turn.
+
+        Returns:
+            Tuple[Optional[chess.Move], bool]: The detected move and a boolean indicating if it was legal.
+        """
+        self._observe_placement(captured_board)
+        recognition = self.move_tracker.update(
             self.physical_board.chess_board, captured_board.chess_board
         )
+        self.board_capture.watch(recognition.watch_squares)
+
+        move = recognition.move
+        legal = recognition.state == MoveState.COMPLETED
         if move:
             logger.info(
                 f"Human made {'legal' if legal else 'illegal'} move {move.uci()}"
             )
             if legal:
-                self.physical_board.chess_board.push(move)
                 self.physical_board.piece_offsets = captured_board.piece_offsets
+                self._push_move(move)
                 self.current_player = Player.ROBOT
+                self.move_tracker.reset()
 
         return move, legal
 
+    def _observe_placement(self, captured_board: PhysicalBoard) -> None:
+        """Updates the placement calibration with the pieces the robot placed in its last move.
+
+        Only the first capture after the robot's move is used, and only on squares the human
+        has not touched since.
+        """
+        if self.calibration is None or not self._placed_squares:
+            return
+
+        untouched = self._placed_squares & ~changed_squares(
+            self.physical_board.chess_board, captured_board.chess_board
+        )
+        self.calibration.observe(captured_board, untouched, self.robot_color)
+        self._placed_squares = chess.BB_EMPTY
+
     def result(self) -> str:
         """Determines the current game result from the human player's perspective.
 
@@ -274,10 +949,45 @@ class Game:
     def resign_human(self):
         """Marks the human player as resigned, ending the game for them.
 
-        This sets the `resigned` flag to True, indicating the human player has resigned.
-        It does not affect the robot player.
+        This only sets the `resigned` flag and stops the robot's search in progress, so it is safe
+        to call from any thread, e.g. the GUI's. The thread playing the game then stops pondering and
+        records the resignation with `record_resignation`, see `GameLoop`.
         """
-        self.resigned = True
+        with self._search_lock:
+            self.resigned = True
+            if self._search is not None:
+                self._search.stop()
+
+    def record_resignation(self) -> None:
+        """Stops pondering and records the human's resignation in the journal and the game record.
+
+        Called on the thread playing the game once `resigned` is set. Does nothing if the human has
+        not resigned or the resignation was already recorded.
+        """
+        if not self.resigned or self._resignation_recorded:
+            return
+
+        self._resignation_recorded = True
+        self._start_pondering()
+        if self.journal is not None:
+            self.journal.record_result("resigned")
+        if self.recorder is not None:
+            self.recorder.finish(
+                "1-0" if self.robot_color == chess.WHITE else "0-1", "resigned"
+            )
+
+    def close(self) -> None:
+        """Stops background work and finishes the game's journal and recording."""
+        self.record_resignation()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.journal is not None:
+            self.journal.close()
+        if self.recorder is not None:
+            self.recorder.finish("*", "abandoned")
 
     def get_chess_board(self) -> chess.Board:
         """Returns the current logical chess board state.
@@ -0,0 +1,203 @@
+import logging
+import threading
+from enum import Enum
+from typing import Callable, Optional, Tuple
+
+import chess
+
+from src.core.board import PhysicalBoard
+from src.core.game import Game, Player
+
+logger = logging.getLogger(__name__)
+
+
+class LoopState(Enum):
+    ROBOT_TURN = 0
+    HUMAN_TURN = 1
+    GAME_OVER = 2
+
+
+class GameLoop:
+    """Event-driven loop playing a `Game` until it is over.
+
+    The loop is a state machine over the robot's turn, the human's turn and the end of the game.
+    Transitions are driven by events instead of back-to-back captures:
+
+    - On the human's turn the loop blocks in `BoardCapture.wait_for_change` and only runs a full
+      capture when the capture layer reports the board may have changed.
+    - When the robot's move is done, the loop turns to the human, polling at the shortest
+      interval while the human is expected to move.
+    - The capture completing the human's move is reused for the robot's turn unless the board
+      changed since, so the robot does not capture again.
+    - `notify` wakes the loop, e.g. when the human resigns from the GUI. The resignation is then
+      recorded on the loop's thread, which owns the game's journal, recorder and ponderer.
+    - While the human thinks, the robot hand is pre-positioned for the pondered reply.
+    - While the piece mover is disconnected, the robot's turn waits at the polling interval
+      instead of capturing and searching for a move it cannot execute.
+
+    The polling interval grows by `backoff` whenever a check found nothing to do, up to
+    `max_interval`, and drops back to `min_interval` as soon as something happens.
+
+    Attributes:
+        game (Game): The game played.
+        min_interval (float): Shortest polling interval, used while a move is expected (seconds).
+        max_interval (float): Longest polling interval, used when the board is idle (seconds).
+        backoff (float): Factor the interval grows by after an idle check.
+        interval (float): The current polling interval (seconds).
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        min_interval: float = 0.05,
+        max_interval: float = 1.0,
+        backoff: float = 2.0,
+    ) -> None:
+        """Initializes the loop for a game.
+
+        Args:
+            game (Game): The game to play.
+            min_interval (float): Shortest polling interval, in seconds. Defaults to 0.05.
+            max_interval (float): Longest polling interval, in seconds. Defaults to 1.0.
+            backoff (float): Factor the interval grows by after an idle check. Defaults to 2.0.
+        """
+        self.game = game
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+
+        self._wake = threading.Event()
+        self._stopped = False
+        self._last_capture: Optional[PhysicalBoard] = None
+
+    @property
+    def state(self) -> LoopState:
+        """LoopState: The state of the game loop."""
+        if self.game.result() != "*":
+            return LoopState.GAME_OVER
+        if self.game.current_player == Player.ROBOT:
+            return LoopState.ROBOT_TURN
+        return LoopState.HUMAN_TURN
+
+    def notify(self) -> None:
+        """Wakes the loop to re-evaluate the game, e.g. after the human resigned.
+
+        Safe to call from any thread.
+        """
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stops the loop after the current step. Safe to call from any thread."""
+        self._stopped = True
+        self._wake.set()
+
+    def step(self) -> Tuple[Optional[chess.Move], bool]:
+        """Handles the current state once, waiting for an event where there is nothing to do.
+
+        Returns:
+            Tuple[Optional[chess.Move], bool]: The detected or executed move and whether it was legal.
+        """
+        state = self.state
+        if state == LoopState.ROBOT_TURN:
+            return self._robot_turn()
+        if state == LoopState.HUMAN_TURN:
+            return self._human_turn()
+        self.game.record_resignation()
+        return None, False
+
+    def run(
+        self,
+        on_move: Optional[Callable[[chess.Move, bool], None]] = None,
+        on_state: Optional[Callable[[LoopState], None]] = None,
+    ) -> str:
+        """Plays the game until it is over or the loop is stopped.
+
+        Args:
+            on_move (Optional[Callable[[chess.Move, bool], None]]): Called with every detected move and
+                whether it was legal.
+            on_state (Optional[Callable[[LoopState], None]]): Called on every state transition, and
+                once with the initial state.
+
+        Returns:
+            str: The result of the game from the human player's perspective, see `Game.result`.
+        """
+        self._stopped = False
+        previous_state = None
+
+        while not self._stopped:
+            state = self.state
+            if state != previous_state:
+                logger.debug("Game loop state %s", state.name)
+                previous_state = state
+                if on_state:
+                    on_state(state)
+            if state == LoopState.GAME_OVER:
+                self.game.record_resignation()
+                break
+
+            move, legal = self.step()
+            if move and on_move:
+                on_move(move, legal)
+
+        return self.game.result()
+
+    def _robot_turn(self) -> Tuple[Optional[chess.Move], bool]:
+        if not self.game.piece_mover.connected:
+            # Nothing can be executed until the robot hand reconnects
+            self._wait_for_change()
+            return None, False
+
+        captured_board = self._last_capture
+        self._last_capture = None
+        if captured_board is not None and self.game.board_capture.wait_for_change(0):
+            captured_board = None
+
+        move = self.game.robot_makes_move(captured_board=captured_board)
+        if move is not None:
+            # The arm is done, the human is expected to move next
+            self.interval = self.min_interval
+            return move, True
+
+        # The board is not ready for the robot, nothing improves until it changes
+        self._wait_for_change()
+        self._idle()
+        return None, False
+
+    def _human_turn(self) -> Tuple[Optional[chess.Move], bool]:
+        self.game.prepare_robot_move()
+        if not self._wait_for_change():
+            return None, False
+
+        captured_board = self.game.capture_board()
+        if captured_board is None:
+            self._idle()
+            return None, False
+
+        move, legal = self.game.apply_human_capture(captured_board)
+        if legal:
+            self._last_capture = captured_board
+        if move or self.game.move_tracker.in_progress:
+            self.interval = self.min_interval
+        else:
+            self._idle()
+        return move, legal
+
+    def _wait_for_change(self) -> bool:
+        """Waits up to the current interval for a board change or a wake-up, returning True on either."""
+        if self._wake.is_set():
+            self._wake.clear()
+            return True
+
+        if self.game.board_capture.wait_for_change(self.interval):
+            return True
+
+        self._idle()
+        if self._wake.is_set():
+            self._wake.clear()
+            return True
+        return False
+
+    def _idle(self) -> None:
+        self.interval = min(self.interval * self.backoff, self.max_interval)
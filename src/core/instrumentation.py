@@ -0,0 +1,345 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Sub-buckets per power of two, giving a relative error below 2%
+SUB_BUCKET_BITS = 7
+_SUB_BUCKET_MASK = (1 << SUB_BUCKET_BITS) - 1
+
+_enabled = False
+_lock = threading.Lock()
+_histograms: Dict[str, "Histogram"] = {}
+_counters: Dict[str, int] = {}
+_reporter: Optional["Reporter"] = None
+
+F = TypeVar("F", bound=Callable)
+
+
+class Histogram:
+    """HDR-style histogram of latencies with a bounded relative error.
+
+    Values are recorded in microseconds into log-linear buckets: every power of two is split into
+    `2 ** (SUB_BUCKET_BITS - 1)` linear sub-buckets, so percentiles stay within 2% of the true
+    value from microseconds to hours, while memory only grows with the number of distinct buckets.
+
+    Attributes:
+        count (int): Number of recorded values.
+        total (float): Sum of the recorded values (seconds).
+        min (float): Smallest recorded value (seconds).
+        max (float): Largest recorded value (seconds).
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(microseconds: int) -> int:
+        shift = max(0, microseconds.bit_length() - SUB_BUCKET_BITS)
+        return (shift << SUB_BUCKET_BITS) | (microseconds >> shift)
+
+    @staticmethod
+    def _bucket_value(bucket: int) -> float:
+        """Returns the middle of a bucket in seconds."""
+        shift = bucket >> SUB_BUCKET_BITS
+        lowest = (bucket & _SUB_BUCKET_MASK) << shift
+        return (lowest + ((1 << shift) - 1) / 2) / 1e6
+
+    def record(self, seconds: float) -> None:
+        """Records a latency.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        bucket = self._bucket(max(0, int(seconds * 1e6)))
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.min = min(self.min, seconds)
+            self.max = max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> float:
+        """Returns the latency at a percentile.
+
+        Args:
+            percentile (float): The percentile, from 0 to 100.
+
+        Returns:
+            float: The latency in seconds, 0.0 if nothing was recorded.
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+
+            rank = max(1, round(percentile / 100 * self.count))
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(max(self._bucket_value(bucket), self.min), self.max)
+            return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Summarizes the histogram.
+
+        Returns:
+            Dict[str, float]: Count, and mean, minimum, percentile and maximum latencies in milliseconds.
+        """
+        if self.count == 0:
+            return {"count": 0}
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3,
+            "min_ms": self.min * 1e3,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p90_ms": self.percentile(90) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+def enable(enabled: bool = True) -> None:
+    """Enables or disables recording of timers and counters.
+
+    Instrumentation is disabled by default. While disabled, timers cost a single flag check, so
+    hot paths stay instrumented in production.
+
+    Args:
+        enabled (bool): Whether to record. Defaults to True.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Returns whether timers and counters are recorded.
+
+    Returns:
+        bool: True if instrumentation is enabled.
+    """
+    return _enabled
+
+
+def histogram(name: str) -> Histogram:
+    """Returns the histogram of a stage, creating it if needed.
+
+    Args:
+        name (str): Name of the stage, e.g. "camera.capture_image".
+
+    Returns:
+        Histogram: The stage's histogram.
+    """
+    hist = _histograms.get(name)
+    if hist is None:
+        with _lock:
+            hist = _histograms.setdefault(name, Histogram())
+    return hist
+
+
+def record(name: str, seconds: float) -> None:
+    """Records a latency of a stage if instrumentation is enabled.
+
+    Args:
+        name (str): Name of the stage.
+        seconds (float): The latency in seconds.
+    """
+    if _enabled:
+        histogram(name).record(seconds)
+
+
+def count(name: str, increment: int = 1) -> None:
+    """Increments a counter if instrumentation is enabled, e.g. for retries.
+
+    Args:
+        name (str): Name of the counter.
+        increment (int): Amount to add. Defaults to 1.
+    """
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + increment
+
+
+@contextmanager
+def _timer(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram(name).record(time.perf_counter() - started)
+
+
+@contextmanager
+def _null_timer() -> Iterator[None]:
+    yield
+
+
+def timer(name: str):
+    """Times a `with` block as a stage.
+
+    Args:
+        name (str): Name of the stage, e.g. "engine.play".
+
+    Returns:
+        ContextManager[None]: Context manager recording the block's duration, a no-op while disabled.
+    """
+    if not _enabled:
+        return _null_timer()
+    return _timer(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator timing every call of a function as a stage.
+
+    Args:
+        name (Optional[str]): Name of the stage. Defaults to the function's qualified name.
+
+    Returns:
+        Callable[[F], F]: The decorator.
+    """
+
+    def decorator(func: F) -> F:
+        stage = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram(stage).record(time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """Summarizes all stages and counters.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Histogram summaries by stage name, and counters under "counters".
+    """
+    with _lock:
+        histograms = dict(_histograms)
+        counters = dict(_counters)
+
+    result = {name: hist.summary() for name, hist in sorted(histograms.items())}
+    if counters:
+        result["counters"] = counters
+    return result
+
+
+def reset() -> None:
+    """Discards all recorded latencies and counters."""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def dump(path: Optional[str] = None) -> None:
+    """Writes the summary to the log, or atomically to a JSON file.
+
+    Args:
+        path (Optional[str]): Path to the JSON file. Defaults to logging the summary.
+    """
+    stages = summary()
+    if path is None:
+        for name, stats in stages.items():
+            if name == "counters" or not stats.get("count"):
+                continue
+            logger.info(
+                "%s: n=%d mean=%.1fms p50=%.1fms p90=%.1fms p99=%.1fms max=%.1fms",
+                name,
+                stats["count"],
+                stats["mean_ms"],
+                stats["p50_ms"],
+                stats["p90_ms"],
+                stats["p99_ms"],
+                stats["max_ms"],
+            )
+        if "counters" in stages:
+            logger.info("Counters: %s", stages["counters"])
+        return
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as file:
+        json.dump({"time": time.time(), "stages": stages}, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+class Reporter:
+    """Background thread dumping the summary periodically.
+
+    Attributes:
+        interval (float): Time between dumps (seconds).
+        path (Optional[str]): JSON file to dump to, None to log the summary.
+    """
+
+    def __init__(self, interval: float = 60.0, path: Optional[str] = None) -> None:
+        """Starts the reporting thread.
+
+        Args:
+            interval (float): Time between dumps, in seconds. Defaults to 60.0.
+            path (Optional[str]): JSON file to dump to. Defaults to logging the summary.
+        """
+        self.interval = interval
+        self.path = path
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="instrumentation", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._dump()
+
+    def _dump(self) -> None:
+        try:
+            dump(self.path)
+        except OSError:
+            logger.exception("Failed dumping instrumentation summary!")
+
+    def stop(self) -> None:
+        """Stops the thread after a final dump."""
+        self._stop_event.set()
+        self._thread.join()
+        self._dump()
+
+
+def start_reporting(interval: float = 60.0, path: Optional[str] = None) -> None:
+    """Enables instrumentation and dumps the summary every `interval` seconds.
+
+    Args:
+        interval (float): Time between dumps, in seconds. Defaults to 60.0.
+        path (Optional[str]): JSON file to dump to. Defaults to logging the summary.
+    """
+    global _reporter
+    stop_reporting()
+    enable()
+    _reporter = Reporter(interval, path)
+
+
+def stop_reporting() -> None:
+    """Stops periodic dumps, dumping a final summary."""
+    global _reporter
+    if _reporter is not None:
+        _reporter.stop()
+        _reporter = None
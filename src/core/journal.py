@@ -0,0 +1,280 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import chess
+
+from src.core.board import OFFSET_SQUARE_CENTER, PieceOffset
+from src.core.moves import en_passant_captured
+
+logger = logging.getLogger(__name__)
+
+
+class JournalState(NamedTuple):
+    """Game state recovered from a move journal.
+
+    Attributes:
+        chess_board (chess.Board): The board with every journaled move pushed.
+        human_color (chess.Color): The color the human player controls.
+        piece_offsets (List[List[PieceOffset]]): Piece offsets after the last move, in white perspective.
+        settings (Dict[str, float]): The last journaled engine settings, e.g. depth and skill level.
+        reserve (List[chess.Piece]): Pieces moved off the board, in the order they were removed.
+        result (Optional[str]): The result if the game was finished, e.g. "resigned", None otherwise.
+    """
+
+    chess_board: chess.Board
+    human_color: chess.Color
+    piece_offsets: List[List[PieceOffset]]
+    settings: Dict[str, float]
+    reserve: List[chess.Piece]
+    result: Optional[str]
+
+
+class MoveJournal:
+    """Append-only journal of the game in progress, used to resume it after a crash.
+
+    Every game starts a new journal file holding the starting position, the human's color and
+    the engine settings. Every move is appended as a JSON line with the captured piece and the
+    piece offsets after the move. Lines are flushed to the operating system immediately, so they
+    survive a crash of the process, and fsynced in batches of `sync_every` lines or after
+    `sync_interval` seconds, bounding what a power loss can lose without paying an fsync per move.
+    A timer syncs lines left pending while the game pauses, e.g. while the human is thinking.
+
+    Attributes:
+        path (str): Path to the journal file.
+        sync_every (int): Number of appended lines after which the journal is fsynced.
+        sync_interval (float): Maximum time an appended line stays unsynced (seconds).
+    """
+
+    def __init__(self, path: str, sync_every: int = 8, sync_interval: float = 1.0) -> None:
+        """Initializes the journal. No file is written until `begin` is called.
+
+        Args:
+            path (str): Path to the journal file.
+            sync_every (int): Number of appended lines after which the journal is fsynced. Defaults to 8.
+            sync_interval (float): Maximum time an appended line stays unsynced, in seconds. Defaults to 1.0.
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # Guards the file against the sync timer's thread
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def begin(
+        self,
+        chess_board: chess.Board,
+        human_color: chess.Color,
+        settings: Dict[str, float],
+        piece_offsets: Optional[List[List[PieceOffset]]] = None,
+    ) -> None:
+        """Starts a new journal for a game, replacing the previous game's journal atomically.
+
+        Moves already on the board's move stack are journaled as well, so a resumed game keeps
+        its full history.
+
+        Args:
+            chess_board (chess.Board): The current board.
+            human_color (chess.Color): The color the human player controls.
+            settings (Dict[str, float]): The engine settings, e.g. depth and skill level.
+            piece_offsets (Optional[List[List[PieceOffset]]]): Current piece offsets, in white perspective.
+        """
+        self.close()
+
+        root = chess_board.root()
+        lines = [
+            {
+                "type": "start",
+                "fen": root.fen(),
+                "human_color": "white" if human_color == chess.WHITE else "black",
+                "settings": settings,
+            }
+        ]
+        for ply, move in enumerate(chess_board.move_stack, start=1):
+            last = ply == len(chess_board.move_stack)
+            lines.append(self._move_record(root, move, piece_offsets if last else None))
+            root.push(move)
+
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            file.writelines(json.dumps(line) + "\n" for line in lines)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+
+        with self._lock:
+            self._file = open(self.path, "a")
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def record_move(
+        self,
+        chess_board: chess.Board,
+        move: chess.Move,
+        piece_offsets: List[List[PieceOffset]],
+    ) -> None:
+        """Appends a move to the journal.
+
+        Args:
+            chess_board (chess.Board): The board before the move.
+            move (chess.Move): The move.
+            piece_offsets (List[List[PieceOffset]]): Piece offsets after the move, in white perspective.
+        """
+        self._append(self._move_record(chess_board, move, piece_offsets))
+
+    def record_settings(self, settings: Dict[str, float]) -> None:
+        """Appends changed engine settings to the journal.
+
+        Args:
+            settings (Dict[str, float]): The engine settings, e.g. depth and skill level.
+        """
+        self._append({"type": "settings", "settings": settings})
+
+    def record_result(self, result: str) -> None:
+        """Appends the result of a game that ended other than on the board, e.g. by resignation.
+
+        Args:
+            result (str): The result, see `Game.result`.
+        """
+        self._append({"type": "result", "result": result})
+        self.sync()
+
+    def sync(self) -> None:
+        """Forces appended lines to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Syncs and closes the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _sync(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._file is None or self._pending == 0:
+            return
+
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _append(self, line: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+
+            self._file.write(json.dumps(line) + "\n")
+            self._file.flush()
+            self._pending += 1
+
+            elapsed = time.monotonic() - self._last_sync
+            if self._pending >= self.sync_every or elapsed >= self.sync_interval:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval - elapsed, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @staticmethod
+    def _move_record(
+        chess_board: chess.Board,
+        move: chess.Move,
+        piece_offsets: Optional[List[List[PieceOffset]]],
+    ) -> dict:
+        if chess_board.is_en_passant(move):
+            captured = chess_board.piece_at(en_passant_captured(move))
+        else:
+            captured = chess_board.piece_at(move.to_square)
+
+        record = {
+            "type": "move",
+            "move": move.uci(),
+            "captured": captured.symbol() if captured else None,
+        }
+        if piece_offsets is not None:
+            record["offsets"] = [
+                [[round(offset.x, 4), round(offset.y, 4)] for offset in row]
+                for row in piece_offsets
+            ]
+        return record
+
+    @staticmethod
+    def replay(path: str) -> Optional[JournalState]:
+        """Recovers the game state from a journal.
+
+        A truncated last line, e.g. from a crash mid-write, is ignored.
+
+        Args:
+            path (str): Path to the journal file.
+
+        Returns:
+            Optional[JournalState]: The recovered state, or None if there is no journal or it has no game.
+        """
+        try:
+            with open(path) as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return None
+
+        state = None
+        for number, line in enumerate(lines, start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring corrupt journal line {number}")
+                continue
+
+            if record["type"] == "start":
+                state = JournalState(
+                    chess_board=chess.Board(record["fen"]),
+                    human_color=record["human_color"] == "white",
+                    piece_offsets=[[OFFSET_SQUARE_CENTER] * 8 for _ in range(8)],
+                    settings=record["settings"],
+                    reserve=[],
+                    result=None,
+                )
+            elif state is None:
+                continue
+            elif record["type"] == "move":
+                move = chess.Move.from_uci(record["move"])
+                if move not in state.chess_board.legal_moves:
+                    logger.error(f"Illegal journaled move {move}, stopping replay!")
+                    break
+
+                if record["captured"]:
+                    state.reserve.append(chess.Piece.from_symbol(record["captured"]))
+                if move.promotion:
+                    pawn = chess.Piece(chess.PAWN, state.chess_board.turn)
+                    promoted = chess.Piece(move.promotion, state.chess_board.turn)
+                    state.reserve.append(pawn)
+                    if promoted in state.reserve:
+                        state.reserve.remove(promoted)
+
+                state.chess_board.push(move)
+                if "offsets" in record:
+                    state = state._replace(
+                        piece_offsets=[
+                            [PieceOffset(x, y) for x, y in row]
+                            for row in record["offsets"]
+                        ]
+                    )
+            elif record["type"] == "settings":
+                state.settings.update(record["settings"])
+            elif record["type"] == "result":
+                state = state._replace(result=record["result"])
+
+        if state is not None and state.result is None and state.chess_board.is_game_over():
+            state = state._replace(result=state.chess_board.result())
+        return state
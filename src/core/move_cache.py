@@ -0,0 +1,223 @@
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import chess
+import chess.polyglot
+
+from src.core.probing import MAX_SKILL_LEVEL
+
+logger = logging.getLogger(__name__)
+
+# Number of recorded moves between checks for rows to evict
+EVICTION_INTERVAL = 100
+
+
+def signed_hash(zobrist_hash: int) -> int:
+    """Converts an unsigned 64-bit Zobrist hash to the signed range SQLite stores.
+
+    Args:
+        zobrist_hash (int): The unsigned 64-bit hash.
+
+    Returns:
+        int: The same bits interpreted as a signed 64-bit integer.
+    """
+    return zobrist_hash - (1 << 64) if zobrist_hash >= (1 << 63) else zobrist_hash
+
+
+class MoveCache:
+    """Persistent SQLite cache of the engine's moves, shared across games and processes.
+
+    Moves are keyed by the position's Zobrist hash together with the search depth, skill
+    level and thinking time. Every engine move played for a key is counted, so the cache
+    learns the distribution of moves a weakened engine plays. Below the maximum skill level
+    a key is only answered from the cache once `min_samples` engine moves were recorded,
+    and the answer is sampled from the `top_k` most frequent moves, keeping the weakness of
+    low skill levels. With probability `explore_rate` a known key is not answered, so the
+    engine keeps being asked and the counts keep following its move distribution instead of
+    freezing after the first samples. The least recently used rows are evicted beyond
+    `max_entries`.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+        max_entries (int): Maximum number of cached position and move rows.
+        min_samples (int): Engine moves needed per key before answering below the maximum skill level.
+        top_k (int): Number of most frequent moves sampled from.
+        explore_rate (float): Probability of leaving a cached key to the engine to sample it again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        min_samples: int = 8,
+        top_k: int = 4,
+        explore_rate: float = 0.1,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Opens or creates the cache database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            max_entries (int): Maximum number of cached position and move rows. Defaults to 100000.
+            min_samples (int): Engine moves needed per key before answering below the maximum skill level. Defaults to 8.
+            top_k (int): Number of most frequent moves sampled from. Defaults to 4.
+            explore_rate (float): Probability of leaving a cached key to the engine. Defaults to 0.1.
+            rng (Optional[random.Random]): Random number generator used for sampling.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.min_samples = min_samples
+        self.top_k = top_k
+        self.explore_rate = explore_rate
+        self.rng = rng if rng is not None else random.Random()
+
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS moves (
+                position INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                skill_level INTEGER NOT NULL,
+                thinking_time REAL NOT NULL,
+                move TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (position, depth, skill_level, thinking_time, move)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS moves_last_used ON moves (last_used)"
+        )
+
+    def lookup(
+        self,
+        chess_board: chess.Board,
+        depth: int,
+        skill_level: int,
+        thinking_time: float,
+    ) -> Optional[chess.Move]:
+        """Samples a cached engine move for the position and search settings.
+
+        Args:
+            chess_board (chess.Board): The board with the robot to move.
+            depth (int): The search depth.
+            skill_level (int): The engine's skill level.
+            thinking_time (float): The engine's thinking time in seconds.
+
+        Returns:
+            Optional[chess.Move]: A cached legal move, or None if too few moves were recorded or
+                the engine is to be sampled again.
+        """
+        key = (
+            signed_hash(chess.polyglot.zobrist_hash(chess_board)),
+            depth,
+            skill_level,
+            thinking_time,
+        )
+
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT move, count FROM moves
+                WHERE position = ? AND depth = ? AND skill_level = ? AND thinking_time = ?
+                ORDER BY count DESC
+                """,
+                key,
+            ).fetchall()
+
+            samples = sum(count for _, count in rows)
+            required = 1 if skill_level >= MAX_SKILL_LEVEL else self.min_samples
+            if not rows or samples < required:
+                return None
+            if self.rng.random() < self.explore_rate:
+                return None
+
+            top_rows = rows[: self.top_k]
+            uci, _ = self.rng.choices(
+                top_rows, weights=[count for _, count in top_rows]
+            )[0]
+            self._connection.execute(
+                """
+                UPDATE moves SET last_used = ?
+                WHERE position = ? AND depth = ? AND skill_level = ? AND thinking_time = ?
+                """,
+                (time.time(), *key),
+            )
+
+        move = chess.Move.from_uci(uci)
+        if move not in chess_board.legal_moves:
+            logger.warning("Ignoring illegal cached move %s", uci)
+            return None
+        return move
+
+    def record(
+        self,
+        chess_board: chess.Board,
+        depth: int,
+        skill_level: int,
+        thinking_time: float,
+        move: chess.Move,
+    ) -> None:
+        """Counts a move the engine played for the position and search settings.
+
+        Args:
+            chess_board (chess.Board): The board the move was played on.
+            depth (int): The search depth.
+            skill_level (int): The engine's skill level.
+            thinking_time (float): The engine's thinking time in seconds.
+            move (chess.Move): The move chosen by the engine.
+        """
+        row = (
+            signed_hash(chess.polyglot.zobrist_hash(chess_board)),
+            depth,
+            skill_level,
+            thinking_time,
+            move.uci(),
+            time.time(),
+        )
+
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO moves (position, depth, skill_level, thinking_time, move, count, last_used)
+                VALUES (?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT (position, depth, skill_level, thinking_time, move)
+                DO UPDATE SET count = count + 1, last_used = excluded.last_used
+                """,
+                row,
+            )
+
+            self._inserts += 1
+            if self._inserts % EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        (entries,) = self._connection.execute("SELECT COUNT(*) FROM moves").fetchone()
+        excess = entries - self.max_entries
+        if excess <= 0:
+            return
+
+        self._connection.execute(
+            """
+            DELETE FROM moves WHERE rowid IN (
+                SELECT rowid FROM moves ORDER BY last_used LIMIT ?
+            )
+            """,
+            (excess,),
+        )
+        logger.info("Evicted %d cached moves", excess)
+
+    def close(self) -> None:
+        """Closes the cache database."""
+        with self._lock:
+            self._connection.close()
@@ -1,10 +1,17 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import NamedTuple, Optional, Tuple, List
+from typing import Callable, NamedTuple, Optional, Tuple, List
 
 import chess
 
-from src.core.board import OFFSET_SQUARE_CENTER, PhysicalBoard, PieceOffset
+from src.core.board import (
+    OFFSET_SQUARE_CENTER,
+    BoardCapture,
+    PhysicalBoard,
+    PieceOffset,
+    changed_squares,
+)
+from src.core.calibration import PlacementCalibration
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,30 @@ def off_board_square(piece_type: chess.PieceType, piece_color: chess.Color) -> i
     return OFF_BOARD_SQUARES[piece_type]
 
 
+class MoveStep(NamedTuple):
+    """A single pick and place of a piece.
+
+    Attributes:
+        from_square (int): The square the piece is picked from, negative for off-board squares.
+        to_square (int): The square the piece is placed on, negative for off-board squares.
+        origin_offset (PieceOffset): The offset of the piece on `from_square`, relative to the square's center.
+        target_offset (PieceOffset): The offset the piece is placed at on `to_square`, compensating the
+            hand's placement bias so the piece ends up centered.
+    """
+
+    from_square: int
+    to_square: int
+    origin_offset: PieceOffset
+    target_offset: PieceOffset = OFFSET_SQUARE_CENTER
+
+
+# Called with the index of a finished plan step and whether it succeeded
+ProgressCallback = Callable[[int, bool], None]
+
+# Estimated duration of moving a piece from one square to another (seconds)
+TravelTime = Callable[[int, int], float]
+
+
 class PieceMover(ABC):
     """Abstract class representing an interface for moving pieces on a physical board."""
 
@@ -60,6 +91,59 @@ class PieceMover(ABC):
         """
         pass
 
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        """Moves the hand towards a square it is expected to pick a piece up from next.
+
+        The hand waits at its own edge of the board, clear of the human's area, so the next move
+        starts with a short approach. Movers that cannot pre-position ignore it.
+
+        Args:
+            square (chess.Square): The square of the expected pick-up.
+            color (chess.Color): The color perspective of the mover (e.g., chess.WHITE or chess.BLACK).
+
+        Returns:
+            bool: True if the hand was pre-positioned or the mover ignores it, False if it failed.
+        """
+        return True
+
+    @property
+    def connected(self) -> bool:
+        """bool: Whether the mover can currently execute moves. Always True unless overridden."""
+        return True
+
+    def close(self) -> None:
+        """Closes the mover's connection. Movers without one ignore it."""
+
+    def plan(
+        self,
+        steps: List[MoveStep],
+        color: chess.Color,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """Executes a plan of piece moves in order, stopping at the first failure.
+
+        Movers able to receive the whole plan at once override this, so the hand can blend its
+        motions between steps instead of stopping for a command after every step.
+
+        Args:
+            steps (List[MoveStep]): The moves to execute in order.
+            color (chess.Color): The color perspective of the mover (e.g., chess.WHITE or chess.BLACK).
+            on_progress (Optional[ProgressCallback]): Called with the index of every finished step and
+                whether it succeeded.
+
+        Returns:
+            int: The number of steps executed successfully, all leading the failed step if any.
+        """
+        for index, step in enumerate(steps):
+            success = self.move_piece(
+                step.from_square, step.to_square, color, step.origin_offset
+            )
+            if on_progress:
+                on_progress(index, success)
+            if not success:
+                return index
+        return len(steps)
+
     @abstractmethod
     def reset(self) -> bool:
         """Resets the PieceMover's state, such as clearing off-board piece counts.
@@ -71,7 +155,12 @@ class PieceMover(ABC):
 
 
 def execute_move(
-    mover: PieceMover, board: PhysicalBoard, move: chess.Move, color: chess.Color
+    mover: PieceMover,
+    board: PhysicalBoard,
+    move: chess.Move,
+    color: chess.Color,
+    on_progress: Optional[ProgressCallback] = None,
+    calibration: Optional[PlacementCalibration] = None,
 ) -> bool:
     """
     Executes a specified chess move on a physical board, handling various types of moves
@@ -88,20 +177,201 @@ def execute_move(
         move (chess.Move): The chess move to execute, represented as a `chess.Move` object
             containing the starting and destination squares.
         color (chess.Color): The color of the piece mover moving the piece (e.g robot hand color)
+        on_progress (Optional[ProgressCallback]): Called with the index of every finished step
+            and whether it succeeded.
+        calibration (Optional[PlacementCalibration]): Placement bias compensated by the target
+            offsets of the steps. Defaults to None.
 
     Returns:
         bool: `True` if the move was successfully executed on the physical board;
               `False` if any step of the move sequence failed.
     """
-    steps = expand_moves(board.chess_board, move)
-    if not steps:
+    squares = expand_moves(board.chess_board, move)
+    if not squares:
+        return False
+
+    steps = plan_steps(board, squares, color, calibration)
+    return execute_plan(mover, board, steps, color, on_progress) == len(steps)
+
+
+def plan_steps(
+    board: PhysicalBoard,
+    squares: List[Tuple[int, int]],
+    color: chess.Color,
+    calibration: Optional[PlacementCalibration] = None,
+) -> List[MoveStep]:
+    """
+    Turns piece movements into plan steps, with the origin offsets of the pieces.
+
+    All steps are planned ahead, so a piece placed by an earlier step is expected in the center
+    of its square.
+
+    Args:
+        board (PhysicalBoard): The physical board before the first movement.
+        squares (List[Tuple[int, int]]): The piece movements (from-square to to-square) in order.
+        color (chess.Color): The color perspective of the `PieceMover` instance.
+        calibration (Optional[PlacementCalibration]): Placement bias compensated by the target
+            offsets. Defaults to None, placing at the center.
+
+    Returns:
+        List[MoveStep]: The steps of the plan.
+    """
+    steps = []
+    placed = set()
+    for from_square, to_square in squares:
+        if from_square in chess.SQUARES and from_square not in placed:
+            origin_offset = board.get_piece_offset(from_square, color)
+        else:
+            origin_offset = OFFSET_SQUARE_CENTER
+        if calibration:
+            target_offset = calibration.target_offset(to_square, color)
+        else:
+            target_offset = OFFSET_SQUARE_CENTER
+        steps.append(MoveStep(from_square, to_square, origin_offset, target_offset))
+        placed.add(to_square)
+    return steps
+
+
+def execute_plan(
+    mover: PieceMover,
+    board: PhysicalBoard,
+    steps: List[MoveStep],
+    color: chess.Color,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Sends a plan to the piece mover, updating square offsets as the steps finish.
+
+    Args:
+        mover (PieceMover): The `PieceMover` instance executing the plan.
+        board (PhysicalBoard): The physical board the plan is executed on.
+        steps (List[MoveStep]): The steps of the plan.
+        color (chess.Color): The color perspective of the `PieceMover` instance.
+        on_progress (Optional[ProgressCallback]): Called with the index of every finished step
+            and whether it succeeded.
+
+    Returns:
+        int: The number of steps executed successfully.
+    """
+
+    def step_done(index: int, success: bool) -> None:
+        step = steps[index]
+        move_str = piece_move_str(step.from_square, step.to_square)
+        if success:
+            _center_offsets(board, step.from_square, step.to_square, color)
+            logger.info(f"Moved piece {move_str}")
+        else:
+            logger.error(f"Failed moving piece {move_str}!")
+
+        if on_progress:
+            on_progress(index, success)
+
+    return mover.plan(steps, color, step_done)
+
+
+def execute_move_verified(
+    mover: PieceMover,
+    board: PhysicalBoard,
+    move: chess.Move,
+    color: chess.Color,
+    board_capture: BoardCapture,
+    max_retries: int = 2,
+    on_progress: Optional[ProgressCallback] = None,
+    calibration: Optional[PlacementCalibration] = None,
+) -> bool:
+    """
+    Executes a chess move like `execute_move`, recovering from failed steps without a full capture.
+
+    After a failed step only the squares of that step are captured. If the piece is still on its
+    from-square, the grasp is retried with the piece's captured offset; if it arrived on its
+    to-square despite the failure, the step counts as done. The remaining steps of the move are
+    then sent as a new plan, so the move is not recalculated.
+
+    Args:
+        mover (PieceMover): The `PieceMover` instance executing the move.
+        board (PhysicalBoard): The current physical board, before the move is saved on it.
+        move (chess.Move): The chess move to execute.
+        color (chess.Color): The color of the piece mover moving the piece (e.g robot hand color)
+        board_capture (BoardCapture): Captures the squares of failed steps.
+        max_retries (int): Maximum number of failed steps recovered from. Defaults to 2.
+        on_progress (Optional[ProgressCallback]): Called with the index of every finished step
+            and whether it succeeded, retried steps may be reported more than once.
+        calibration (Optional[PlacementCalibration]): Placement bias compensated by the target
+            offsets of the steps. Defaults to None.
+
+    Returns:
+        bool: `True` if the move was executed on the physical board; `False` if a step failed
+              and could not be recovered.
+    """
+    squares = expand_moves(board.chess_board, move)
+    if not squares:
         return False
 
-    for from_square, to_square in steps:
-        if not move_piece(mover, board, from_square, to_square, color):
+    steps = plan_steps(board, squares, color, calibration)
+    done = 0
+    retries = 0
+    while True:
+        start = done
+
+        def step_progress(index: int, success: bool) -> None:
+            if on_progress:
+                on_progress(start + index, success)
+
+        done += execute_plan(mover, board, steps[done:], color, step_progress)
+        if done == len(steps):
+            return True
+        if retries >= max_retries:
             return False
 
-    return True
+        retries += 1
+        recovered, retry_step = _recover_step(board_capture, steps[done], color)
+        if not recovered:
+            return False
+
+        move_str = piece_move_str(steps[done].from_square, steps[done].to_square)
+        if retry_step is None:
+            logger.info(f"Moved piece {move_str} despite the reported failure")
+            _center_offsets(board, steps[done].from_square, steps[done].to_square, color)
+            done += 1
+        else:
+            logger.info(f"Retrying piece move {move_str}")
+            steps[done] = retry_step
+
+
+def _recover_step(
+    board_capture: BoardCapture, step: MoveStep, color: chess.Color
+) -> Tuple[bool, Optional[MoveStep]]:
+    """Captures the squares of a failed step and returns whether it can be recovered, and the step to retry if any."""
+    squares = chess.BB_EMPTY
+    for square in (step.from_square, step.to_square):
+        if square in chess.SQUARES:
+            squares |= chess.BB_SQUARES[square]
+
+    captured_board = board_capture.capture_squares(squares, not color)
+    if captured_board is None:
+        return False, None
+
+    def occupied(square: int) -> bool:
+        return (
+            square in chess.SQUARES
+            and captured_board.chess_board.piece_at(square) is not None
+        )
+
+    # Retry the grasp where the piece stands now
+    if occupied(step.from_square):
+        origin_offset = captured_board.get_piece_offset(step.from_square, color)
+        return True, step._replace(origin_offset=origin_offset)
+
+    # Plans never place pieces on occupied squares, so the piece arrived
+    if occupied(step.to_square):
+        return True, None
+
+    # Pieces kept off the board cannot be captured, the grasp is retried as it was
+    if step.from_square not in chess.SQUARES and step.to_square in chess.SQUARES:
+        return True, step
+
+    logger.error(f"Lost piece moving {piece_move_str(step.from_square, step.to_square)}!")
+    return False, None
 
 
 def expand_moves(
@@ -212,29 +482,38 @@ def move_piece(
         logger.error(f"Failed moving piece {move_str}!")
         return False
 
-    # Update board offsets
+    _center_offsets(board, from_square, to_square, color)
+    logger.info(f"Moved piece {move_str}")
+    return True
+
+
+def _center_offsets(
+    board: PhysicalBoard, from_square: int, to_square: int, color: chess.Color
+) -> None:
+    """Updates board offsets after a piece was moved to the center of `to_square`."""
     if from_square in chess.SQUARES:
         board.set_piece_offset(from_square, color, OFFSET_SQUARE_CENTER)
 
     if to_square in chess.SQUARES:
         board.set_piece_offset(to_square, color, OFFSET_SQUARE_CENTER)
 
-    logger.info(f"Moved piece {move_str}")
-    return True
-
 
 def iter_reset_board(
     mover: PieceMover,
     board: PhysicalBoard,
     expected_board: PhysicalBoard,
     color: chess.Color,
+    on_progress: Optional[ProgressCallback] = None,
+    travel_time: Optional[TravelTime] = None,
+    calibration: Optional[PlacementCalibration] = None,
 ) -> Tuple[bool, bool]:
     """
     Iteratively rearranges pieces on the physical board to align with the expected board state.
 
-    This function compares the current board state with an expected target state and makes
-    adjustments as necessary, moving pieces directly to their target positions if possible,
-    or using empty squares as temporary positions when needed.
+    This function compares the current board state with an expected target state and plans
+    the adjustments, moving pieces directly to their target positions if possible, or using
+    empty squares as temporary positions when needed. The planned steps are sent to the mover
+    as one plan; the caller should capture the board again to verify the result.
 
     Args:
         mover (PieceMover): The `PieceMover` instance responsible for executing physical moves.
@@ -243,70 +522,128 @@ def iter_reset_board(
         expected_board (PhysicalBoard): The desired target state for the board, with pieces
             in their intended positions.
         color (chess.Color): The color perspective of the `PieceMover` instance.
+        on_progress (Optional[ProgressCallback]): Called with the index of every finished step
+            and whether it succeeded.
+        travel_time (Optional[TravelTime]): Estimates piece move durations for squares from
+            `color`'s perspective, used to prefer quick moves. Defaults to None.
+        calibration (Optional[PlacementCalibration]): Placement bias compensated by the target
+            offsets of the steps. Defaults to None.
 
     Returns:
         Tuple[bool, bool]: A tuple containing two values: First `True` if any piece was moved, second `True` if physical board matches expected board
     """
-    # Create mappings for current and expected piece positions
-    current_positions = {
-        square: piece
-        for square in chess.SQUARES
-        if (piece := board.chess_board.piece_at(square))
-    }
+    squares = plan_reset_board(
+        board.chess_board, expected_board.chess_board, travel_time
+    )
+    if not squares:
+        return False, True
 
-    expected_positions = {
-        square: piece
-        for square in chess.SQUARES
-        if (piece := expected_board.chess_board.piece_at(square))
-    }
+    steps = plan_steps(board, squares, color, calibration)
+    return execute_plan(mover, board, steps, color, on_progress) > 0, False
 
-    # Find pieces that are correctly placed, to avoid unnecessary moves
-    correctly_placed = {
-        square: piece
-        for square, piece in expected_positions.items()
-        if (current_piece := current_positions.get(square)) == piece
-    }
 
-    # Remove correctly placed pieces from current and expected mappings
-    for square in list(correctly_placed.keys()):
-        current_positions.pop(square, None)
-        expected_positions.pop(square, None)
+def plan_reset_board(
+    current_chess_board: chess.Board,
+    expected_chess_board: chess.Board,
+    travel_time: Optional[TravelTime] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Plans the piece movements rearranging the current board towards the expected board.
+
+    Movements are planned on a copy of the board for as long as the outcome of the plan is
+    certain: planning stops before a movement picks up a piece placed by the plan, whose
+    placement is only known after the board was captured again. Pieces are only ever moved onto
+    empty squares.
 
-    # Use list to track empty squares on the board
-    empty_squares = [
-        square
-        for square in chess.SQUARES
-        if square not in current_positions and square not in expected_positions
-    ]
+    Args:
+        current_chess_board (chess.Board): The current state of the physical board.
+        expected_chess_board (chess.Board): The desired state of the physical board.
+        travel_time (Optional[TravelTime]): Estimates piece move durations. When several pieces
+            or empty squares would do, the quickest move is planned. Defaults to None.
+
+    Returns:
+        List[Tuple[int, int]]: The piece movements (from-square to to-square), empty if the boards match.
+    """
+    chess_board = current_chess_board.copy(stack=False)
+    squares: List[Tuple[int, int]] = []
+    placed = set()
+
+    while (
+        step := _next_reset_step(chess_board, expected_chess_board, travel_time)
+    ) is not None:
+        from_square, to_square = step
+        if from_square in placed:
+            break
+
+        squares.append(step)
+        placed.add(to_square)
+
+        if from_square in chess.SQUARES:
+            piece = chess_board.remove_piece_at(from_square)
+        else:
+            piece = expected_chess_board.piece_at(to_square)
+        chess_board.set_piece_at(to_square, piece)
 
-    # First pass: move pieces directly to their target positions if possible
-    for square, piece in list(expected_positions.items()):
-        if piece in current_positions.values():
-            for start_square, current_piece in list(current_positions.items()):
-                if current_piece == piece:
-                    return move_piece(mover, board, start_square, square, color), False
+    return squares
 
-    # Second pass: move remaining pieces out of the way, using empty squares as intermediate holding spots
-    for start_square, piece in list(current_positions.items()):
-        if piece not in expected_positions.values():
-            if empty_squares:
-                temp_square = empty_squares.pop(0)
-                return move_piece(mover, board, start_square, temp_square, color), False
 
-    # Third pass: place pieces in their final positions from temporary spots or off-board
-    for square, piece in list(expected_positions.items()):
-        origin_square = None
-        for temp_square, current_piece in list(current_positions.items()):
-            if current_piece == piece:
-                origin_square = temp_square
-                break
+def _next_reset_step(
+    current_chess_board: chess.Board,
+    expected_chess_board: chess.Board,
+    travel_time: Optional[TravelTime] = None,
+) -> Optional[Tuple[int, int]]:
+    """Returns the next piece movement towards the expected board, None if there is nothing to do."""
+    # Only squares that differ need work, correctly placed pieces are left untouched
+    changed = changed_squares(current_chess_board, expected_chess_board)
+    if not changed:
+        return None
 
-        if origin_square is None:
-            origin_square = off_board_square(piece.piece_type, piece.color)
+    # Squares waiting for a piece, and pieces standing where they do not belong
+    target_positions = {
+        square: piece
+        for square in chess.scan_forward(
+            changed & expected_chess_board.occupied & ~current_chess_board.occupied
+        )
+        if (piece := expected_chess_board.piece_at(square))
+    }
 
-        return move_piece(mover, board, origin_square, square, color), False
+    misplaced_positions = {
+        square: piece
+        for square in chess.scan_forward(changed & current_chess_board.occupied)
+        if (piece := current_chess_board.piece_at(square))
+    }
 
-    return False, True
+    # First pass: move misplaced pieces directly to their empty target squares
+    for square, piece in target_positions.items():
+        start_squares = [
+            start_square
+            for start_square, current_piece in misplaced_positions.items()
+            if current_piece == piece
+        ]
+        if start_squares:
+            if travel_time:
+                start_squares.sort(key=lambda start: travel_time(start, square))
+            return start_squares[0], square
+
+    # Second pass: place pieces missing from the board from off-board
+    for square, piece in target_positions.items():
+        return off_board_square(piece.piece_type, piece.color), square
+
+    # Third pass: move misplaced pieces out of the way, pieces are never placed on occupied squares
+    empty_squares = chess.BB_ALL & ~(
+        current_chess_board.occupied | expected_chess_board.occupied
+    )
+    for start_square in misplaced_positions:
+        if not empty_squares:
+            break
+        if travel_time:
+            return start_square, min(
+                chess.scan_forward(empty_squares),
+                key=lambda square: travel_time(start_square, square),
+            )
+        return start_square, chess.lsb(empty_squares)
+
+    return None
 
 
 class SquarePiece(NamedTuple):
@@ -330,7 +667,7 @@ def identify_move(
     disappeared: list[SquarePiece] = []
     appeared: list[SquarePiece] = []
 
-    for square in chess.SQUARES:
+    for square in chess.scan_forward(changed_squares(previous_board, current_board)):
         previous_piece = previous_board.piece_at(square)
         current_piece = current_board.piece_at(square)
 
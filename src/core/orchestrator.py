@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import chess
+
+from src.core.game import Game, Player
+
+logger = logging.getLogger(__name__)
+
+
+class TableOrchestrator:
+    """Plays several independent games, one per robot table, on a shared scheduler.
+
+    Every table has its own `Game` with its own board capture and piece mover, while engines
+    and detection models are shared between the games by the caller, e.g. through an
+    `EnginePool`. The scheduler runs one turn step of every table at a time on a shared thread
+    pool: a robot move, or a capture checking for the human's move. Tables whose last step
+    detected no legal move are polled again after `poll_interval`. A finished game is handled
+    by a step on the same pool too, so resetting it never blocks the scheduler.
+
+    Attributes:
+        games (List[Game]): The games played, one per table.
+        poll_interval (float): Delay before polling a table again when nothing happened (seconds).
+        results (List[str]): Result of every table's last game, "*" while it is in progress.
+    """
+
+    def __init__(
+        self,
+        games: Sequence[Game],
+        max_workers: Optional[int] = None,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """Initializes the orchestrator with the games of all tables.
+
+        Args:
+            games (Sequence[Game]): The games to play, one per table.
+            max_workers (Optional[int]): Number of turn steps run concurrently. Defaults to one per table.
+            poll_interval (float): Delay before polling a table again when nothing happened, in seconds.
+                Defaults to 0.1.
+        """
+        self.games = list(games)
+        self.poll_interval = poll_interval
+        self.results = ["*"] * len(self.games)
+
+        self._max_workers = max_workers or max(1, len(self.games))
+        self._stop_event = threading.Event()
+
+    def step(self, table: int) -> Tuple[Optional[chess.Move], bool]:
+        """Plays one turn step at a table.
+
+        Args:
+            table (int): Index of the table.
+
+        Returns:
+            Tuple[Optional[chess.Move], bool]: The detected or executed move and whether it was legal.
+        """
+        game = self.games[table]
+        if game.current_player == Player.ROBOT:
+            move = game.robot_makes_move()
+            return move, move is not None
+        return game.human_made_move()
+
+    def finish_game(
+        self, table: int, on_game_over: Optional[Callable[[int, str], bool]] = None
+    ) -> bool:
+        """Records the end of a table's game and decides whether the table keeps playing.
+
+        Args:
+            table (int): Index of the table.
+            on_game_over (Optional[Callable[[int, str], bool]]): Called with the table index and the
+                result, returns True if the table keeps playing.
+
+        Returns:
+            bool: True if the table keeps playing.
+        """
+        self.games[table].record_resignation()
+        return bool(on_game_over and on_game_over(table, self.results[table]))
+
+    def stop(self) -> None:
+        """Stops scheduling new turn steps. Steps in progress are finished.
+
+        Safe to call from any thread, including the callbacks of `run`.
+        """
+        self._stop_event.set()
+
+    def run(
+        self,
+        on_move: Optional[Callable[[int, chess.Move, bool], None]] = None,
+        on_game_over: Optional[Callable[[int, str], bool]] = None,
+    ) -> List[str]:
+        """Plays all tables until their games are over or `stop` is called.
+
+        Args:
+            on_move (Optional[Callable[[int, chess.Move, bool], None]]): Called with the table index,
+                every detected move and whether it was legal.
+            on_game_over (Optional[Callable[[int, str], bool]]): Called with the table index and the
+                result from the human's perspective, see `Game.result`. It runs on the table's worker
+                thread, like its turn steps. The table keeps playing if it returns True, e.g. after
+                resetting the game for a rematch.
+
+        Returns:
+            List[str]: The result of every table's last game.
+        """
+        self._stop_event.clear()
+        next_step = [0.0] * len(self.games)
+        finished = [False] * len(self.games)
+        running: Dict[Future, int] = {}
+        game_over: Set[Future] = set()
+
+        with ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="table"
+        ) as executor:
+            while not self._stop_event.is_set() or running:
+                now = time.monotonic()
+                busy = set(running.values())
+
+                for table, game in enumerate(self.games):
+                    if (
+                        self._stop_event.is_set()
+                        or finished[table]
+                        or table in busy
+                        or next_step[table] > now
+                    ):
+                        continue
+
+                    self.results[table] = game.result()
+                    if self.results[table] != "*":
+                        logger.info(
+                            "Table %d finished with %s", table, self.results[table]
+                        )
+                        future = executor.submit(self.finish_game, table, on_game_over)
+                        running[future] = table
+                        game_over.add(future)
+                        continue
+
+                    running[executor.submit(self.step, table)] = table
+
+                if not running:
+                    if all(finished):
+                        break
+                    pending = [
+                        next_step[table]
+                        for table in range(len(self.games))
+                        if not finished[table]
+                    ]
+                    self._stop_event.wait(max(0.0, min(pending) - time.monotonic()))
+                    continue
+
+                done, _ = wait(
+                    running, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    table = running.pop(future)
+                    if future in game_over:
+                        game_over.discard(future)
+                        try:
+                            finished[table] = not future.result()
+                        except Exception:
+                            logger.exception("Game over failed at table %d!", table)
+                            finished[table] = True
+                        continue
+
+                    try:
+                        move, legal = future.result()
+                    except Exception:
+                        logger.exception("Turn step failed at table %d!", table)
+                        move, legal = None, False
+
+                    if move and on_move:
+                        on_move(table, move, legal)
+                    if not legal:
+                        next_step[table] = time.monotonic() + self.poll_interval
+
+        return self.results
@@ -0,0 +1,181 @@
+import logging
+import threading
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+import chess
+import chess.engine
+import chess.polyglot
+
+logger = logging.getLogger(__name__)
+
+
+class Ponderer:
+    """Searches the robot's replies to the human's likely moves while the human is thinking.
+
+    A background thread first finds the human's most likely moves with a multi-PV analysis
+    (unless candidates are given), then searches the robot's reply to each of them with the
+    game's search limit. Replies are cached by the Zobrist hash of the position after the
+    human's move, so the robot can answer immediately when the human plays a predicted move.
+    The engine is acquired for each search only, so a pooled engine is shared between searches.
+
+    Attributes:
+        acquire_engine (Callable[[], ContextManager[chess.engine.SimpleEngine]]): Acquires the
+            chess engine for the duration of one search.
+        reply_count (int): Number of likely human moves to ponder on.
+        replies (Dict[int, chess.Move]): Cached robot replies by Zobrist hash of the position.
+        predictions (List[Tuple[chess.Move, chess.Move]]): Pondered human moves and the robot's
+            replies, most likely human move first.
+    """
+
+    def __init__(
+        self,
+        acquire_engine: Callable[[], ContextManager[chess.engine.SimpleEngine]],
+        reply_count: int = 3,
+    ) -> None:
+        """Initializes the Ponderer with an engine source and the number of human moves to ponder on.
+
+        Args:
+            acquire_engine (Callable[[], ContextManager[chess.engine.SimpleEngine]]): Acquires the
+                chess engine for the duration of one search, raising TimeoutError if none is available.
+            reply_count (int): Number of likely human moves to ponder on. Defaults to 3.
+        """
+        self.acquire_engine = acquire_engine
+        self.reply_count = reply_count
+        self.replies: Dict[int, chess.Move] = {}
+        self.predictions: List[Tuple[chess.Move, chess.Move]] = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._analysis: Optional[chess.engine.SimpleAnalysisResult] = None
+
+    def start(
+        self,
+        chess_board: chess.Board,
+        limit: chess.engine.Limit,
+        candidates: Optional[List[chess.Move]] = None,
+    ) -> None:
+        """Starts pondering on a position where the human is to move.
+
+        Any pondering in progress is stopped and previously cached replies are discarded.
+
+        Args:
+            chess_board (chess.Board): The current board with the human to move.
+            limit (chess.engine.Limit): The search limit used for the robot's replies.
+            candidates (Optional[List[chess.Move]]): Likely human moves, most likely first.
+                If empty, they are found with a multi-PV analysis.
+        """
+        self.stop()
+        self.replies.clear()
+        self.predictions = []
+
+        if chess_board.is_game_over():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._ponder,
+            args=(chess_board.copy(), limit, list(candidates or [])),
+            name="ponder",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops pondering and waits for the background search to finish."""
+        self._stop_event.set()
+        with self._lock:
+            if self._analysis is not None:
+                self._analysis.stop()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def lookup(self, chess_board: chess.Board) -> Optional[chess.Move]:
+        """Returns the pondered reply for a position, if any.
+
+        Args:
+            chess_board (chess.Board): The current board with the robot to move.
+
+        Returns:
+            Optional[chess.Move]: The cached legal reply, or None on a cache miss.
+        """
+        move = self.replies.get(chess.polyglot.zobrist_hash(chess_board))
+        if move is None or move not in chess_board.legal_moves:
+            return None
+        return move
+
+    def likely_reply(self) -> Optional[Tuple[chess.Move, chess.Move]]:
+        """Returns the robot's reply to the most likely human move pondered so far.
+
+        Returns:
+            Optional[Tuple[chess.Move, chess.Move]]: The human move and the robot's reply, or None if
+                no reply was pondered yet.
+        """
+        predictions = self.predictions
+        return predictions[0] if predictions else None
+
+    def _search(
+        self,
+        chess_board: chess.Board,
+        limit: chess.engine.Limit,
+        multipv: Optional[int] = None,
+    ) -> Optional[Tuple[chess.Move, List[chess.engine.InfoDict]]]:
+        """Runs a stoppable analysis, returning the best move and principal variations or None if stopped."""
+        if self._stop_event.is_set():
+            return None
+
+        with self.acquire_engine() as engine:
+            with self._lock:
+                if self._stop_event.is_set():
+                    return None
+                self._analysis = engine.analysis(chess_board, limit, multipv=multipv)
+
+            try:
+                best = self._analysis.wait()
+                infos = self._analysis.multipv
+            finally:
+                with self._lock:
+                    self._analysis = None
+
+        if self._stop_event.is_set() or best.move is None:
+            return None
+
+        return best.move, infos
+
+    def _ponder(
+        self,
+        chess_board: chess.Board,
+        limit: chess.engine.Limit,
+        candidates: List[chess.Move],
+    ) -> None:
+        try:
+            if not candidates:
+                result = self._search(chess_board, limit, multipv=self.reply_count)
+                if result is None:
+                    return
+                _, infos = result
+                candidates = [info["pv"][0] for info in infos if info.get("pv")]
+
+            for human_move in candidates[: self.reply_count]:
+                if human_move not in chess_board.legal_moves:
+                    continue
+
+                chess_board.push(human_move)
+                result = self._search(chess_board, limit)
+                key = chess.polyglot.zobrist_hash(chess_board)
+                chess_board.pop()
+
+                if result is None:
+                    return
+
+                # The best move is the one the engine plays, weakened by its skill level
+                reply, _ = result
+                self.replies[key] = reply
+                self.predictions.append((human_move, reply))
+                logger.info("Pondered reply %s to %s", reply.uci(), human_move.uci())
+        except TimeoutError:
+            logger.info("No chess engine available, not pondering")
+        except chess.engine.EngineError:
+            logger.exception("Pondering failed!")
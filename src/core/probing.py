@@ -0,0 +1,141 @@
+import logging
+import random
+from typing import List, Optional
+
+import chess
+import chess.polyglot
+import chess.syzygy
+
+logger = logging.getLogger(__name__)
+
+MAX_SKILL_LEVEL = 20
+
+
+class OpeningBook:
+    """Chooses robot moves from a Polyglot opening book.
+
+    Book moves are sampled by their weights. The weights are flattened at low skill levels,
+    so weaker settings also play the less popular book moves, while the highest skill level
+    always plays the most popular one.
+
+    Attributes:
+        path (str): Path to the Polyglot `.bin` book.
+        max_ply (Optional[int]): Last ply of the game to consult the book at, None for no limit.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_ply: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Opens a Polyglot opening book.
+
+        Args:
+            path (str): Path to the Polyglot `.bin` book.
+            max_ply (Optional[int]): Last ply of the game to consult the book at. Defaults to no limit.
+            rng (Optional[random.Random]): Random number generator used for sampling.
+
+        Raises:
+            FileNotFoundError: If the book does not exist.
+        """
+        self.path = path
+        self.max_ply = max_ply
+        self.reader = chess.polyglot.open_reader(path)
+        self.rng = rng if rng is not None else random.Random()
+
+    def choose(self, chess_board: chess.Board, skill_level: int) -> Optional[chess.Move]:
+        """Samples a book move for the position.
+
+        Args:
+            chess_board (chess.Board): The current board.
+            skill_level (int): The engine's skill level, from 0 to 20.
+
+        Returns:
+            Optional[chess.Move]: A book move, or None if the position is not in the book.
+        """
+        if self.max_ply is not None and chess_board.ply() > self.max_ply:
+            return None
+
+        entries: List[chess.polyglot.Entry] = [
+            entry for entry in self.reader.find_all(chess_board) if entry.weight > 0
+        ]
+        if not entries:
+            return None
+
+        if skill_level >= MAX_SKILL_LEVEL:
+            return max(entries, key=lambda entry: entry.weight).move
+
+        exponent = skill_level / MAX_SKILL_LEVEL
+        weights = [entry.weight**exponent for entry in entries]
+        return self.rng.choices(entries, weights=weights)[0].move
+
+    def close(self) -> None:
+        """Closes the opening book file."""
+        self.reader.close()
+
+
+class Tablebase:
+    """Chooses robot moves from Syzygy endgame tablebases.
+
+    Only used from `min_skill_level` on, as tablebase moves are perfect play.
+
+    Attributes:
+        directory (str): Directory with the Syzygy `.rtbw` and `.rtbz` files.
+        min_skill_level (int): Lowest skill level to consult the tablebases at.
+    """
+
+    def __init__(self, directory: str, min_skill_level: int = MAX_SKILL_LEVEL) -> None:
+        """Opens Syzygy tablebases from a directory.
+
+        Args:
+            directory (str): Directory with the Syzygy `.rtbw` and `.rtbz` files.
+            min_skill_level (int): Lowest skill level to consult the tablebases at. Defaults to 20.
+        """
+        self.directory = directory
+        self.min_skill_level = min_skill_level
+        self.tablebase = chess.syzygy.open_tablebase(directory)
+
+    def choose(self, chess_board: chess.Board, skill_level: int) -> Optional[chess.Move]:
+        """Picks the best tablebase move for the position.
+
+        Winning moves are preferred by the shortest distance to zeroing, losing moves by the
+        longest, so the robot converts wins and resists losses.
+
+        Args:
+            chess_board (chess.Board): The current board.
+            skill_level (int): The engine's skill level, from 0 to 20.
+
+        Returns:
+            Optional[chess.Move]: The best move, or None if the position is not in the tablebases.
+        """
+        if skill_level < self.min_skill_level:
+            return None
+
+        board = chess_board.copy(stack=False)
+        best_move = None
+        best_key = None
+
+        try:
+            for move in list(board.legal_moves):
+                board.push(move)
+                try:
+                    if board.is_checkmate():
+                        return move
+                    wdl = -self.tablebase.probe_wdl(board)
+                    dtz = abs(self.tablebase.probe_dtz(board))
+                finally:
+                    board.pop()
+
+                key = (wdl, -dtz if wdl > 0 else dtz)
+                if best_key is None or key > best_key:
+                    best_move, best_key = move, key
+        except KeyError:
+            # Missing table, too many pieces or castling rights
+            return None
+
+        return best_move
+
+    def close(self) -> None:
+        """Closes the tablebase files."""
+        self.tablebase.close()
@@ -0,0 +1,303 @@
+import logging
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import chess
+
+from src.core.board import changed_squares, format_squares
+from src.core.moves import castle_rook_move, en_passant_captured, identify_move
+
+logger = logging.getLogger(__name__)
+
+# A single move changes at most four squares (castling)
+MAX_SQUARES_PER_MOVE = 4
+
+
+class MoveState(Enum):
+    IDLE = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+    INVALID = 3
+
+
+class Recognition(NamedTuple):
+    """Outcome of recognizing a physical move from a captured board.
+
+    Attributes:
+        state (MoveState): `IDLE` if nothing changed, `IN_PROGRESS` if the board is an
+            intermediate state of a legal move, `COMPLETED` if a legal move was made and
+            `INVALID` if no legal move can explain the board.
+        move (Optional[chess.Move]): The identified move for `COMPLETED` and `INVALID` states, if any.
+        watch_squares (chess.Bitboard): Squares involved in the moves still possible
+            from the current state, `chess.BB_EMPTY` when no move is in progress.
+    """
+
+    state: MoveState
+    move: Optional[chess.Move]
+    watch_squares: chess.Bitboard
+
+
+def expected_squares(
+    chess_board: chess.Board, move: chess.Move
+) -> Dict[chess.Square, Optional[chess.Piece]]:
+    """
+    Lists the contents of every square a move touches once it is completed.
+
+    Note:
+        This function must be called before the move is saved on the `chess.Board`, as it
+        relies on the board's current state.
+
+    Args:
+        chess_board (chess.Board): The board state before the move.
+        move (chess.Move): The move to expand.
+
+    Returns:
+        Dict[chess.Square, Optional[chess.Piece]]: The piece on each touched square after the move,
+            `None` for squares that end up empty.
+    """
+    piece = chess_board.piece_at(move.from_square)
+    if piece and move.promotion:
+        piece = chess.Piece(move.promotion, piece.color)
+
+    squares: Dict[chess.Square, Optional[chess.Piece]] = {move.from_square: None}
+
+    if chess_board.is_castling(move):
+        rook_move = castle_rook_move(move)
+        if rook_move:
+            squares[rook_move.from_square] = None
+            squares[rook_move.to_square] = chess_board.piece_at(rook_move.from_square)
+    elif chess_board.is_en_passant(move):
+        squares[en_passant_captured(move)] = None
+
+    squares[move.to_square] = piece
+    return squares
+
+
+def recognize_move(
+    previous_board: chess.Board, current_board: chess.Board
+) -> Recognition:
+    """
+    Classifies a captured board against the last legal position.
+
+    A board is considered an intermediate state of a legal move when every changed
+    square is touched by that move and is either empty or already holds its final piece,
+    e.g. a lifted piece, a captured piece removed first or a king moved before its rook.
+
+    Args:
+        previous_board (chess.Board): The last legal board state.
+        current_board (chess.Board): The captured board state.
+
+    Returns:
+        Recognition: The recognized state, move and squares to watch.
+    """
+    changed = changed_squares(previous_board, current_board)
+    if not changed:
+        return Recognition(MoveState.IDLE, None, chess.BB_EMPTY)
+
+    move, legal = identify_move(previous_board, current_board)
+    if move and legal:
+        return Recognition(MoveState.COMPLETED, move, chess.BB_EMPTY)
+
+    watch_squares = chess.BB_EMPTY
+    for legal_move in previous_board.legal_moves:
+        squares = expected_squares(previous_board, legal_move)
+
+        touched = chess.BB_EMPTY
+        for square in squares:
+            touched |= chess.BB_SQUARES[square]
+
+        if changed & ~touched:
+            continue
+
+        pending = changed
+
+        # A promoting pawn may be put down before it is swapped for the new piece
+        if legal_move.promotion:
+            pawn = previous_board.piece_at(legal_move.from_square)
+            if current_board.piece_at(legal_move.to_square) == pawn:
+                pending &= ~chess.BB_SQUARES[legal_move.to_square]
+
+        if all(
+            current_board.piece_at(square) in (None, squares[square])
+            for square in chess.scan_forward(pending)
+        ):
+            watch_squares |= touched
+
+    if watch_squares:
+        return Recognition(MoveState.IN_PROGRESS, None, watch_squares)
+
+    return Recognition(MoveState.INVALID, move, chess.BB_EMPTY)
+
+
+class MoveTracker:
+    """Tracks a physical move across consecutive board captures.
+
+    Intermediate states of a legal move are reported as in progress instead of illegal
+    moves. An invalid board seen right after an in-progress state is only reported once it
+    was captured `invalid_confirmations` times in a row, as it is often a hand covering
+    the pieces mid-move.
+
+    Attributes:
+        invalid_confirmations (int): Consecutive captures needed to report an invalid board
+            that follows an in-progress state.
+        state (MoveState): The most recently reported state.
+        watch_squares (chess.Bitboard): Squares involved in the move in progress.
+    """
+
+    def __init__(self, invalid_confirmations: int = 2) -> None:
+        """Initializes the tracker in the idle state.
+
+        Args:
+            invalid_confirmations (int): Consecutive captures needed to report an invalid board
+                that follows an in-progress state. Defaults to 2.
+        """
+        self.invalid_confirmations = invalid_confirmations
+        self.state = MoveState.IDLE
+        self.watch_squares = chess.BB_EMPTY
+        self._invalid_count = 0
+
+    def reset(self) -> None:
+        """Forgets any move in progress, e.g. after a move was pushed or the game reset."""
+        self.state = MoveState.IDLE
+        self.watch_squares = chess.BB_EMPTY
+        self._invalid_count = 0
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether the human is in the middle of a move."""
+        return self.state == MoveState.IN_PROGRESS
+
+    def update(
+        self, previous_board: chess.Board, current_board: chess.Board
+    ) -> Recognition:
+        """Advances the tracker with a newly captured board.
+
+        Args:
+            previous_board (chess.Board): The last legal board state.
+            current_board (chess.Board): The captured board state.
+
+        Returns:
+            Recognition: The state to act on. Only `COMPLETED` carries a legal move.
+        """
+        recognition = recognize_move(previous_board, current_board)
+
+        if (
+            recognition.state == MoveState.INVALID
+            and self.state == MoveState.IN_PROGRESS
+        ):
+            self._invalid_count += 1
+            if self._invalid_count < self.invalid_confirmations:
+                logger.info("Unexpected board during move in progress; waiting")
+                return Recognition(MoveState.IN_PROGRESS, None, self.watch_squares)
+
+        self._invalid_count = 0
+
+        if (
+            recognition.state == MoveState.IN_PROGRESS
+            and recognition.watch_squares != self.watch_squares
+        ):
+            logger.info(
+                "Move in progress, watching squares %s",
+                format_squares(recognition.watch_squares),
+            )
+
+        self.state = recognition.state
+        self.watch_squares = recognition.watch_squares
+        return recognition
+
+
+def placement_key(chess_board: chess.Board) -> Tuple[int, ...]:
+    """Builds a hashable key of the piece placement, side to move, castling and en passant rights.
+
+    Args:
+        chess_board (chess.Board): The board to build the key for.
+
+    Returns:
+        Tuple[int, ...]: Piece type and color bitboards together with the side to move, the
+            castling rights and the en passant square (-1 if none).
+    """
+    return (
+        chess_board.pawns,
+        chess_board.knights,
+        chess_board.bishops,
+        chess_board.rooks,
+        chess_board.queens,
+        chess_board.kings,
+        chess_board.occupied_co[chess.WHITE],
+        chess_board.occupied_co[chess.BLACK],
+        chess_board.turn,
+        chess_board.castling_rights,
+        -1 if chess_board.ep_square is None else chess_board.ep_square,
+    )
+
+
+def find_move_sequence(
+    previous_board: chess.Board, current_board: chess.BaseBoard, max_depth: int = 2
+) -> Optional[List[chess.Move]]:
+    """
+    Searches for the shortest sequence of legal moves that leads to the captured piece placement.
+
+    Used to recover when several moves were made between two successful captures. The search
+    deepens iteratively up to `max_depth` plies, prunes positions that can no longer reach the
+    target (pieces are never added back and each move changes at most four squares) and keeps a
+    transposition table of positions that were already searched without success.
+
+    Args:
+        previous_board (chess.Board): The last known legal board state.
+        current_board (chess.BaseBoard): The captured board state.
+        max_depth (int): Maximum number of plies to search. Defaults to 2.
+
+    Returns:
+        Optional[List[chess.Move]]: The moves leading to the captured placement, an empty list if
+            the placement did not change, or None if no sequence of at most `max_depth` moves exists.
+    """
+    target_counts = [
+        chess.popcount(current_board.occupied_co[color]) for color in chess.COLORS
+    ]
+    target_pawns = [
+        chess.popcount(current_board.pawns & current_board.occupied_co[color])
+        for color in chess.COLORS
+    ]
+
+    # Maps placement key to the deepest search that failed from that position
+    failed: Dict[Tuple[int, ...], int] = {}
+    board = previous_board.copy(stack=False)
+    sequence: List[chess.Move] = []
+
+    def search(depth: int) -> bool:
+        changed = changed_squares(board, current_board)
+        if not changed:
+            return True
+        if depth == 0 or chess.popcount(changed) > depth * MAX_SQUARES_PER_MOVE:
+            return False
+
+        for color in chess.COLORS:
+            if chess.popcount(board.occupied_co[color]) < target_counts[color]:
+                return False
+            if (
+                chess.popcount(board.pawns & board.occupied_co[color])
+                < target_pawns[color]
+            ):
+                return False
+
+        key = placement_key(board)
+        if failed.get(key, -1) >= depth:
+            return False
+
+        for move in list(board.legal_moves):
+            board.push(move)
+            sequence.append(move)
+            found = search(depth - 1)
+            if found:
+                return True
+            sequence.pop()
+            board.pop()
+
+        failed[key] = depth
+        return False
+
+    for depth in range(max_depth + 1):
+        if search(depth):
+            return sequence
+
+    return None
@@ -0,0 +1,194 @@
+import datetime
+import logging
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import chess
+import chess.pgn
+
+logger = logging.getLogger(__name__)
+
+
+class MoveTiming(NamedTuple):
+    """Where the time of a turn went, annotated on the move in the PGN.
+
+    Attributes:
+        turn_time (float): Wall time from the end of the previous move to this move (seconds).
+        capture_time (float): Time spent capturing the board during the turn (seconds).
+        inference_count (int): Number of detection model inferences run during the turn.
+        engine_time (float): Time spent calculating the robot's move (seconds).
+        execution_time (float): Time the robot hand took to execute the move (seconds).
+    """
+
+    turn_time: float = 0.0
+    capture_time: float = 0.0
+    inference_count: int = 0
+    engine_time: float = 0.0
+    execution_time: float = 0.0
+
+
+def format_timing(timing: MoveTiming) -> str:
+    """Formats move timings as PGN comment commands.
+
+    The elapsed move time uses the standard `%emt` command, the other timings use commands
+    of the same `[%name value]` form so they can be parsed from the archive.
+
+    Args:
+        timing (MoveTiming): The timings of the move.
+
+    Returns:
+        str: The PGN comment, e.g. "[%emt 0:00:03.20] [%capture 0.80] [%inferences 4] ...".
+    """
+    minutes, seconds = divmod(timing.turn_time, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return (
+        f"[%emt {hours}:{minutes:02d}:{seconds:05.2f}] "
+        f"[%capture {timing.capture_time:.2f}] "
+        f"[%inferences {timing.inference_count}] "
+        f"[%engine {timing.engine_time:.2f}] "
+        f"[%robot {timing.execution_time:.2f}]"
+    )
+
+
+class PGNArchive:
+    """Appends finished games to a size-rotated PGN file.
+
+    Games are written one at a time as they finish, so no game is kept in memory after it was
+    written. Once the file exceeds `max_bytes` it is rotated like a log file: `games.pgn`
+    becomes `games.pgn.1`, `games.pgn.1` becomes `games.pgn.2` and so on, keeping at most
+    `backup_count` old files. Safe to share between the games of several tables.
+
+    Attributes:
+        path (str): Path to the current PGN file.
+        max_bytes (int): Size after which the file is rotated.
+        backup_count (int): Number of rotated files kept.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 16 * 1024 * 1024, backup_count: int = 10
+    ) -> None:
+        """Initializes the archive.
+
+        Args:
+            path (str): Path to the current PGN file.
+            max_bytes (int): Size after which the file is rotated. Defaults to 16 MiB.
+            backup_count (int): Number of rotated files kept. Defaults to 10.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+
+    def write(self, game: chess.pgn.Game) -> None:
+        """Appends a game to the archive, rotating the file if it grew too large.
+
+        Args:
+            game (chess.pgn.Game): The game to write.
+        """
+        with self._lock:
+            with open(self.path, "a") as file:
+                exporter = chess.pgn.FileExporter(file)
+                game.accept(exporter)
+
+            if os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        logger.info("Rotated PGN archive %s", self.path)
+
+
+class GameRecorder:
+    """Records the game in progress as a PGN game with per-move timing annotations.
+
+    Only the game in progress is held in memory. Finished and abandoned games are written to
+    the archive.
+
+    Attributes:
+        archive (PGNArchive): The archive finished games are written to.
+        headers (Dict[str, str]): Extra PGN headers of every game, e.g. the table's name.
+        game (Optional[chess.pgn.Game]): The game in progress, None between games.
+    """
+
+    def __init__(
+        self, archive: PGNArchive, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Initializes the recorder.
+
+        Args:
+            archive (PGNArchive): The archive finished games are written to.
+            headers (Optional[Dict[str, str]]): Extra PGN headers of every game. Defaults to none.
+        """
+        self.archive = archive
+        self.headers = dict(headers or {})
+        self.game: Optional[chess.pgn.Game] = None
+        self._node: Optional[chess.pgn.GameNode] = None
+
+    def begin(
+        self, chess_board: chess.Board, human_color: chess.Color, robot_name: str
+    ) -> None:
+        """Starts recording a game, writing the previous one as abandoned if unfinished.
+
+        A previous game without moves is discarded, e.g. the one begun before the player chose a color.
+
+        Moves already on the board's move stack are recorded without timings.
+
+        Args:
+            chess_board (chess.Board): The current board.
+            human_color (chess.Color): The color the human player controls.
+            robot_name (str): The robot's player name, e.g. with its engine settings.
+        """
+        if self.game is not None:
+            self.finish("*", "abandoned")
+
+        self.game = chess.pgn.Game.from_board(chess_board)
+        self.game.headers["Event"] = "Robot chess"
+        self.game.headers["Date"] = datetime.date.today().strftime("%Y.%m.%d")
+        self.game.headers["White"] = "Human" if human_color == chess.WHITE else robot_name
+        self.game.headers["Black"] = "Human" if human_color == chess.BLACK else robot_name
+        self.game.headers.update(self.headers)
+        self._node = self.game.end()
+
+    def add_move(self, move: chess.Move, timing: MoveTiming) -> None:
+        """Records a move with its timings.
+
+        Args:
+            move (chess.Move): The move played.
+            timing (MoveTiming): Where the time of the turn went.
+        """
+        if self._node is None:
+            return
+
+        self._node = self._node.add_main_variation(move, comment=format_timing(timing))
+
+    def finish(self, result: str, termination: Optional[str] = None) -> None:
+        """Writes the game in progress to the archive, unless no move was played in it.
+
+        Args:
+            result (str): The PGN result, e.g. "1-0" or "*".
+            termination (Optional[str]): The reason the game ended, e.g. "resigned". Defaults to none.
+        """
+        if self.game is None:
+            return
+
+        if self.game.variations:
+            self.game.headers["Result"] = result
+            if termination:
+                self.game.headers["Termination"] = termination
+
+            try:
+                self.archive.write(self.game)
+            except OSError:
+                logger.exception("Failed writing game to the PGN archive!")
+
+        self.game = None
+        self._node = None
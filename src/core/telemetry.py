@@ -0,0 +1,348 @@
+import argparse
+import glob
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import chess
+import numpy as np
+
+from src.core.board import PieceOffset, flip_square
+from src.core.moves import OFF_BOARD_SQUARES, TravelTime
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = {
+    "from_square": np.int8,
+    "to_square": np.int8,
+    "offset_x": np.float32,
+    "offset_y": np.float32,
+    "sent": np.float64,
+    "acked": np.float64,
+    "success": np.bool_,
+}
+
+# Off-board squares are negative, shifting squares by this makes them array indices
+_SQUARE_SHIFT = -min(OFF_BOARD_SQUARES.values())
+_SQUARE_COUNT = len(chess.SQUARES) + _SQUARE_SHIFT
+
+
+class TelemetryRecorder:
+    """Records every piece move executed by a robot hand to columnar `.npz` chunks.
+
+    Each record holds the from-square and to-square in the robot's frame (flipped for a robot
+    playing black, as sent in the move command), the origin offset of the piece, the time the
+    robot hand started working on the move, the time it was acknowledged and whether it
+    succeeded. Records are buffered in memory and written as one compressed chunk file per
+    `chunk_size` records, so a crash loses at most one chunk. Safe to share between threads.
+
+    Attributes:
+        directory (str): Directory the chunk files are written to.
+        chunk_size (int): Number of records per chunk file.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 1024) -> None:
+        """Initializes the recorder.
+
+        Args:
+            directory (str): Directory the chunk files are written to, created if missing.
+            chunk_size (int): Number of records per chunk file. Defaults to 1024.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._columns: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._prefix = f"telemetry-{int(time.time() * 1000)}"
+        self._chunk_index = 0
+
+    def record(
+        self,
+        from_square: int,
+        to_square: int,
+        color: chess.Color,
+        origin_offset: PieceOffset,
+        sent: float,
+        acked: float,
+        success: bool,
+    ) -> None:
+        """Records a piece move.
+
+        Args:
+            from_square (int): The square the piece was picked from, negative for off-board squares.
+            to_square (int): The square the piece was placed on, negative for off-board squares.
+            color (chess.Color): The color perspective of the robot hand, flipping the squares if black.
+            origin_offset (PieceOffset): The offset of the piece on `from_square`.
+            sent (float): Time the robot hand started the move (seconds since the epoch).
+            acked (float): Time the move was acknowledged (seconds since the epoch).
+            success (bool): Whether the move succeeded.
+        """
+        if color == chess.BLACK:
+            from_square, to_square = flip_square(from_square), flip_square(to_square)
+
+        with self._lock:
+            self._columns["from_square"].append(from_square)
+            self._columns["to_square"].append(to_square)
+            self._columns["offset_x"].append(origin_offset.x)
+            self._columns["offset_y"].append(origin_offset.y)
+            self._columns["sent"].append(sent)
+            self._columns["acked"].append(acked)
+            self._columns["success"].append(success)
+
+            if len(self._columns["sent"]) >= self.chunk_size:
+                self._write_chunk()
+
+    def flush(self) -> None:
+        """Writes the buffered records to a chunk file, if any."""
+        with self._lock:
+            if self._columns["sent"]:
+                self._write_chunk()
+
+    def close(self) -> None:
+        """Writes the buffered records, see `flush`."""
+        self.flush()
+
+    def _write_chunk(self) -> None:
+        arrays = {
+            name: np.asarray(values, dtype=COLUMNS[name])
+            for name, values in self._columns.items()
+        }
+        path = os.path.join(
+            self.directory, f"{self._prefix}-{self._chunk_index:05d}.npz"
+        )
+        try:
+            # Written atomically, readers never see a partial chunk
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Failed writing robot telemetry {path}! Error: {e}")
+            return
+
+        self._chunk_index += 1
+        for values in self._columns.values():
+            values.clear()
+
+
+def load_telemetry(directory: str) -> Dict[str, np.ndarray]:
+    """Loads and concatenates all telemetry chunks of a directory, oldest first.
+
+    Args:
+        directory (str): Directory the chunk files were written to.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per column, empty if there are no records.
+    """
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(directory, "telemetry-*.npz"))):
+        try:
+            with np.load(path) as chunk:
+                chunks.append({name: chunk[name] for name in COLUMNS})
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable robot telemetry {path}! Error: {e}")
+
+    return {
+        name: np.concatenate([chunk[name] for chunk in chunks]).astype(dtype)
+        if chunks
+        else np.empty(0, dtype=dtype)
+        for name, dtype in COLUMNS.items()
+    }
+
+
+class TravelTimeModel:
+    """Estimates the time the robot hand takes to move a piece between two squares.
+
+    Fitted from recorded telemetry. A square pair moved often enough is estimated by its measured
+    mean duration. Other pairs are estimated from the mean durations of moves leaving the
+    from-square and of moves arriving at the to-square, and squares never seen fall back to the
+    mean duration of all moves. Only successful moves are timed; failures are counted per square.
+
+    Squares are in the robot's frame, `travel_time` returns an estimator for board squares.
+
+    Attributes:
+        min_samples (int): Moves of a square pair needed to trust its measured mean.
+    """
+
+    def __init__(self, min_samples: int = 3) -> None:
+        """Initializes an empty model, estimating every move as zero until fitted.
+
+        Args:
+            min_samples (int): Moves of a square pair needed to trust its measured mean. Defaults to 3.
+        """
+        self.min_samples = min_samples
+        self._pair_sum = np.zeros((_SQUARE_COUNT, _SQUARE_COUNT))
+        self._pair_count = np.zeros((_SQUARE_COUNT, _SQUARE_COUNT), dtype=np.int64)
+        self._moves = np.zeros(_SQUARE_COUNT, dtype=np.int64)
+        self._failures = np.zeros(_SQUARE_COUNT, dtype=np.int64)
+        self._estimates = np.zeros((_SQUARE_COUNT, _SQUARE_COUNT))
+
+    @classmethod
+    def from_directory(cls, directory: str, min_samples: int = 3) -> "TravelTimeModel":
+        """Fits a model to all telemetry recorded in a directory, see `load_telemetry`."""
+        model = cls(min_samples)
+        model.fit(load_telemetry(directory))
+        return model
+
+    @property
+    def sample_count(self) -> int:
+        """int: Number of successful moves the model was fitted to."""
+        return int(self._pair_count.sum())
+
+    def fit(self, columns: Dict[str, np.ndarray]) -> None:
+        """Adds recorded moves to the model and updates the estimates.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Telemetry columns, see `load_telemetry`.
+        """
+        from_index = columns["from_square"].astype(np.int64) + _SQUARE_SHIFT
+        to_index = columns["to_square"].astype(np.int64) + _SQUARE_SHIFT
+        valid = (
+            (from_index >= 0)
+            & (from_index < _SQUARE_COUNT)
+            & (to_index >= 0)
+            & (to_index < _SQUARE_COUNT)
+        )
+        success = columns["success"].astype(bool) & valid
+        durations = columns["acked"] - columns["sent"]
+
+        np.add.at(self._moves, from_index[valid], 1)
+        np.add.at(self._moves, to_index[valid], 1)
+        failed = valid & ~success
+        np.add.at(self._failures, from_index[failed], 1)
+        np.add.at(self._failures, to_index[failed], 1)
+
+        np.add.at(
+            self._pair_sum, (from_index[success], to_index[success]), durations[success]
+        )
+        np.add.at(self._pair_count, (from_index[success], to_index[success]), 1)
+
+        self._update_estimates()
+
+    def _update_estimates(self) -> None:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pair_mean = self._pair_sum / self._pair_count
+            leaving = self._pair_sum.sum(axis=1) / self._pair_count.sum(axis=1)
+            arriving = self._pair_sum.sum(axis=0) / self._pair_count.sum(axis=0)
+
+            # Mean of the leaving and arriving means, or whichever of the two is known
+            leaving, arriving = leaving[:, None], arriving[None, :]
+            known = ~np.isnan(leaving) * 1 + ~np.isnan(arriving) * 1
+            square_mean = (np.nan_to_num(leaving) + np.nan_to_num(arriving)) / known
+
+        estimates = np.where(self._pair_count >= self.min_samples, pair_mean, square_mean)
+        overall_mean = self._pair_sum.sum() / max(self.sample_count, 1)
+        self._estimates = np.where(np.isnan(estimates), overall_mean, estimates)
+
+    def estimate(self, from_square: int, to_square: int) -> float:
+        """Estimates the duration of a piece move in the robot's frame.
+
+        Args:
+            from_square (int): The square the piece is picked from, negative for off-board squares.
+            to_square (int): The square the piece is placed on, negative for off-board squares.
+
+        Returns:
+            float: The estimated duration (seconds).
+        """
+        return float(
+            self._estimates[from_square + _SQUARE_SHIFT, to_square + _SQUARE_SHIFT]
+        )
+
+    def travel_time(self, color: chess.Color) -> TravelTime:
+        """Returns an estimator of move durations for squares from a color's perspective.
+
+        Args:
+            color (chess.Color): The color perspective of the robot hand, flipping the squares if black.
+
+        Returns:
+            TravelTime: The estimator, e.g. for `iter_reset_board`.
+        """
+        if color == chess.WHITE:
+            return self.estimate
+        return lambda from_square, to_square: self.estimate(
+            flip_square(from_square), flip_square(to_square)
+        )
+
+    def failure_rate(self, square: int) -> float:
+        """Returns the fraction of moves from or to a square in the robot's frame that failed.
+
+        Args:
+            square (int): The square, negative for off-board squares.
+
+        Returns:
+            float: The failure rate, 0.0 if no moves involved the square.
+        """
+        index = square + _SQUARE_SHIFT
+        if not self._moves[index]:
+            return 0.0
+        return float(self._failures[index] / self._moves[index])
+
+    def slowest_pairs(self, count: int = 10) -> List[Tuple[int, int, float]]:
+        """Returns the measured square pairs with the longest mean durations.
+
+        Args:
+            count (int): Number of pairs to return. Defaults to 10.
+
+        Returns:
+            List[Tuple[int, int, float]]: From-square, to-square and mean duration, slowest first.
+        """
+        measured = np.argwhere(self._pair_count >= self.min_samples)
+        means = [
+            (
+                int(i) - _SQUARE_SHIFT,
+                int(j) - _SQUARE_SHIFT,
+                float(self._pair_sum[i, j] / self._pair_count[i, j]),
+            )
+            for i, j in measured
+        ]
+        return sorted(means, key=lambda pair: pair[2], reverse=True)[:count]
+
+    def failing_squares(self, min_rate: float = 0.05) -> List[Tuple[int, float]]:
+        """Returns the squares whose moves fail at least at a given rate.
+
+        Args:
+            min_rate (float): Minimum failure rate. Defaults to 0.05.
+
+        Returns:
+            List[Tuple[int, float]]: Squares and their failure rates, most failing first.
+        """
+        rates = [
+            (index - _SQUARE_SHIFT, self.failure_rate(index - _SQUARE_SHIFT))
+            for index in np.flatnonzero(self._failures)
+        ]
+        return sorted(
+            [(square, rate) for square, rate in rates if rate >= min_rate],
+            key=lambda square_rate: square_rate[1],
+            reverse=True,
+        )
+
+
+def _square_name(square: int) -> str:
+    return chess.square_name(square) if square in chess.SQUARES else str(square)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report slow and failing squares from recorded robot telemetry."
+    )
+    parser.add_argument("directory", help="Directory the telemetry chunks were written to")
+    parser.add_argument("--count", type=int, default=10, help="Number of slowest pairs to list")
+    parser.add_argument("--min_samples", type=int, default=3, help="Moves needed per square pair")
+    args = parser.parse_args()
+
+    model = TravelTimeModel.from_directory(args.directory, args.min_samples)
+    print(f"{model.sample_count} successful moves")
+    print("Slowest square pairs (robot frame):")
+    for from_square, to_square, duration in model.slowest_pairs(args.count):
+        print(f"  {_square_name(from_square)} -> {_square_name(to_square)}: {duration:.2f}s")
+    print("Failing squares (robot frame):")
+    for square, rate in model.failing_squares():
+        print(f"  {_square_name(square)}: {rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,30 +9,46 @@ from ultralytics import YOLO
 import numpy as np
 from enum import Enum
 
-from src.core.board import PhysicalBoard, BoardCapture, are_boards_equal
+from src.core import instrumentation
+from src.core.board import PhysicalBoard, BoardCapture, changed_squares, format_squares
 from src.detection.aruco import detect_aruco_area
-from src.detection.model import grayscale_to_board
+from src.detection.batching import DetectionServer
+from src.detection.model import grayscale_region_to_board, grayscale_to_board
 
 logger = logging.getLogger(__name__)
 
+# Size of the downscaled board image compared to detect changes
+CHANGE_THUMBNAIL_SIZE = (64, 64)
+
 
 class Orientation(Enum):
     HUMAN_BOTTOM = 0
     ROBOT_BOTTOM = 1
 
 
-def default_camera_setup() -> pylon.InstantCamera:
+def default_camera_setup(serial_number: Optional[str] = None) -> pylon.InstantCamera:
     """
     Configures and initializes a camera with default settings for capturing images.
 
     The setup configures frame rate, exposure mode, acquisition mode, and pixel format.
     If initialization fails, logs an error and returns None.
 
+    Args:
+        serial_number (Optional[str]): Serial number of the camera to open, e.g. one per table.
+            Defaults to the first camera found.
+
     Returns:
         Optional[pylon.InstantCamera]: The initialized camera instance, or None if setup fails.
     """
     try:
-        camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice())
+        factory = pylon.TlFactory.GetInstance()
+        if serial_number is None:
+            device = factory.CreateFirstDevice()
+        else:
+            device_info = pylon.DeviceInfo()
+            device_info.SetSerialNumber(serial_number)
+            device = factory.CreateFirstDevice(device_info)
+        camera = pylon.InstantCamera(device)
         camera.Open()
         camera.AcquisitionFrameRateEnable.SetValue(True)
         camera.AcquisitionFrameRate.SetValue(5)
@@ -110,6 +126,9 @@ class CameraBoardCapture(BoardCapture):
         iou_threshold (float): IoU threshold for non-maximum suppression.
         max_piece_offset (float): Maximum offset distance from square center for valid piece mapping.
         physical_orientation (Orientation): `Orientation.HUMAN_BOTTOM` if bottom of the captured image is the player's side, `Orientation.ROBOT_BOTTOM` otherwise.
+        in_progress_delay (float): Delay before capturing while a move is in progress (seconds).
+        detection_server (Optional[DetectionServer]): Server batching detections with other boards, used instead of `model`.
+        change_threshold (float): Mean absolute gray level difference of downscaled frames that counts as a board change.
     """
 
     def __init__(
@@ -121,24 +140,31 @@ class CameraBoardCapture(BoardCapture):
         iou_threshold: float = 0.45,
         max_piece_offset: float = 0.9,
         visualize_board: bool = False,
+        in_progress_delay: float = 0.5,
+        camera: Optional[pylon.InstantCamera] = None,
+        detection_server: Optional[DetectionServer] = None,
+        change_threshold: float = 4.0,
     ) -> None:
         """
         Initializes CameraBoardDetection with model, camera, and settings.
 
         Args:
-            model (YOLO): YOLO model for detecting chessboard elements.
-            camera (Optional[pylon.InstantCamera]): Camera instance; defaults to None for automatic setup.
+            model (YOLO): YOLO model for detecting chessboard elements. May be shared between instances.
             physical_orientation (Orientation): `Orientation.HUMAN_BOTTOM` if bottom of the captured image is the player's side, `Orientation.ROBOT_BOTTOM` otherwise.
             timeout (int): Image capture timeout in milliseconds. Defaults to 5000.
             capture_delay (float): Delay between captures in seconds. Defaults to 0.3.
             conf_threshold (float): Confidence threshold for detection. Defaults to 0.5.
             iou_threshold (float): IoU threshold for non-maximum suppression. Defaults to 0.45.
             max_piece_offset (float): Maximum offset from square center for valid mapping. Defaults to 0.4.
+            in_progress_delay (float): Delay before capturing while a move is in progress, in seconds. Defaults to 0.5.
+            camera (Optional[pylon.InstantCamera]): Camera instance; defaults to None for automatic setup.
+            detection_server (Optional[DetectionServer]): Server batching detections with other boards. Defaults to None.
+            change_threshold (float): Mean absolute gray level difference of downscaled frames that counts as a change. Defaults to 4.0.
 
         Raises:
             RuntimeError: If camera initialization fails.
         """
-        self.camera = default_camera_setup()
+        self.camera = camera if camera is not None else default_camera_setup()
         self.timeout = timeout
         self.model = model
         self.area = None
@@ -148,7 +174,12 @@ class CameraBoardCapture(BoardCapture):
         self.max_piece_offset = max_piece_offset
         self.physical_orientation = physical_orientation
         self.visualize_board = visualize_board
+        self.in_progress_delay = in_progress_delay
+        self.detection_server = detection_server
+        self.change_threshold = change_threshold
+        self._reference: Optional[np.ndarray] = None
 
+    @instrumentation.timed("camera.capture_image")
     def capture_image(self) -> Optional[np.ndarray]:
         """
         Captures an image, converts it to grayscale, and crops to board area if detected.
@@ -177,8 +208,10 @@ class CameraBoardCapture(BoardCapture):
                 return cropped_image
 
             logger.warning("No board detected with aruco stickers; retrying.")
+            instrumentation.count("camera.aruco_retries")
             time.sleep(1)
 
+    @instrumentation.timed("camera.capture_board")
     def capture_board(self, human_color: chess.Color) -> Optional[PhysicalBoard]:
         """
         Captures and verifies the state of the chessboard to ensure consistency.
@@ -198,6 +231,10 @@ class CameraBoardCapture(BoardCapture):
             else not human_color
         )
 
+        # A hand is likely over the board mid-move, don't spend inference on it
+        if self.watch_squares:
+            time.sleep(self.in_progress_delay)
+
         while True:
             first_image = self.capture_image()
             if first_image is None:
@@ -211,7 +248,9 @@ class CameraBoardCapture(BoardCapture):
                 self.iou_threshold,
                 self.max_piece_offset,
                 visualize=self.visualize_board,
+                detection_server=self.detection_server,
             )
+            self.inference_count += 1
 
             second_image = self.capture_image()
             if second_image is None:
@@ -225,13 +264,105 @@ class CameraBoardCapture(BoardCapture):
                 self.iou_threshold,
                 self.max_piece_offset,
                 visualize=self.visualize_board,
+                detection_server=self.detection_server,
             )
+            self.inference_count += 1
 
-            if are_boards_equal(first_board.chess_board, second_board.chess_board):
+            changed = changed_squares(first_board.chess_board, second_board.chess_board)
+            if not changed:
+                self._reference = self._thumbnail(second_image)
                 return first_board
 
-            logger.info("Inconsistent board states captured; retrying..")
+            logger.info(
+                "Inconsistent board states captured on squares %s; retrying..",
+                format_squares(changed),
+            )
+            instrumentation.count("camera.stability_retries")
+
+    @instrumentation.timed("camera.capture_squares")
+    def capture_squares(
+        self, squares: chess.Bitboard, human_color: chess.Color
+    ) -> Optional[PhysicalBoard]:
+        """
+        Captures the pieces on a few squares, detecting only the image region around them.
+
+        Used to verify a robot step, when the robot hand is clear of the board, so a single
+        image is detected without the consistency check of `capture_board`.
+
+        Args:
+            squares (chess.Bitboard): Mask of squares to capture.
+            human_color (chess.Color): Color perspective (chess.WHITE or chess.BLACK) for board orientation.
+
+        Returns:
+            Optional[PhysicalBoard]: Detected pieces on `squares`, or None if capture fails.
+        """
+        if not squares:
+            return PhysicalBoard(chess.Board(None))
+
+        perspective = (
+            human_color
+            if self.physical_orientation == Orientation.HUMAN_BOTTOM
+            else not human_color
+        )
+
+        image = self.capture_image()
+        if image is None:
+            return None
+
+        board = grayscale_region_to_board(
+            image,
+            squares,
+            perspective,
+            self.model,
+            self.conf_threshold,
+            self.iou_threshold,
+            self.max_piece_offset,
+            detection_server=self.detection_server,
+        )
+        self.inference_count += 1
+        return board
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Compares downscaled frames with the last captured board image until they differ or the timeout passes.
+
+        Frame differencing costs a fraction of a detection, so the board is only captured again
+        once something moved on it. Frames are grabbed at the camera's frame rate.
+
+        Args:
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            bool: True if the board may have changed since the last capture, False otherwise.
+        """
+        if self._reference is None or self.area is None:
+            return True
+
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self.camera.IsGrabbing():
+                return True
+
+            grab_result = self.camera.RetrieveResult(
+                self.timeout, pylon.TimeoutHandling_Return
+            )
+            if not grab_result.GrabSucceeded():
+                return True
+
+            image = crop_image_by_area(preprocess_image(grab_result.Array), self.area)
+            difference = np.mean(cv2.absdiff(self._thumbnail(image), self._reference))
+            if difference > self.change_threshold:
+                logger.debug("Board changed by %.1f gray levels", difference)
+                return True
+
+            if time.monotonic() >= deadline:
+                return False
+
+    @staticmethod
+    def _thumbnail(image: np.ndarray) -> np.ndarray:
+        return cv2.resize(image, CHANGE_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
 
+    @instrumentation.timed("camera.crop_image")
     def _crop_image(self, image: np.ndarray) -> Optional[np.ndarray]:
         """
         Crops the image to the board area using ArUco markers.
@@ -242,14 +373,16 @@ class CameraBoardCapture(BoardCapture):
         Returns:
             Optional[np.ndarray]: Cropped board image, or None if no area is detected.
         """
-        area = detect_aruco_area(image)
+        with instrumentation.timer("camera.detect_aruco"):
+            area = detect_aruco_area(image)
         if area is not None:
             self.area = area
 
         if self.area is None:
             logger.warning("No ArUco area detected.")
             return None
-        return crop_image_by_area(image, self.area)
+        with instrumentation.timer("camera.warp"):
+            return crop_image_by_area(image, self.area)
 
     def close(self):
         """Releases camera resources and stops image capture."""
@@ -0,0 +1,189 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.detection.model import DetectionResult, detect_grayscale_batch
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionRequest(NamedTuple):
+    """A queued detection request.
+
+    Attributes:
+        grayscale_image (np.ndarray): The grayscale board image.
+        conf_threshold (float): Confidence threshold for detection.
+        iou_threshold (float): IoU threshold for non-maximum suppression.
+        future (Future): Receives the `DetectionResult` of the image.
+    """
+
+    grayscale_image: np.ndarray
+    conf_threshold: float
+    iou_threshold: float
+    future: "Future[DetectionResult]"
+
+
+class DetectionServer:
+    """In-process inference server batching piece detections of several board captures.
+
+    Producers, e.g. the `CameraBoardCapture` of every table, queue grayscale board images and
+    wait on futures. A single worker thread collects queued requests into micro-batches of up
+    to `max_batch_size` images, waiting at most `max_delay` after the first request for more to
+    arrive, and runs one forward pass per batch and threshold setting. A lone producer only pays
+    `max_delay` once per image, while many producers share forward passes.
+
+    Attributes:
+        model (YOLO): The YOLO model shared by all producers.
+        max_batch_size (int): Maximum number of images per forward pass.
+        max_delay (float): Maximum time to wait for a batch to fill up (seconds).
+        batch_count (int): Number of forward passes run.
+        request_count (int): Number of images detected.
+    """
+
+    def __init__(
+        self, model: YOLO, max_batch_size: int = 8, max_delay: float = 0.01
+    ) -> None:
+        """Starts the inference worker.
+
+        Args:
+            model (YOLO): The YOLO model shared by all producers.
+            max_batch_size (int): Maximum number of images per forward pass. Defaults to 8.
+            max_delay (float): Maximum time to wait for a batch to fill up, in seconds. Defaults to 0.01.
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batch_count = 0
+        self.request_count = 0
+
+        self._queue: "queue.Queue[Optional[DetectionRequest]]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._serve, name="detection-server", daemon=True
+        )
+        self._worker.start()
+
+    def submit(
+        self,
+        grayscale_image: np.ndarray,
+        conf_threshold: float = 0.5,
+        iou_threshold: float = 0.45,
+    ) -> "Future[DetectionResult]":
+        """Queues a grayscale board image for detection.
+
+        Args:
+            grayscale_image (np.ndarray): The grayscale board image.
+            conf_threshold (float, optional): Confidence threshold for detection. Defaults to 0.5.
+            iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
+
+        Returns:
+            Future[DetectionResult]: Receives the detection result, or the exception of the forward pass.
+
+        Raises:
+            RuntimeError: If the server is closed.
+        """
+        future: "Future[DetectionResult]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Detection server is closed.")
+            self._queue.put(
+                DetectionRequest(grayscale_image, conf_threshold, iou_threshold, future)
+            )
+        return future
+
+    def detect_grayscale(
+        self,
+        grayscale_image: np.ndarray,
+        conf_threshold: float = 0.5,
+        iou_threshold: float = 0.45,
+    ) -> DetectionResult:
+        """Detects chess pieces in a grayscale image, batched with other producers' images.
+
+        Args:
+            grayscale_image (np.ndarray): The grayscale board image.
+            conf_threshold (float, optional): Confidence threshold for detection. Defaults to 0.5.
+            iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
+
+        Returns:
+            DetectionResult: Contains bounding boxes, labels, and confidence scores for each detected piece.
+        """
+        return self.submit(grayscale_image, conf_threshold, iou_threshold).result()
+
+    def close(self) -> None:
+        """Detects the images queued so far, then stops the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def _collect_batch(self, first: DetectionRequest) -> Tuple[List[DetectionRequest], bool]:
+        """Collects requests after the first one until the batch is full or the deadline passed."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+
+        while len(batch) < self.max_batch_size:
+            try:
+                request = self._queue.get(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+
+        return batch, False
+
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, stopping = self._collect_batch(first)
+
+            # A forward pass uses a single threshold setting
+            groups: Dict[Tuple[float, float], List[DetectionRequest]] = {}
+            for request in batch:
+                if request.future.set_running_or_notify_cancel():
+                    key = (request.conf_threshold, request.iou_threshold)
+                    groups.setdefault(key, []).append(request)
+
+            for (conf_threshold, iou_threshold), requests in groups.items():
+                self._detect(requests, conf_threshold, iou_threshold)
+
+    def _detect(
+        self,
+        requests: List[DetectionRequest],
+        conf_threshold: float,
+        iou_threshold: float,
+    ) -> None:
+        try:
+            results = detect_grayscale_batch(
+                [request.grayscale_image for request in requests],
+                self.model,
+                conf_threshold,
+                iou_threshold,
+            )
+        except Exception as e:
+            logger.exception("Batched detection of %d images failed!", len(requests))
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        self.batch_count += 1
+        self.request_count += len(requests)
+        logger.debug("Detected a batch of %d images", len(requests))
+
+        for request, result in zip(requests, results):
+            request.future.set_result(result)
@@ -1,11 +1,19 @@
-from typing import NamedTuple, Optional, List
+from typing import TYPE_CHECKING, NamedTuple, Optional, List
+import threading
 import cv2
 from ultralytics import YOLO
 import chess
 import numpy as np
 
+from src.core import instrumentation
 from src.core.board import PhysicalBoard, PieceOffset, flip_square
 
+if TYPE_CHECKING:
+    from src.detection.batching import DetectionServer
+
+# YOLO predictors are not thread-safe, predictions of boards sharing a model are serialized
+_predict_lock = threading.Lock()
+
 
 class MappedSquare(NamedTuple):
     """Represents a detected piece mapped to a square on a chessboard.
@@ -37,6 +45,7 @@ class DetectionResult(NamedTuple):
     confidences: List[float]
 
 
+@instrumentation.timed("model.detect_grayscale")
 def detect_grayscale(
     grayscale_image: np.ndarray,
     model: YOLO,
@@ -58,26 +67,57 @@ def detect_grayscale(
         DetectionResult: Contains bounding boxes, labels, and confidence scores for each detected piece.
                          Empty lists are returned if no detections meet the thresholds.
     """
-    image = cv2.merge([grayscale_image] * 3)
-    results = model.predict(image, conf=conf_threshold, iou=iou_threshold)
+    return detect_grayscale_batch(
+        [grayscale_image], model, conf_threshold, iou_threshold
+    )[0]
+
+
+@instrumentation.timed("model.detect_grayscale_batch")
+def detect_grayscale_batch(
+    grayscale_images: List[np.ndarray],
+    model: YOLO,
+    conf_threshold: float = 0.5,
+    iou_threshold: float = 0.45,
+) -> List[DetectionResult]:
+    """Detects chess pieces in several grayscale images with a single YOLO forward pass.
+
+    Args:
+        grayscale_images (List[np.ndarray]): The grayscale images in which to detect chess pieces.
+        model (YOLO): The YOLO model for detecting objects.
+        conf_threshold (float, optional): Minimum confidence threshold for valid detections. Defaults to 0.5.
+        iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
+
+    Returns:
+        List[DetectionResult]: Detection results in the order of the images.
+    """
+    images = [cv2.merge([grayscale_image] * 3) for grayscale_image in grayscale_images]
+    with _predict_lock:
+        results = model.predict(images, conf=conf_threshold, iou=iou_threshold)
     labels = model.names
 
-    bbox, label, conf = [], [], []
+    detections = []
+    for result in results:
+        bbox, label, conf = [], [], []
 
-    if results and results[0].boxes:
-        boxes = results[0].boxes.xyxy.cpu().numpy()
-        confs = results[0].boxes.conf.cpu().numpy()
-        class_ids = results[0].boxes.cls.cpu().numpy().astype(int)
+        if result.boxes:
+            boxes = result.boxes.xyxy.cpu().numpy()
+            confs = result.boxes.conf.cpu().numpy()
+            class_ids = result.boxes.cls.cpu().numpy().astype(int)
 
-        for box, cf, class_id in zip(boxes, confs, class_ids):
-            x1, y1, x2, y2 = map(int, box)
-            bbox.append([x1, y1, x2 - x1, y2 - y1])
-            label.append(labels[class_id])
-            conf.append(cf)
+            for box, cf, class_id in zip(boxes, confs, class_ids):
+                x1, y1, x2, y2 = map(int, box)
+                bbox.append([x1, y1, x2 - x1, y2 - y1])
+                label.append(labels[class_id])
+                conf.append(cf)
 
-    return DetectionResult(bounding_boxes=bbox, labels=label, confidences=conf)
+        detections.append(
+            DetectionResult(bounding_boxes=bbox, labels=label, confidences=conf)
+        )
+
+    return detections
 
 
+@instrumentation.timed("model.map_results_to_squares")
 def map_results_to_squares(
     img_width: int,
     img_height: int,
@@ -324,6 +364,7 @@ def grayscale_to_board(
     iou_threshold: float = 0.45,
     max_piece_offset: float = 0.4,
     visualize: bool = False,
+    detection_server: Optional["DetectionServer"] = None,
 ) -> PhysicalBoard:
     """Detects and maps chess pieces from a grayscale board image to a PhysicalBoard.
 
@@ -337,11 +378,20 @@ def grayscale_to_board(
         conf_threshold (float, optional): Confidence threshold for object detection. Defaults to 0.5.
         iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
         max_piece_offset (float, optional): Max distance offset from square center for mapping. Defaults to 0.4.
+        detection_server (Optional[DetectionServer], optional): Server batching the detection with other
+            boards' images, used instead of `model`. Defaults to None.
 
     Returns:
         PhysicalBoard: PhysicalBoard with mapped pieces and offsets.
     """
-    detection = detect_grayscale(grayscale_image, model, conf_threshold, iou_threshold)
+    if detection_server is not None:
+        detection = detection_server.detect_grayscale(
+            grayscale_image, conf_threshold, iou_threshold
+        )
+    else:
+        detection = detect_grayscale(
+            grayscale_image, model, conf_threshold, iou_threshold
+        )
     mapped_squares = map_results_to_squares(
         grayscale_image.shape[1], grayscale_image.shape[0], detection, max_piece_offset
     )
@@ -360,3 +410,94 @@ def grayscale_to_board(
         cv2.waitKey(1)
 
     return board
+
+
+def region_bounds(
+    img_width: int, img_height: int, image_squares: chess.Bitboard, margin: float = 0.5
+) -> List[int]:
+    """Computes the image region covering a set of squares.
+
+    Args:
+        img_width (int): Width of the chessboard image.
+        img_height (int): Height of the chessboard image.
+        image_squares (chess.Bitboard): Squares in image orientation, first row at the bottom of the image.
+        margin (float, optional): Margin around the squares, in squares, so pieces standing off
+            center or leaning over a square border are fully visible. Defaults to 0.5.
+
+    Returns:
+        List[int]: The region in [x1, y1, x2, y2] format.
+    """
+    square_width = img_width / 8
+    square_height = img_height / 8
+    cols = [chess.square_file(square) for square in chess.scan_forward(image_squares)]
+    rows = [7 - chess.square_rank(square) for square in chess.scan_forward(image_squares)]
+
+    return [
+        max(int((min(cols) - margin) * square_width), 0),
+        max(int((min(rows) - margin) * square_height), 0),
+        min(int((max(cols) + 1 + margin) * square_width), img_width),
+        min(int((max(rows) + 1 + margin) * square_height), img_height),
+    ]
+
+
+def grayscale_region_to_board(
+    grayscale_image: np.ndarray,
+    squares: chess.Bitboard,
+    bottom_color: chess.Color,
+    model: YOLO,
+    conf_threshold: float = 0.5,
+    iou_threshold: float = 0.45,
+    max_piece_offset: float = 0.4,
+    detection_server: Optional["DetectionServer"] = None,
+) -> PhysicalBoard:
+    """Detects chess pieces on a few squares of a grayscale board image, see `grayscale_to_board`.
+
+    Only the region around the squares is passed to the detection model, which is much cheaper
+    than detecting the whole board when few squares are of interest, e.g. to verify a robot move.
+
+    Args:
+        grayscale_image (np.ndarray): Grayscale chessboard image from a top-down view.
+        squares (chess.Bitboard): Squares to detect, in board orientation with white at the bottom.
+        bottom_color (chess.Color): Color at the bottom of the image.
+        model (YOLO): YOLO model used to detect pieces.
+        conf_threshold (float, optional): Confidence threshold for object detection. Defaults to 0.5.
+        iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
+        max_piece_offset (float, optional): Max distance offset from square center for mapping. Defaults to 0.4.
+        detection_server (Optional[DetectionServer], optional): Server batching the detection with other
+            boards' images, used instead of `model`. Defaults to None.
+
+    Returns:
+        PhysicalBoard: PhysicalBoard with pieces and offsets mapped on `squares` only, all other
+            squares are empty.
+    """
+    img_height, img_width = grayscale_image.shape[:2]
+    image_squares = (
+        chess.flip_vertical(chess.flip_horizontal(squares))
+        if bottom_color == chess.BLACK
+        else squares
+    )
+    x1, y1, x2, y2 = region_bounds(img_width, img_height, image_squares)
+    region = np.ascontiguousarray(grayscale_image[y1:y2, x1:x2])
+
+    if detection_server is not None:
+        detection = detection_server.detect_grayscale(
+            region, conf_threshold, iou_threshold
+        )
+    else:
+        detection = detect_grayscale(region, model, conf_threshold, iou_threshold)
+
+    # Back to the coordinates of the whole board image
+    detection = detection._replace(
+        bounding_boxes=[
+            [box[0] + x1, box[1] + y1, box[2], box[3]]
+            for box in detection.bounding_boxes
+        ]
+    )
+    mapped_squares = [
+        mapped_square
+        for mapped_square in map_results_to_squares(
+            img_width, img_height, detection, max_piece_offset
+        )
+        if chess.BB_SQUARES[mapped_square.chess_square] & image_squares
+    ]
+    return map_squares_to_board(mapped_squares, bottom_color)
@@ -0,0 +1,521 @@
+import argparse
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import chess
+import chess.pgn
+
+from src.communication.async_tcp_robot import AsyncTCPRobotHand
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import PhysicalBoard, PieceOffset
+from src.core.instrumentation import Histogram
+from src.core.moves import (
+    MoveStep,
+    PieceMover,
+    ProgressCallback,
+    execute_move,
+    execute_plan,
+    off_board_square,
+    plan_reset_board,
+    plan_steps,
+)
+from src.mocks.piece_mover import SimulatedPieceMover
+from src.mocks.robot_simulator import FaultInjection, RobotSimulator
+
+logger = logging.getLogger(__name__)
+
+# Rounds of planning a single board reset may take before it is counted as failed
+MAX_RESET_ROUNDS = 64
+
+
+class TimedPieceMover(PieceMover):
+    """Piece mover timing every command it passes on to another piece mover.
+
+    Every call of `move_piece`, `prepare`, `plan` and `reset` is one command, a plan counting
+    as a single command however many steps it has.
+
+    Attributes:
+        mover (PieceMover): The piece mover executing the commands.
+        latency (Histogram): Latencies of the commands.
+        steps (int): Number of piece moves sent, including those of plans.
+    """
+
+    def __init__(self, mover: PieceMover) -> None:
+        """Initializes the timing wrapper.
+
+        Args:
+            mover (PieceMover): The piece mover executing the commands.
+        """
+        self.mover = mover
+        self.latency = Histogram()
+        self.steps = 0
+
+    @property
+    def connected(self) -> bool:
+        """bool: Whether the wrapped piece mover is connected."""
+        return self.mover.connected
+
+    def move_piece(
+        self,
+        from_square: chess.Square,
+        to_square: chess.Square,
+        color: chess.Color,
+        origin_offset: PieceOffset,
+    ) -> bool:
+        """Times a piece move, see `PieceMover.move_piece`."""
+        self.steps += 1
+        started = time.perf_counter()
+        try:
+            return self.mover.move_piece(from_square, to_square, color, origin_offset)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        """Times pre-positioning the hand, see `PieceMover.prepare`."""
+        started = time.perf_counter()
+        try:
+            return self.mover.prepare(square, color)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    def plan(
+        self,
+        steps: List[MoveStep],
+        color: chess.Color,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """Times a plan as one command, see `PieceMover.plan`."""
+        self.steps += len(steps)
+        started = time.perf_counter()
+        try:
+            return self.mover.plan(steps, color, on_progress)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    def reset(self) -> bool:
+        """Times a reset, see `PieceMover.reset`."""
+        started = time.perf_counter()
+        try:
+            return self.mover.reset()
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+
+class WorkloadReport(NamedTuple):
+    """Measurements of a benchmark workload.
+
+    Attributes:
+        name (str): Name of the workload.
+        items (int): Number of games, resets or rearrangements executed.
+        failures (int): Number of items that failed.
+        commands (int): Number of commands sent to the piece mover.
+        steps (int): Number of piece moves sent to the piece mover.
+        wall_time (float): Time the workload took (seconds).
+        latency (Histogram): Latencies of the commands.
+        resets (Histogram): Wall times of the board resets, empty for other workloads.
+        travel_distance (Optional[float]): Distance traveled by the simulated gripper (meters),
+            None without the simulator.
+        arm_time (Optional[float]): Time the simulated arm was moving (seconds), None without the simulator.
+    """
+
+    name: str
+    items: int
+    failures: int
+    commands: int
+    steps: int
+    wall_time: float
+    latency: Histogram
+    resets: Histogram
+    travel_distance: Optional[float]
+    arm_time: Optional[float]
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarizes the workload.
+
+        Returns:
+            Dict[str, Any]: Throughput, command latency percentiles in milliseconds, travel and
+                reset wall times.
+        """
+        summary: Dict[str, Any] = {
+            "items": self.items,
+            "failures": self.failures,
+            "commands": self.commands,
+            "steps": self.steps,
+            "wall_time_s": self.wall_time,
+            "commands_per_s": self.commands / self.wall_time if self.wall_time else 0.0,
+            "steps_per_s": self.steps / self.wall_time if self.wall_time else 0.0,
+            "p50_ms": self.latency.percentile(50) * 1e3,
+            "p95_ms": self.latency.percentile(95) * 1e3,
+            "p99_ms": self.latency.percentile(99) * 1e3,
+            "max_ms": self.latency.max * 1e3,
+            "travel_m": self.travel_distance,
+            "arm_time_s": self.arm_time,
+        }
+        if self.resets.count:
+            summary["reset_total_s"] = self.resets.total
+            summary["reset_mean_s"] = self.resets.total / self.resets.count
+            summary["reset_p95_s"] = self.resets.percentile(95)
+        return summary
+
+
+class RobotBenchmark:
+    """Drives a piece mover through scripted workloads and measures it.
+
+    Workloads are replayed games, board resets to the starting position and random
+    rearrangements of all pieces. The benchmark keeps its own board of where the pieces
+    stand, applying the piece moves the mover reports as done, so no camera is needed. With a
+    simulator the virtual board is set to that board before every item, so failed moves do not
+    carry over, and the gripper's travel is reported.
+
+    The robot plays white, so squares of the commands are in the game's frame.
+
+    Attributes:
+        mover (TimedPieceMover): The piece mover under test, timed.
+        simulator (Optional[RobotSimulator]): The simulator behind the piece mover, if any.
+    """
+
+    def __init__(
+        self,
+        mover: PieceMover,
+        simulator: Optional[RobotSimulator] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initializes the benchmark.
+
+        Args:
+            mover (PieceMover): The piece mover under test.
+            simulator (Optional[RobotSimulator]): The simulator behind the piece mover. Defaults to None.
+            seed (Optional[int]): Seed of the random rearrangements. Defaults to a random seed.
+        """
+        self.mover = TimedPieceMover(mover)
+        self.simulator = simulator
+        self.board = PhysicalBoard(chess.Board())
+
+        self._rng = random.Random(seed)
+
+    def run_games(self, games: Iterable[chess.pgn.Game]) -> WorkloadReport:
+        """Replays the main line of every game, moving the pieces of both sides.
+
+        Args:
+            games (Iterable[chess.pgn.Game]): The games, starting from their setup position.
+
+        Returns:
+            WorkloadReport: The measurements, an item per game.
+        """
+
+        def play(game: chess.pgn.Game) -> bool:
+            self._set_position(game.board())
+            success = True
+            for move in game.mainline_moves():
+                moved = execute_move(self.mover, self.board, move, chess.WHITE)
+                self.board.chess_board.push(move)
+                # Failed moves are not retried, the next move starts from the expected position
+                if not moved:
+                    success = False
+                    self._set_position(self.board.chess_board)
+            return success
+
+        return self._run("games", games, play)
+
+    def run_resets(self, positions: Iterable[chess.BaseBoard]) -> WorkloadReport:
+        """Resets the board to the starting position from every position, then homes the arm.
+
+        Args:
+            positions (Iterable[chess.BaseBoard]): The positions to reset from, e.g. final
+                positions of games.
+
+        Returns:
+            WorkloadReport: The measurements, an item per reset.
+        """
+        resets = Histogram()
+
+        def reset(position: chess.BaseBoard) -> bool:
+            self._set_position(_board(position))
+            started = time.perf_counter()
+            success = self._rearrange(chess.BaseBoard()) and self.mover.reset()
+            resets.record(time.perf_counter() - started)
+            return success
+
+        return self._run("resets", positions, reset, resets)
+
+    def run_rearrangements(self, count: int) -> WorkloadReport:
+        """Rearranges the pieces of the starting position onto random squares, one after another.
+
+        Args:
+            count (int): Number of rearrangements.
+
+        Returns:
+            WorkloadReport: The measurements, an item per rearrangement.
+        """
+        self._set_position(chess.Board())
+
+        def rearrange(target: chess.BaseBoard) -> bool:
+            self._set_position(self.board.chess_board)
+            return self._rearrange(target)
+
+        return self._run("rearrangements", self._random_positions(count), rearrange)
+
+    def _run(self, name, items, execute, resets: Optional[Histogram] = None) -> WorkloadReport:
+        """Executes a workload item by item, measuring the mover and the simulator."""
+        self.mover.latency = Histogram()
+        self.mover.steps = 0
+        travel_distance = self.simulator.travel_distance if self.simulator else 0.0
+        arm_time = self.simulator.arm_time if self.simulator else 0.0
+
+        count = failures = 0
+        started = time.perf_counter()
+        for item in items:
+            count += 1
+            if not execute(item):
+                failures += 1
+                logger.warning(f"Benchmark {name} item {count} failed!")
+        wall_time = time.perf_counter() - started
+
+        return WorkloadReport(
+            name=name,
+            items=count,
+            failures=failures,
+            commands=self.mover.latency.count,
+            steps=self.mover.steps,
+            wall_time=wall_time,
+            latency=self.mover.latency,
+            resets=resets or Histogram(),
+            travel_distance=(
+                self.simulator.travel_distance - travel_distance if self.simulator else None
+            ),
+            arm_time=self.simulator.arm_time - arm_time if self.simulator else None,
+        )
+
+    def _rearrange(self, target: chess.BaseBoard) -> bool:
+        """Moves the pieces until the board matches the target, applying the steps done."""
+        expected = _board(target)
+        for _ in range(MAX_RESET_ROUNDS):
+            squares = plan_reset_board(self.board.chess_board, expected)
+            if not squares:
+                return True
+
+            steps = plan_steps(self.board, squares, chess.WHITE)
+            done = execute_plan(self.mover, self.board, steps, chess.WHITE)
+            for from_square, to_square in squares[:done]:
+                if from_square in chess.SQUARES:
+                    piece = self.board.chess_board.remove_piece_at(from_square)
+                else:
+                    piece = expected.piece_at(to_square)
+                if to_square in chess.SQUARES:
+                    self.board.chess_board.set_piece_at(to_square, piece)
+            if done < len(steps):
+                return False
+        return False
+
+    def _random_positions(self, count: int) -> Iterator[chess.BaseBoard]:
+        pieces = list(chess.BaseBoard().piece_map().values())
+        for _ in range(count):
+            squares = self._rng.sample(chess.SQUARES, len(pieces))
+            yield _position(zip(squares, pieces))
+
+    def _set_position(self, chess_board: chess.Board) -> None:
+        """Sets the benchmark's board and the simulator's virtual board to a position.
+
+        The simulator's off-board squares hold the pieces of the starting position missing from
+        the board, and a spare queen of each color for promotions.
+        """
+        self.board = PhysicalBoard(chess_board)
+        if not self.simulator:
+            return
+
+        self.simulator.set_chess_board(chess_board, chess.WHITE)
+        missing = list(chess.BaseBoard().piece_map().values())
+        for piece in chess_board.piece_map().values():
+            if piece in missing:
+                missing.remove(piece)
+        missing += [chess.Piece(chess.QUEEN, chess.WHITE), chess.Piece(chess.QUEEN, chess.BLACK)]
+        reserve: Dict[int, List[chess.Piece]] = {}
+        for piece in missing:
+            reserve.setdefault(off_board_square(piece.piece_type, piece.color), []).append(piece)
+        self.simulator.reserve = reserve
+
+
+def _board(chess_board: chess.BaseBoard) -> chess.Board:
+    board = chess.Board(None)
+    board.set_piece_map(chess_board.piece_map())
+    return board
+
+
+def _position(pieces: Iterable[Tuple[chess.Square, chess.Piece]]) -> chess.BaseBoard:
+    chess_board = chess.BaseBoard(None)
+    for square, piece in pieces:
+        chess_board.set_piece_at(square, piece)
+    return chess_board
+
+
+def read_games(path: str, limit: Optional[int] = None) -> List[chess.pgn.Game]:
+    """Reads the games of a PGN file.
+
+    Args:
+        path (str): The PGN file.
+        limit (Optional[int]): Largest number of games read. Defaults to all games.
+
+    Returns:
+        List[chess.pgn.Game]: The games in file order.
+    """
+    games = []
+    with open(path) as file:
+        while limit is None or len(games) < limit:
+            game = chess.pgn.read_game(file)
+            if game is None:
+                break
+            games.append(game)
+    return games
+
+
+def random_games(count: int, max_plies: int = 80, seed: Optional[int] = None) -> List[chess.pgn.Game]:
+    """Generates games of random legal moves, standing in for a PGN corpus.
+
+    Args:
+        count (int): Number of games.
+        max_plies (int): Largest number of half-moves of a game. Defaults to 80.
+        seed (Optional[int]): Seed of the moves. Defaults to a random seed.
+
+    Returns:
+        List[chess.pgn.Game]: The games.
+    """
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        chess_board = chess.Board()
+        while len(chess_board.move_stack) < max_plies and not chess_board.is_game_over():
+            chess_board.push(rng.choice(list(chess_board.legal_moves)))
+        games.append(chess.pgn.Game.from_board(chess_board))
+    return games
+
+
+def final_positions(games: Iterable[chess.pgn.Game]) -> List[chess.Board]:
+    """Returns the position at the end of the main line of every game.
+
+    Args:
+        games (Iterable[chess.pgn.Game]): The games.
+
+    Returns:
+        List[chess.Board]: The final positions.
+    """
+    return [game.end().board() for game in games]
+
+
+def format_report(reports: List[WorkloadReport]) -> str:
+    """Formats workload reports as a table.
+
+    Args:
+        reports (List[WorkloadReport]): The reports.
+
+    Returns:
+        str: A line per workload.
+    """
+    lines = [
+        f"{'workload':<16}{'items':>7}{'failed':>8}{'cmds':>7}{'cmd/s':>9}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'p99 ms':>9}{'travel m':>10}{'arm s':>9}{'wall s':>9}{'reset s':>9}"
+    ]
+    for report in reports:
+        summary = report.summary()
+        travel = "n/a" if report.travel_distance is None else f"{report.travel_distance:.2f}"
+        arm_time = "n/a" if report.arm_time is None else f"{report.arm_time:.1f}"
+        reset_time = f"{summary['reset_mean_s']:.3f}" if "reset_mean_s" in summary else "-"
+        lines.append(
+            f"{report.name:<16}{report.items:>7}{report.failures:>8}{report.commands:>7}"
+            f"{summary['commands_per_s']:>9.1f}{summary['p50_ms']:>9.2f}{summary['p95_ms']:>9.2f}"
+            f"{summary['p99_ms']:>9.2f}{travel:>10}{arm_time:>9}{report.wall_time:>9.2f}{reset_time:>9}"
+        )
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the robot communication path with scripted workloads."
+    )
+    parser.add_argument(
+        "--mover",
+        choices=["tcp", "async", "mock"],
+        default="tcp",
+        help="Piece mover under test, the TCP movers talk to a local robot simulator",
+    )
+    parser.add_argument("--pgn", type=str, default=None, help="PGN corpus of games to replay")
+    parser.add_argument(
+        "--games", type=int, default=10, help="Games replayed, random games without --pgn"
+    )
+    parser.add_argument(
+        "--resets", type=int, default=10, help="Board resets from final game positions"
+    )
+    parser.add_argument(
+        "--rearrangements", type=int, default=10, help="Random rearrangements of all pieces"
+    )
+    parser.add_argument(
+        "--time_scale",
+        type=float,
+        default=0.0,
+        help="Factor applied to the simulated arm time, 0 executes instantly",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Delay of every simulator response (seconds)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra delay of responses (seconds)"
+    )
+    parser.add_argument(
+        "--failure_rate", type=float, default=0.0, help="Probability of a failed grasp"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of games, rearrangements and faults")
+    parser.add_argument(
+        "--output", type=str, default=None, help="JSON file the summaries are written to"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_arguments()
+
+    simulator = None
+    if args.mover == "mock":
+        mover: PieceMover = SimulatedPieceMover()
+    else:
+        simulator = RobotSimulator(
+            faults=FaultInjection(
+                latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate
+            ),
+            time_scale=args.time_scale,
+            seed=args.seed,
+        )
+        simulator.start()
+        if args.mover == "async":
+            mover = AsyncTCPRobotHand("127.0.0.1", simulator.port)
+            mover.wait_connected(timeout=5)
+        else:
+            mover = TCPRobotHand("127.0.0.1", simulator.port)
+
+    if args.pgn:
+        games = read_games(args.pgn, max(args.games, args.resets))
+    else:
+        games = random_games(max(args.games, args.resets), seed=args.seed)
+
+    benchmark = RobotBenchmark(mover, simulator, seed=args.seed)
+    try:
+        reports = [
+            benchmark.run_games(games[: args.games]),
+            benchmark.run_resets(final_positions(games[: args.resets])),
+            benchmark.run_rearrangements(args.rearrangements),
+        ]
+    finally:
+        mover.close()
+        if simulator:
+            simulator.stop()
+
+    print(format_report(reports))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({report.name: report.summary() for report in reports}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import logging
+import math
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+import chess
+
+from src.core.board import (
+    OFFSET_SQUARE_CENTER,
+    BoardCapture,
+    PhysicalBoard,
+    PieceOffset,
+    flip_square,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ArmKinematics(NamedTuple):
+    """Point-to-point motion model of the robot arm.
+
+    Every motion follows a trapezoidal velocity profile: the arm accelerates to its maximum
+    speed, cruises and decelerates, or only accelerates and decelerates on short distances.
+    Squares are laid out in the robot's frame with a1 in the robot's bottom left corner, and
+    off-board squares in a column left of the board.
+
+    Attributes:
+        square_size (float): Side of a square (meters).
+        max_speed (float): Maximum speed of the gripper (meters per second).
+        acceleration (float): Acceleration and deceleration of the gripper (meters per second squared).
+        grip_time (float): Time to lower the gripper, grip or release a piece and lift it (seconds).
+    """
+
+    square_size: float = 0.05
+    max_speed: float = 0.5
+    acceleration: float = 1.5
+    grip_time: float = 0.6
+
+    def position(
+        self, square: int, offset: PieceOffset = OFFSET_SQUARE_CENTER
+    ) -> Tuple[float, float]:
+        """Returns the gripper position above a square.
+
+        Args:
+            square (int): The square in the robot's frame, negative for off-board squares.
+            offset (PieceOffset): The offset from the square's center. Defaults to the center.
+
+        Returns:
+            Tuple[float, float]: The x and y coordinates in meters.
+        """
+        if square in chess.SQUARES:
+            column, row = chess.square_file(square), chess.square_rank(square)
+        else:
+            column, row = -1.5, -square - 1
+
+        return (
+            (column + 0.5 + offset.x / 2) * self.square_size,
+            (row + 0.5 + offset.y / 2) * self.square_size,
+        )
+
+    def home(self) -> Tuple[float, float]:
+        """Returns the gripper's rest position, centered in front of the robot's first row.
+
+        Returns:
+            Tuple[float, float]: The x and y coordinates in meters.
+        """
+        return 4 * self.square_size, -self.square_size
+
+    def travel_time(
+        self, start: Tuple[float, float], end: Tuple[float, float]
+    ) -> float:
+        """Returns the time to move the gripper between two positions.
+
+        Args:
+            start (Tuple[float, float]): The start position in meters.
+            end (Tuple[float, float]): The end position in meters.
+
+        Returns:
+            float: The travel time in seconds.
+        """
+        distance = math.dist(start, end)
+        # Distance needed to reach the maximum speed and stop again
+        ramp_distance = self.max_speed**2 / self.acceleration
+        if distance < ramp_distance:
+            return 2 * math.sqrt(distance / self.acceleration)
+        return distance / self.max_speed + self.max_speed / self.acceleration
+
+
+class FaultInjection(NamedTuple):
+    """Network and hardware faults injected by the simulator.
+
+    Attributes:
+        latency (float): Delay before every response is sent (seconds).
+        jitter (float): Maximum random delay added to the latency (seconds). Responses on a
+            connection are still sent in order, like on a single TCP stream.
+        drop_rate (float): Probability that a response is never sent.
+        failure_rate (float): Probability that a grasp fails and the piece is not moved.
+        placement_bias (PieceOffset): Systematic offset of placed pieces from their target, in the
+            robot's perspective.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    failure_rate: float = 0.0
+    placement_bias: PieceOffset = OFFSET_SQUARE_CENTER
+
+
+class RobotSimulator:
+    """TCP server simulating the robot hand's controller with a virtual board.
+
+    Speaks the framed protocol of `TCPRobotHand`: "move", "plan", "prepare", "reset" and "ping" commands,
+    and "board" answered with the virtual board's FEN in the robot's frame. Commands are executed
+    in order on a single simulated arm, taking the time the arm's kinematics need, scaled by
+    `time_scale`. Once a command fails, the commands already queued behind it are aborted.
+
+    The virtual board is kept in the robot's frame, where squares are numbered from the robot's
+    bottom left corner, just like the squares of the commands.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on, assigned on `start` if 0.
+        kinematics (ArmKinematics): The motion model of the arm.
+        faults (FaultInjection): The injected faults.
+        time_scale (float): Factor applied to the simulated arm time, 0.0 executes instantly.
+        board (chess.BaseBoard): The virtual board in the robot's frame.
+        offsets (Dict[chess.Square, PieceOffset]): Offsets of the pieces the arm placed, in the robot's
+            frame and perspective. Other pieces stand in the center of their squares.
+        reserve (Dict[int, List[chess.Piece]]): Pieces stacked on the off-board squares.
+        command_count (int): Number of executed commands.
+        travel_distance (float): Total distance traveled by the gripper (meters).
+        arm_time (float): Total simulated time the arm was moving (seconds), regardless of `time_scale`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chess_board: Optional[chess.BaseBoard] = None,
+        robot_color: chess.Color = chess.WHITE,
+        kinematics: ArmKinematics = ArmKinematics(),
+        faults: FaultInjection = FaultInjection(),
+        time_scale: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initializes the simulator. The server is not started until `start` is called.
+
+        Args:
+            host (str): The address to listen on. Defaults to localhost.
+            port (int): The port to listen on. Defaults to any free port.
+            chess_board (Optional[chess.BaseBoard]): The initial pieces, in white perspective. Defaults
+                to the starting position.
+            robot_color (chess.Color): The color the robot plays in the initial position.
+            kinematics (ArmKinematics): The motion model of the arm. Defaults to `ArmKinematics()`.
+            faults (FaultInjection): The injected faults. Defaults to none.
+            time_scale (float): Factor applied to the simulated arm time. Defaults to real time.
+            seed (Optional[int]): Seed of the fault injection. Defaults to a random seed.
+        """
+        self.host = host
+        self.port = port
+        self.kinematics = kinematics
+        self.faults = faults
+        self.time_scale = time_scale
+
+        self.board = chess.BaseBoard(None)
+        self.set_chess_board(
+            chess_board if chess_board is not None else chess.BaseBoard(), robot_color
+        )
+        self.reserve: Dict[int, List[chess.Piece]] = {}
+
+        self.command_count = 0
+        self.travel_distance = 0.0
+        self.arm_time = 0.0
+
+        self._rng = random.Random(seed)
+        self._position = kinematics.home()
+        self._arm_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # Responses waiting to be sent on every connection, oldest first, and when the last is sent
+        self._pending: Dict[asyncio.StreamWriter, Deque[bytes]] = {}
+        self._send_at: Dict[asyncio.StreamWriter, float] = {}
+
+    def set_chess_board(
+        self, chess_board: chess.BaseBoard, robot_color: chess.Color
+    ) -> None:
+        """Replaces the pieces on the virtual board.
+
+        Args:
+            chess_board (chess.BaseBoard): The pieces, in white perspective.
+            robot_color (chess.Color): The color the robot plays.
+        """
+        self.board = chess.BaseBoard(None)
+        self.offsets: Dict[chess.Square, PieceOffset] = {}
+        for square, piece in chess_board.piece_map().items():
+            robot_square = square if robot_color == chess.WHITE else flip_square(square)
+            self.board.set_piece_at(robot_square, piece)
+
+    def chess_board(self, robot_color: chess.Color) -> chess.Board:
+        """Returns the virtual board as seen by a game.
+
+        Args:
+            robot_color (chess.Color): The color the robot plays.
+
+        Returns:
+            chess.Board: The pieces on the virtual board, in white perspective.
+        """
+        chess_board = chess.Board(None)
+        for square, piece in self.board.piece_map().items():
+            game_square = square if robot_color == chess.WHITE else flip_square(square)
+            chess_board.set_piece_at(game_square, piece)
+        return chess_board
+
+    def physical_board(self, robot_color: chess.Color) -> PhysicalBoard:
+        """Returns the virtual board and the offsets of its pieces as seen by a game.
+
+        Args:
+            robot_color (chess.Color): The color the robot plays.
+
+        Returns:
+            PhysicalBoard: The pieces and their offsets on the virtual board, in white perspective.
+        """
+        board = PhysicalBoard(self.chess_board(robot_color))
+        for square, offset in self.offsets.items():
+            game_square = square if robot_color == chess.WHITE else flip_square(square)
+            board.set_piece_offset(game_square, robot_color, offset)
+        return board
+
+    def start(self) -> int:
+        """Starts serving on an event loop thread of its own.
+
+        Returns:
+            int: The port the server listens on.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="robot simulator", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_server(), self._loop).result()
+        logger.info(f"Robot simulator listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        """Stops the server and its event loop thread."""
+        if self._loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._stop_server(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def serve_forever(self) -> None:
+        """Serves on the running event loop until cancelled."""
+        await self._start_server()
+        logger.info(f"Robot simulator listening on {self.host}:{self.port}")
+        await self._server.serve_forever()
+
+    async def _start_server(self) -> None:
+        self._arm_lock = asyncio.Lock()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _stop_server(self) -> None:
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue()
+        worker = asyncio.create_task(self._execute_queue(queue, writer))
+        try:
+            while line := await reader.readline():
+                request_id, _, command = line.decode("utf-8").strip().partition(" ")
+                queue.put_nowait((request_id, command))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            worker.cancel()
+            self._pending.pop(writer, None)
+            self._send_at.pop(writer, None)
+            writer.close()
+
+    async def _execute_queue(
+        self, queue: "asyncio.Queue[Tuple[str, str]]", writer: asyncio.StreamWriter
+    ) -> None:
+        while True:
+            request_id, command = await queue.get()
+            async with self._arm_lock:
+                success = await self._execute(request_id, command, writer)
+
+            if not success:
+                while not queue.empty():
+                    aborted_id, _ = queue.get_nowait()
+                    self._respond(writer, aborted_id, "aborted")
+
+    async def _execute(
+        self, request_id: str, command: str, writer: asyncio.StreamWriter
+    ) -> bool:
+        name, _, arguments = command.partition(" ")
+        self.command_count += 1
+
+        if name == "ping":
+            success = True
+        elif name == "board":
+            self._respond(writer, request_id, f"board {self.board.board_fen()}")
+            return True
+        elif name == "reset":
+            success = await self._travel(self.kinematics.home())
+        elif name == "move":
+            success = await self._move(arguments)
+        elif name == "prepare":
+            success = await self._prepare(arguments)
+        elif name == "plan":
+            success = True
+            for index, step in enumerate(arguments.split(";")):
+                success = await self._move(step)
+                status = "success" if success else "failure"
+                self._respond(writer, request_id, f"step {index} {status}")
+                if not success:
+                    break
+        else:
+            logger.warning(f"Unknown simulator command: {command}")
+            success = False
+
+        self._respond(writer, request_id, "success" if success else "failure")
+        return success
+
+    async def _move(self, arguments: str) -> bool:
+        try:
+            values = list(map(int, arguments.split()))
+            from_square, offset_x, offset_y, to_square = values[:4]
+            target_x, target_y = values[4:] if len(values) > 4 else (0, 0)
+        except ValueError:
+            logger.warning(f"Malformed simulator move: {arguments}")
+            return False
+
+        offset = PieceOffset(offset_x / 100, offset_y / 100)
+        target_offset = PieceOffset(target_x / 100, target_y / 100)
+        await self._travel(self.kinematics.position(from_square, offset))
+        await self._sleep(self.kinematics.grip_time)
+
+        if from_square in chess.SQUARES:
+            piece = self.board.piece_at(from_square)
+        else:
+            stack = self.reserve.get(from_square)
+            piece = stack[-1] if stack else None
+        if piece is None or self._rng.random() < self.faults.failure_rate:
+            return False
+        if to_square in chess.SQUARES and self.board.piece_at(to_square) is not None:
+            return False
+
+        if from_square in chess.SQUARES:
+            self.board.remove_piece_at(from_square)
+            self.offsets.pop(from_square, None)
+        else:
+            self.reserve[from_square].pop()
+
+        await self._travel(self.kinematics.position(to_square, target_offset))
+        await self._sleep(self.kinematics.grip_time)
+
+        if to_square in chess.SQUARES:
+            self.board.set_piece_at(to_square, piece)
+            bias = self.faults.placement_bias
+            self.offsets[to_square] = PieceOffset(
+                max(min(target_offset.x + bias.x, 1.0), -1.0),
+                max(min(target_offset.y + bias.y, 1.0), -1.0),
+            )
+        else:
+            self.reserve.setdefault(to_square, []).append(piece)
+        return True
+
+    async def _prepare(self, arguments: str) -> bool:
+        try:
+            square = int(arguments)
+        except ValueError:
+            logger.warning(f"Malformed simulator prepare: {arguments}")
+            return False
+
+        # Waits at the robot's edge of the board, in line with the square
+        x, _ = self.kinematics.position(square)
+        _, y = self.kinematics.home()
+        return await self._travel((x, y))
+
+    async def _travel(self, position: Tuple[float, float]) -> bool:
+        self.travel_distance += math.dist(self._position, position)
+        duration = self.kinematics.travel_time(self._position, position)
+        self._position = position
+        await self._sleep(duration)
+        return True
+
+    async def _sleep(self, duration: float) -> None:
+        self.arm_time += duration
+        if self.time_scale > 0:
+            await asyncio.sleep(duration * self.time_scale)
+
+    def _respond(self, writer: asyncio.StreamWriter, request_id: str, status: str) -> None:
+        if self._rng.random() < self.faults.drop_rate:
+            logger.debug(f"Dropping simulator response {request_id}: {status}")
+            return
+
+        loop = asyncio.get_running_loop()
+        delay = self.faults.latency + self._rng.uniform(0, self.faults.jitter)
+        send_at = max(self._send_at.get(writer, 0.0), loop.time() + delay)
+        self._send_at[writer] = send_at
+        self._pending.setdefault(writer, deque()).append(
+            f"{request_id} {status}\n".encode("utf-8")
+        )
+        # Every call writes the oldest pending response, as timers due together may run in any order
+        if send_at > loop.time():
+            loop.call_at(send_at, self._write_next, writer)
+        else:
+            self._write_next(writer)
+
+    def _write_next(self, writer: asyncio.StreamWriter) -> None:
+        pending = self._pending.get(writer)
+        if pending and not writer.is_closing():
+            writer.write(pending.popleft())
+
+
+class SimulatorBoardCapture(BoardCapture):
+    """Captures the virtual board of a `RobotSimulator` instead of a camera image.
+
+    Attributes:
+        simulator (RobotSimulator): The simulator whose virtual board is captured.
+    """
+
+    def __init__(self, simulator: RobotSimulator) -> None:
+        """Initializes the capture.
+
+        Args:
+            simulator (RobotSimulator): The simulator whose virtual board is captured.
+        """
+        self.simulator = simulator
+
+    def capture_board(self, human_color: chess.Color) -> Optional[PhysicalBoard]:
+        """Returns the virtual board, with the offsets of the pieces the arm placed.
+
+        Args:
+            human_color (chess.Color): The color the human player controls, the robot plays the other.
+
+        Returns:
+            Optional[PhysicalBoard]: The virtual board in white perspective.
+        """
+        return self.simulator.physical_board(not human_color)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulate the robot hand's controller on a TCP port."
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=6001, help="Port to listen on")
+    parser.add_argument(
+        "--time_scale",
+        type=float,
+        default=1.0,
+        help="Factor applied to the simulated arm time, 0 executes instantly",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Delay of every response (seconds)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra delay of responses (seconds)"
+    )
+    parser.add_argument(
+        "--drop_rate", type=float, default=0.0, help="Probability of dropping a response"
+    )
+    parser.add_argument(
+        "--failure_rate", type=float, default=0.0, help="Probability of a failed grasp"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Fault injection seed")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    simulator = RobotSimulator(
+        host=args.host,
+        port=args.port,
+        faults=FaultInjection(
+            latency=args.latency,
+            jitter=args.jitter,
+            drop_rate=args.drop_rate,
+            failure_rate=args.failure_rate,
+        ),
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(simulator.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Stopping robot simulator")
+
+
+if __name__ == "__main__":
+    main()
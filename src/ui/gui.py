@@ -10,10 +10,12 @@ import cairosvg
 from typing import Union
 
 from src.core.game import Player, Game
+from src.core.game_loop import GameLoop, LoopState
 
 logger = logging.getLogger(__name__)
 
 game_thread: Union[threading.Thread, None] = None
+game_loop: Union[GameLoop, None] = None
 
 
 def update_robot_win_count() -> None:
@@ -157,34 +159,29 @@ def chess_engine_thread() -> None:
     frame = tk.Frame(root, bd=0, background="#FFFFFF")
     frame.place(x=screen_width/3, y=screen_height/4, width=1000, height=640)
     svg_board(frame)
-    while True:
-        state = game.result()
-        root.after(0, update_turn)
-
-        if state == "resigned":
-            logger.info("Player resigned, stopping game")
-            update_robot_win_count()
-            return level_screen()
-        elif state != "*":
-            logger.info("Game over")
-            return show_game_result()
-
-        valid_move = None
-        if game.current_player == Player.ROBOT:
-            valid_move = game.robot_makes_move()
-            if valid_move:
-                svg_board(frame)
-            if game.get_chess_board().is_check():
-                show_check_msg(frame)
-        elif game.current_player == Player.HUMAN:
-            move, valid = game.human_made_move()
-            if move and valid:
-                svg_board(frame)
-            elif move and not valid:
-                show_wrong_move_msg(frame=frame)
-            
-            if game.get_chess_board().is_check():
-                show_check_msg(frame)
+
+    def on_move(move: chess.Move, valid: bool) -> None:
+        if valid:
+            svg_board(frame)
+        else:
+            show_wrong_move_msg(frame=frame)
+
+        if game.get_chess_board().is_check():
+            show_check_msg(frame)
+
+    def on_state(state: LoopState) -> None:
+        if state != LoopState.GAME_OVER:
+            root.after(0, update_turn)
+
+    state = game_loop.run(on_move=on_move, on_state=on_state)
+
+    if state == "resigned":
+        logger.info("Player resigned, stopping game")
+        update_robot_win_count()
+        return level_screen()
+    elif state != "*":
+        logger.info("Game over")
+        return show_game_result()
 
 
 def select_level(level: str) -> None:
@@ -204,6 +201,7 @@ def select_level(level: str) -> None:
         game.set_depth(6)
         game.set_skill_level(20)
         game.set_thinking_time(1.0)
+    game.set_pondering(level in ("advanced", "hard"))
     color_screen()
 
 
@@ -341,6 +339,12 @@ def update_turn() -> None:
         user_label.image = your_turn_active
 
 
+def resign() -> None:
+    game.resign_human()
+    if game_loop is not None:
+        game_loop.notify()
+
+
 def game_screen() -> None:
     clear_screen()
 
@@ -385,16 +389,19 @@ def game_screen() -> None:
         frame=frame,
         x=20,
         y=400,
-        func=game.resign_human,
+        func=resign,
         resize_height=100,
     )
 
-    global game_thread
+    global game_thread, game_loop
+    game_loop = GameLoop(game)
     game_thread = threading.Thread(target=chess_engine_thread)
     game_thread.start()
 
 
-def gui_main(game_obj: Game, fullscreen: bool = True, splash: bool = True):
+def gui_main(
+    game_obj: Game, fullscreen: bool = True, splash: bool = True, resume: bool = False
+):
     global root, game
     game = game_obj
 
@@ -410,6 +417,9 @@ def gui_main(game_obj: Game, fullscreen: bool = True, splash: bool = True):
     root.update_idletasks()
 
     background()
-    level_screen()
+    if resume:
+        game_screen()
+    else:
+        level_screen()
 
     root.mainloop()
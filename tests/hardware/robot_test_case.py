@@ -1,37 +1,51 @@
+import os
 import unittest
 
-from ultralytics import YOLO
 from src.communication.tcp_robot import TCPRobotHand
-from src.core.board import PhysicalBoard, are_boards_equal
+from src.core.board import PhysicalBoard, changed_squares, format_squares
 from src.core.moves import move_piece, iter_reset_board
-from src.detection.basler_camera import (
-    CameraBoardCapture,
-    Orientation,
-)
+from src.mocks.robot_simulator import RobotSimulator, SimulatorBoardCapture
 import chess
 from typing import Union
 from abc import ABC
 import logging
 
-CAMERA_ORIENTATION = Orientation.HUMAN_BOTTOM
 MODEL_PATH = "training/models/yolo8_200.pt"
 MAX_PIECE_OFFSET = 0.99
 
+# Set to run the hardware tests against the robot simulator instead of the real robot
+USE_SIMULATOR = bool(os.environ.get("ROBOT_SIMULATOR"))
+SIMULATOR_TIME_SCALE = float(os.environ.get("ROBOT_SIMULATOR_TIME_SCALE", "0"))
+
 logging.getLogger("ultralytics").setLevel(logging.CRITICAL)
 
 
 class RobotTestCase(unittest.TestCase, ABC):
     def setUp(self) -> None:
-        self.board_capture = CameraBoardCapture(
-            model=YOLO(MODEL_PATH),
-            physical_orientation=CAMERA_ORIENTATION,
-            conf_threshold=0.5,
-            iou_threshold=0.45,
-            max_piece_offset=MAX_PIECE_OFFSET,
-            timeout=5000,
-        )
+        if USE_SIMULATOR:
+            # Pieces set up for the first game, with the robot playing black
+            simulator = RobotSimulator(
+                robot_color=chess.BLACK, time_scale=SIMULATOR_TIME_SCALE
+            )
+            simulator.start()
+            self.addCleanup(simulator.stop)
+
+            self.board_capture = SimulatorBoardCapture(simulator)
+            self.robot_hand = TCPRobotHand(ip="127.0.0.1", port=simulator.port)
+        else:
+            from ultralytics import YOLO
+            from src.detection.basler_camera import CameraBoardCapture, Orientation
+
+            self.board_capture = CameraBoardCapture(
+                model=YOLO(MODEL_PATH),
+                physical_orientation=Orientation.HUMAN_BOTTOM,
+                conf_threshold=0.5,
+                iou_threshold=0.45,
+                max_piece_offset=MAX_PIECE_OFFSET,
+                timeout=5000,
+            )
+            self.robot_hand = TCPRobotHand()
 
-        self.robot_hand = TCPRobotHand()
         self.human_color = chess.WHITE
         self.robot_color = not self.human_color
         self.chess_board = chess.Board()
@@ -62,9 +76,11 @@ class RobotTestCase(unittest.TestCase, ABC):
         self.assertTrue(done, "Function sync board failed")
 
         captured_board = self.capture_board(human_color)
-        self.assertTrue(
-            are_boards_equal(captured_board.chess_board, expected_board),
-            "Boards do not match after board rearrangement",
+        changed = changed_squares(captured_board.chess_board, expected_board)
+        self.assertEqual(
+            changed,
+            chess.BB_EMPTY,
+            f"Boards do not match after board rearrangement on squares {format_squares(changed)}",
         )
 
         self.chess_board = expected_board.copy()
@@ -83,9 +99,11 @@ class RobotTestCase(unittest.TestCase, ABC):
             to_square = chess.parse_square(to_square)
 
         captured_board = self.capture_board(self.human_color)
-        self.assertTrue(
-            are_boards_equal(captured_board.chess_board, self.chess_board),
-            "Board arrangement in memory does not match physical board arrangement",
+        changed = changed_squares(captured_board.chess_board, self.chess_board)
+        self.assertEqual(
+            changed,
+            chess.BB_EMPTY,
+            f"Board arrangement in memory does not match physical board arrangement on squares {format_squares(changed)}",
         )
 
         origin_piece = (
@@ -109,9 +127,11 @@ class RobotTestCase(unittest.TestCase, ABC):
         self.assertTrue(done, "Function move piece failed")
 
         captured_board = self.capture_board(self.human_color)
-        self.assertTrue(
-            are_boards_equal(captured_board.chess_board, expected_chess_board),
-            "Boards do not match after move",
+        changed = changed_squares(captured_board.chess_board, expected_chess_board)
+        self.assertEqual(
+            changed,
+            chess.BB_EMPTY,
+            f"Boards do not match after move on squares {format_squares(changed)}",
         )
 
         if from_square in chess.SQUARES:
@@ -0,0 +1,157 @@
+import time
+import unittest
+
+import chess
+
+from src.communication.arm_pool import Arm, MultiArmPieceMover, parse_arm_address
+from src.core.board import PieceOffset
+from src.core.moves import MoveStep, PieceMover
+
+
+class RecordingArm(PieceMover):
+    def __init__(self, duration: float = 0.05, fail_square: int = -100) -> None:
+        self.duration = duration
+        self.fail_square = fail_square
+        self.moves = []
+        self.intervals = []
+        self.prepared = []
+        self.closed = False
+
+    def move_piece(self, from_square, to_square, color, origin_offset) -> bool:
+        started = time.monotonic()
+        time.sleep(self.duration)
+        self.moves.append((from_square, to_square))
+        self.intervals.append((started, time.monotonic()))
+        return from_square != self.fail_square
+
+    def prepare(self, square, color) -> bool:
+        self.prepared.append(square)
+        return True
+
+    def reset(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def step(from_square: int, to_square: int) -> MoveStep:
+    return MoveStep(from_square, to_square, PieceOffset(0, 0))
+
+
+def overlapping(first, second) -> bool:
+    return first[0] < second[1] and second[0] < first[1]
+
+
+class TestMultiArmPieceMover(unittest.TestCase):
+    def setUp(self):
+        self.left = RecordingArm()
+        self.right = RecordingArm()
+        left_half = chess.BB_FILE_A | chess.BB_FILE_B | chess.BB_FILE_C | chess.BB_FILE_D
+        self.mover = MultiArmPieceMover(
+            [
+                Arm(self.left, reach=left_half, home=chess.A1),
+                Arm(self.right, reach=chess.BB_ALL & ~left_half, home=chess.H1),
+            ]
+        )
+        self.addCleanup(self.mover.close)
+
+    def test_assigns_by_reach(self):
+        self.assertTrue(self.mover.move_piece(chess.G1, chess.F3, chess.WHITE, PieceOffset(0, 0)))
+        # Flipped into the robot's frame for black
+        self.assertTrue(self.mover.move_piece(chess.G8, chess.F6, chess.BLACK, PieceOffset(0, 0)))
+        self.assertEqual(self.right.moves, [(chess.G1, chess.F3)])
+        self.assertEqual(self.left.moves, [(chess.G8, chess.F6)])
+
+    def test_unreachable(self):
+        self.assertFalse(self.mover.move_piece(chess.A1, chess.H8, chess.WHITE, PieceOffset(0, 0)))
+
+    def test_parallel_steps(self):
+        progress = []
+        completed = self.mover.plan(
+            [step(chess.B1, chess.C3), step(chess.G1, chess.F3)],
+            chess.WHITE,
+            lambda index, success: progress.append((index, success)),
+        )
+        self.assertEqual(completed, 2)
+        self.assertEqual(sorted(progress), [(0, True), (1, True)])
+        self.assertTrue(overlapping(self.left.intervals[0], self.right.intervals[0]))
+
+    def test_collision_zone_serializes(self):
+        # D2 -> D4 and E2 -> E4 are next to each other, D1 -> D2 and E7 -> E5 are far apart
+        self.mover.plan([step(chess.D2, chess.D4), step(chess.E2, chess.E4)], chess.WHITE)
+        self.assertFalse(overlapping(self.left.intervals[0], self.right.intervals[0]))
+
+        self.mover.reset()
+        self.mover.plan([step(chess.B1, chess.B2), step(chess.G7, chess.G5)], chess.WHITE)
+        self.assertTrue(overlapping(self.left.intervals[1], self.right.intervals[1]))
+
+    def test_approach_path_in_zone(self):
+        # The right arm crosses the board from h1 to pick up at e7 while the left arm works at d2
+        self.mover.plan([step(chess.D1, chess.D2), step(chess.E7, chess.E5)], chess.WHITE)
+        self.assertFalse(overlapping(self.left.intervals[0], self.right.intervals[0]))
+
+    def test_parked_arm_moves_out_of_the_way(self):
+        both = RecordingArm()
+        parked = RecordingArm()
+        mover = MultiArmPieceMover(
+            [Arm(both, home=chess.A1), Arm(parked, reach=chess.BB_FILE_E, home=chess.E1)]
+        )
+        self.addCleanup(mover.close)
+
+        self.assertEqual(mover.plan([step(chess.E2, chess.E4)], chess.WHITE), 1)
+        self.assertEqual(parked.moves, [(chess.E2, chess.E4)])
+        # The arm that stayed over e4 is in the way of the other arm
+        self.assertEqual(mover.plan([step(chess.D2, chess.F6)], chess.WHITE), 1)
+        self.assertEqual(parked.prepared, [chess.E1])
+        self.assertLess(parked.intervals[0][1], both.intervals[0][0])
+
+    def test_prepare_moves_arm(self):
+        left, right = RecordingArm(), RecordingArm()
+        mover = MultiArmPieceMover([Arm(left, home=chess.A1), Arm(right, home=chess.H1)])
+        self.addCleanup(mover.close)
+
+        self.assertTrue(mover.prepare(chess.D8, chess.WHITE))
+        self.assertEqual(left.prepared, [chess.D8])
+        # The left arm waits in line with d8 now, closer to e8 than the right arm at h1
+        self.assertTrue(mover.move_piece(chess.E8, chess.E7, chess.WHITE, PieceOffset(0, 0)))
+        self.assertEqual(left.moves, [(chess.E8, chess.E7)])
+
+    def test_close_closes_arms(self):
+        self.mover.close()
+        self.assertTrue(self.left.closed and self.right.closed)
+
+    def test_dependent_steps_wait(self):
+        both = Arm(RecordingArm())
+        mover = MultiArmPieceMover([both, Arm(RecordingArm())], clearance=0)
+        self.addCleanup(mover.close)
+
+        # The capture must clear e4 before the piece lands there
+        mover.plan([step(chess.E4, -6), step(chess.A8, chess.E4)], chess.WHITE)
+        intervals = both.mover.intervals + mover.arms[1].mover.intervals
+        self.assertEqual(len(intervals), 2)
+        self.assertFalse(overlapping(*intervals))
+
+    def test_stops_after_failure(self):
+        self.left.fail_square = chess.B1
+        completed = self.mover.plan(
+            [step(chess.B1, chess.C3), step(chess.B2, chess.B3), step(chess.G1, chess.F3)],
+            chess.WHITE,
+        )
+        self.assertEqual(completed, 0)
+        self.assertNotIn((chess.B2, chess.B3), self.left.moves)
+
+
+class TestParseArmAddress(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            parse_arm_address("192.168.1.6:6001:e-h"),
+            ("192.168.1.6", 6001, chess.BB_FILE_E | chess.BB_FILE_F | chess.BB_FILE_G | chess.BB_FILE_H),
+        )
+        self.assertEqual(parse_arm_address("192.168.1.6:6001"), ("192.168.1.6", 6001, chess.BB_ALL))
+        with self.assertRaises(ValueError):
+            parse_arm_address("192.168.1.6:6001:a-k")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import socket
+import threading
+import time
+import unittest
+
+import chess
+
+from src.communication.async_tcp_robot import AsyncTCPRobotHand, ConnectionState
+from src.core.board import PieceOffset
+from src.core.moves import MoveStep
+from tests.software.test_tcp_robot import FramedRobotServer
+
+
+class SilentRobotServer:
+    """Robot controller accepting connections without ever answering."""
+
+    def __init__(self) -> None:
+        self.connections = []
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+
+    def close(self) -> None:
+        self.server.close()
+        for connection in self.connections:
+            connection.close()
+
+
+class NoisyRobotServer:
+    """Robot controller sending a malformed frame before every response."""
+
+    def __init__(self) -> None:
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self) -> None:
+        connection, _ = self.server.accept()
+        with connection, connection.makefile("rb") as lines:
+            for line in lines:
+                request_id = line.split(b" ", 1)[0]
+                connection.sendall(b"garbage frame\n" + request_id + b" success\n")
+
+    def close(self) -> None:
+        self.server.close()
+
+
+class TestAsyncTCPRobotHand(unittest.TestCase):
+    def create_hand(self, port: int, **kwargs) -> AsyncTCPRobotHand:
+        robot_hand = AsyncTCPRobotHand(
+            ip="127.0.0.1", port=port, min_backoff=0.05, max_backoff=0.1, **kwargs
+        )
+        self.addCleanup(robot_hand.close)
+        return robot_hand
+
+    def test_commands(self):
+        server = FramedRobotServer()
+        self.addCleanup(server.close)
+        robot_hand = self.create_hand(server.port)
+
+        self.assertTrue(robot_hand.wait_connected(5))
+        self.assertTrue(robot_hand.reset())
+        steps = [MoveStep(12, 28, PieceOffset(0, 0)), MoveStep(52, 36, PieceOffset(0, 0))]
+        progress = []
+        completed = robot_hand.plan(
+            steps, chess.WHITE, lambda index, success: progress.append((index, success))
+        )
+
+        self.assertEqual(completed, 2)
+        self.assertEqual(progress, [(0, True), (1, True)])
+        self.assertEqual(server.commands, ["reset", "move 12 0 0 28", "move 52 0 0 36"])
+
+    def test_malformed_frames_skipped(self):
+        server = NoisyRobotServer()
+        self.addCleanup(server.close)
+        robot_hand = self.create_hand(server.port)
+
+        self.assertTrue(robot_hand.wait_connected(5))
+        self.assertTrue(robot_hand.reset())
+        self.assertTrue(robot_hand.reset())
+        self.assertTrue(robot_hand.connected)
+
+    def test_disconnected_fails_fast(self):
+        listener = socket.create_server(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        listener.close()
+        robot_hand = self.create_hand(port)
+
+        started = time.monotonic()
+        self.assertFalse(robot_hand.reset())
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(robot_hand.connected)
+
+    def test_command_deadline(self):
+        server = SilentRobotServer()
+        self.addCleanup(server.close)
+        robot_hand = self.create_hand(
+            server.port, command_timeout=0.1, heartbeat_interval=60
+        )
+
+        self.assertTrue(robot_hand.wait_connected(5))
+        self.assertFalse(robot_hand.reset())
+
+    def test_missed_heartbeat_reconnects(self):
+        server = SilentRobotServer()
+        self.addCleanup(server.close)
+        states = []
+        robot_hand = self.create_hand(
+            server.port,
+            heartbeat_interval=0.05,
+            heartbeat_timeout=0.05,
+            on_state_change=states.append,
+        )
+
+        deadline = time.monotonic() + 5
+        while len(server.connections) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertGreaterEqual(len(server.connections), 2)
+        self.assertIn(ConnectionState.DISCONNECTED, states)
+
+
+if __name__ == "__main__":
+    unittest.main()
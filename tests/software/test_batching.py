@@ -0,0 +1,108 @@
+import threading
+import unittest
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from src.detection.batching import DetectionServer
+except ImportError:  # The detection dependencies, e.g. OpenCV and ultralytics, are not installed
+    DetectionServer = None
+
+
+class FakeResult:
+    boxes = None
+
+
+class FakeModel:
+    names = {0: "white-pawn"}
+
+    def __init__(self, gate: Optional[threading.Event] = None) -> None:
+        self.gate = gate
+        self.error: Optional[Exception] = None
+        # Size and thresholds of every forward pass
+        self.calls: List[tuple] = []
+
+    def predict(self, images, conf: float, iou: float):
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        self.calls.append((len(images), conf, iou))
+        if self.error is not None:
+            raise self.error
+        return [FakeResult() for _ in images]
+
+
+def image() -> np.ndarray:
+    return np.zeros((8, 8), dtype=np.uint8)
+
+
+@unittest.skipIf(DetectionServer is None, "detection dependencies not installed")
+class TestDetectionServer(unittest.TestCase):
+    def start(self, model: FakeModel, **kwargs) -> "DetectionServer":
+        server = DetectionServer(model, **kwargs)
+        self.addCleanup(server.close)
+        return server
+
+    def test_batches_up_to_max_size(self):
+        model = FakeModel()
+        server = self.start(model, max_batch_size=3, max_delay=0.5)
+
+        futures = [server.submit(image()) for _ in range(7)]
+        for future in futures:
+            self.assertEqual(future.result(timeout=5).labels, [])
+        self.assertEqual([size for size, _, _ in model.calls], [3, 3, 1])
+        self.assertEqual(server.request_count, 7)
+
+    def test_partial_batch_flushed_after_max_delay(self):
+        model = FakeModel()
+        server = self.start(model, max_batch_size=8, max_delay=0.05)
+
+        futures = [server.submit(image()) for _ in range(2)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(model.calls, [(2, 0.5, 0.45)])
+
+    def test_groups_by_thresholds(self):
+        model = FakeModel()
+        server = self.start(model, max_batch_size=8, max_delay=0.2)
+
+        futures = [
+            server.submit(image()),
+            server.submit(image(), conf_threshold=0.3),
+            server.submit(image()),
+        ]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(sorted(model.calls), [(1, 0.3, 0.45), (2, 0.5, 0.45)])
+        self.assertEqual(server.batch_count, 2)
+
+    def test_model_error_reaches_every_future(self):
+        model = FakeModel()
+        model.error = RuntimeError("forward pass failed")
+        server = self.start(model, max_batch_size=8, max_delay=0.2)
+
+        futures = [server.submit(image()) for _ in range(3)]
+        for future in futures:
+            self.assertIs(future.exception(timeout=5), model.error)
+        self.assertEqual(len(model.calls), 1)
+
+    def test_close_drains_queue(self):
+        gate = threading.Event()
+        model = FakeModel(gate)
+        server = self.start(model, max_batch_size=1, max_delay=0.0)
+
+        futures = [server.submit(image()) for _ in range(3)]
+        closing = threading.Thread(target=server.close)
+        closing.start()
+        gate.set()
+        closing.join(timeout=5)
+
+        self.assertFalse(closing.is_alive())
+        for future in futures:
+            self.assertEqual(future.result(timeout=0).labels, [])
+        with self.assertRaises(RuntimeError):
+            server.submit(image())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import chess
+
+from src.core.board import PhysicalBoard, are_boards_equal, changed_squares
+from src.core.moves import iter_reset_board, plan_reset_board
+from src.mocks.piece_mover import SimulatedPieceMover
+
+
+class TestChangedSquares(unittest.TestCase):
+    def test_equal_boards(self):
+        board = chess.Board()
+        self.assertEqual(changed_squares(board, chess.Board()), chess.BB_EMPTY)
+        self.assertTrue(are_boards_equal(board, chess.Board()))
+
+    def test_ignores_game_state(self):
+        board = chess.Board()
+        other = chess.Board()
+        other.turn = chess.BLACK
+        other.castling_rights = chess.BB_EMPTY
+        self.assertTrue(are_boards_equal(board, other))
+
+    def test_moved_piece(self):
+        board = chess.Board()
+        after = board.copy()
+        after.push_uci("e2e4")
+        self.assertEqual(changed_squares(board, after), chess.BB_E2 | chess.BB_E4)
+        self.assertFalse(are_boards_equal(board, after))
+
+    def test_replaced_piece_same_color(self):
+        board = chess.Board()
+        other = board.copy()
+        other.set_piece_at(chess.D1, chess.Piece(chess.KING, chess.WHITE))
+        self.assertEqual(changed_squares(board, other), chess.BB_D1)
+
+    def test_replaced_piece_other_color(self):
+        board = chess.Board()
+        other = board.copy()
+        other.set_piece_at(chess.D1, chess.Piece(chess.QUEEN, chess.BLACK))
+        self.assertEqual(changed_squares(board, other), chess.BB_D1)
+
+
+class RecordingPieceMover(SimulatedPieceMover):
+    def __init__(self):
+        self.moves = []
+
+    def move_piece(self, from_square, to_square, color, origin_offset):
+        self.moves.append((from_square, to_square))
+        return True
+
+
+class TestIterResetBoard(unittest.TestCase):
+    def test_matching_board_is_done(self):
+        mover = RecordingPieceMover()
+        moved, done = iter_reset_board(
+            mover, PhysicalBoard(), PhysicalBoard(), chess.BLACK
+        )
+        self.assertEqual((moved, done), (False, True))
+        self.assertEqual(mover.moves, [])
+
+    def test_moves_only_changed_piece(self):
+        current = chess.Board()
+        current.push_uci("e2e4")
+
+        mover = RecordingPieceMover()
+        moved, done = iter_reset_board(
+            mover, PhysicalBoard(current), PhysicalBoard(), chess.BLACK
+        )
+        self.assertEqual((moved, done), (True, False))
+        self.assertEqual(mover.moves, [(chess.E4, chess.E2)])
+
+    def test_temporary_square_is_empty(self):
+        current = chess.Board()
+        current.set_piece_at(chess.E3, chess.Piece(chess.KNIGHT, chess.WHITE))
+
+        mover = RecordingPieceMover()
+        iter_reset_board(mover, PhysicalBoard(current), PhysicalBoard(), chess.BLACK)
+
+        _, to_square = mover.moves[0]
+        self.assertIsNone(current.piece_at(to_square))
+        self.assertIsNone(chess.Board().piece_at(to_square))
+
+    def test_plans_several_moves(self):
+        current = chess.Board()
+        current.push_uci("e2e4")
+        current.push_uci("d7d5")
+        current.push_uci("e4d5")
+
+        mover = RecordingPieceMover()
+        moved, done = iter_reset_board(
+            mover, PhysicalBoard(current), PhysicalBoard(), chess.WHITE
+        )
+        self.assertEqual((moved, done), (True, False))
+        self.assertEqual(
+            mover.moves,
+            [(chess.D5, chess.E2), (-6, chess.D7)],
+        )
+
+
+class TestPlanResetBoard(unittest.TestCase):
+    def test_clears_occupied_target_first(self):
+        current = chess.Board()
+        current.set_piece_at(chess.B1, chess.Piece(chess.BISHOP, chess.WHITE))
+        current.set_piece_at(chess.C1, chess.Piece(chess.KNIGHT, chess.WHITE))
+
+        # Stops before picking up the bishop it parked on a temporary square
+        squares = plan_reset_board(current, chess.Board())
+        self.assertEqual(squares, [(chess.B1, chess.A3), (chess.C1, chess.B1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import chess
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import PhysicalBoard, PieceOffset
+from src.core.calibration import PlacementCalibration
+from src.core.moves import execute_move
+from src.mocks.robot_simulator import FaultInjection, RobotSimulator, SimulatorBoardCapture
+
+
+def board_with_offset(
+    square: chess.Square, offset: PieceOffset, color: chess.Color
+) -> PhysicalBoard:
+    board = PhysicalBoard(chess.Board(None))
+    board.chess_board.set_piece_at(square, chess.Piece(chess.KNIGHT, color))
+    board.set_piece_offset(square, color, offset)
+    return board
+
+
+class TestPlacementCalibration(unittest.TestCase):
+    def test_learns_bias(self):
+        calibration = PlacementCalibration(learning_rate=0.5)
+        board = board_with_offset(chess.C6, PieceOffset(0.2, -0.4), chess.BLACK)
+
+        calibration.observe(board, chess.BB_C6 | chess.BB_D4, chess.BLACK)
+        self.assertEqual(calibration.bias(chess.C6, chess.BLACK), PieceOffset(0.1, -0.2))
+        self.assertEqual(calibration.target_offset(chess.C6, chess.BLACK), PieceOffset(-0.1, 0.2))
+        # Kept in the robot's frame and perspective
+        self.assertEqual(calibration.bias(chess.F3, chess.WHITE), PieceOffset(0.1, -0.2))
+        # Empty and off-board squares are not corrected
+        self.assertEqual(calibration.bias(chess.D4, chess.BLACK), PieceOffset(0, 0))
+        self.assertEqual(calibration.target_offset(-6, chess.BLACK), PieceOffset(0, 0))
+
+    def test_clamps_correction(self):
+        calibration = PlacementCalibration(learning_rate=1.0, max_correction=0.3)
+        calibration.observe(
+            board_with_offset(chess.A1, PieceOffset(0.9, 0), chess.WHITE), chess.BB_A1, chess.WHITE
+        )
+        self.assertEqual(calibration.target_offset(chess.A1, chess.WHITE), PieceOffset(-0.3, 0))
+
+    def test_saves_and_loads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "placement.json")
+            calibration = PlacementCalibration(learning_rate=1.0, path=path)
+            calibration.observe(
+                board_with_offset(chess.E4, PieceOffset(0.25, 0.5), chess.WHITE),
+                chess.BB_E4,
+                chess.WHITE,
+            )
+
+            loaded = PlacementCalibration(path=path)
+            self.assertEqual(loaded.bias(chess.E4, chess.WHITE), PieceOffset(0.25, 0.5))
+
+    def test_compensates_simulated_bias(self):
+        simulator = RobotSimulator(
+            chess_board=chess.Board(),
+            robot_color=chess.BLACK,
+            faults=FaultInjection(placement_bias=PieceOffset(0.3, -0.2)),
+            time_scale=0,
+        )
+        simulator.start()
+        self.addCleanup(simulator.stop)
+        robot_hand = TCPRobotHand("127.0.0.1", simulator.port, timeout=5)
+        board_capture = SimulatorBoardCapture(simulator)
+        calibration = PlacementCalibration(learning_rate=0.5)
+
+        # The knight shuttles between g8 and f6, placed 0.3 right and 0.2 down without calibration
+        for _ in range(8):
+            board = board_capture.capture_board(chess.WHITE)
+            board.chess_board.turn = chess.BLACK
+            uci = "g8f6" if board.chess_board.piece_at(chess.G8) else "f6g8"
+            move = chess.Move.from_uci(uci)
+            self.assertTrue(
+                execute_move(robot_hand, board, move, chess.BLACK, calibration=calibration)
+            )
+            calibration.observe(
+                board_capture.capture_board(chess.WHITE),
+                chess.BB_SQUARES[move.to_square],
+                chess.BLACK,
+            )
+
+        offset = board_capture.capture_board(chess.WHITE).get_piece_offset(chess.G8, chess.BLACK)
+        self.assertLess(abs(offset.x), 0.05)
+        self.assertLess(abs(offset.y), 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
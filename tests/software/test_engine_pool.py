@@ -0,0 +1,183 @@
+import threading
+import time
+import unittest
+from typing import List, Optional
+
+import chess
+import chess.engine
+
+from src.core.board import BoardCapture, PhysicalBoard
+from src.core.engine_pool import EnginePool
+from src.core.game import Game
+from src.mocks.piece_mover import SimulatedPieceMover
+
+
+class StaticBoardCapture(BoardCapture):
+    def __init__(self) -> None:
+        self.board: Optional[chess.Board] = None
+
+    def capture_board(self, human_color: chess.Color) -> Optional[PhysicalBoard]:
+        return PhysicalBoard(self.board.copy()) if self.board else None
+
+
+class FakeAnalysis:
+    def __init__(self, board: chess.Board, multipv: Optional[int], duration: float) -> None:
+        self.moves = list(board.legal_moves)[: multipv or 1]
+        self.duration = duration
+        self.stopped = threading.Event()
+
+    def __enter__(self) -> "FakeAnalysis":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def wait(self) -> chess.engine.BestMove:
+        self.stopped.wait(self.duration)
+        return chess.engine.BestMove(self.moves[0] if self.moves else None, None)
+
+    @property
+    def multipv(self):
+        return [{"pv": [move]} for move in self.moves]
+
+
+class FakeEngine:
+    def __init__(self, analysis_time: float = 0.0) -> None:
+        self.options = {"Threads": None, "Hash": None, "Skill Level": None}
+        self.config = {}
+        self.crashed = False
+        self.quit_called = False
+        # Analyses run until stopped or for analysis_time seconds
+        self.analysis_time = analysis_time
+        self.analysis_error: Optional[Exception] = None
+        self.analyses: List[FakeAnalysis] = []
+        self.limits: List[chess.engine.Limit] = []
+
+    def configure(self, options) -> None:
+        self.config.update(options)
+
+    def ping(self) -> None:
+        if self.crashed:
+            raise chess.engine.EngineTerminatedError("engine crashed")
+
+    def play(self, board, limit, **kwargs) -> chess.engine.PlayResult:
+        self.ping()
+        self.limits.append(limit)
+        return chess.engine.PlayResult(next(iter(board.legal_moves)), None)
+
+    def analysis(self, board, limit=None, multipv=None, **kwargs) -> FakeAnalysis:
+        self.ping()
+        if self.analysis_error is not None:
+            raise self.analysis_error
+        self.limits.append(limit)
+        self.analyses.append(FakeAnalysis(board, multipv, self.analysis_time))
+        return self.analyses[-1]
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class FakeEnginePool(EnginePool):
+    def __init__(self, *args, **kwargs) -> None:
+        self.spawned: List[FakeEngine] = []
+        super().__init__("fake", *args, **kwargs)
+
+    def _popen(self) -> FakeEngine:
+        engine = FakeEngine()
+        self.spawned.append(engine)
+        return engine
+
+
+class TestEnginePool(unittest.TestCase):
+    def test_prespawned_per_skill_level(self):
+        pool = FakeEnginePool(skill_levels=[0, 10], threads=2, hash_size=64)
+        self.assertEqual(len(pool.spawned), 2)
+
+        engine = pool.acquire(10)
+        self.assertEqual(
+            engine.config, {"Threads": 2, "Hash": 64, "Skill Level": 10}
+        )
+        pool.release(engine)
+        self.assertIs(pool.acquire(10), engine)
+        self.assertEqual(len(pool.spawned), 2)
+
+    def test_reconfigures_when_full(self):
+        pool = FakeEnginePool(skill_levels=[0], max_engines=1)
+        engine = pool.acquire(5)
+
+        self.assertEqual(len(pool.spawned), 1)
+        self.assertEqual(engine.config["Skill Level"], 5)
+        with self.assertRaises(TimeoutError):
+            pool.acquire(5, timeout=0.01)
+
+    def test_restarts_crashed_engine(self):
+        pool = FakeEnginePool(skill_levels=[3])
+        crashed = pool.acquire(3)
+        crashed.crashed = True
+        pool.release(crashed)
+
+        engine = pool.acquire(3)
+        self.assertIsNot(engine, crashed)
+        self.assertTrue(crashed.quit_called)
+        self.assertEqual(engine.config["Skill Level"], 3)
+
+    def test_acquire_timeout_is_a_deadline(self):
+        pool = FakeEnginePool(skill_levels=[0], max_engines=1)
+        pool.acquire(0)
+        stop = threading.Event()
+
+        def wake_waiters():
+            # Wake-ups that free no engine must not restart the timeout
+            while not stop.is_set():
+                with pool._condition:
+                    pool._condition.notify_all()
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=wake_waiters)
+        thread.start()
+        try:
+            started = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                pool.acquire(0, timeout=0.1)
+            self.assertLess(time.monotonic() - started, 1.0)
+        finally:
+            stop.set()
+            thread.join()
+
+    def _game(self, pool: EnginePool) -> Game:
+        return Game(
+            StaticBoardCapture(),
+            SimulatedPieceMover(),
+            engine=None,
+            human_color=chess.BLACK,
+            engine_pool=pool,
+        )
+
+    def test_game_acquires_engine_per_search(self):
+        pool = FakeEnginePool(skill_levels=[0], max_engines=1)
+        game = self._game(pool)
+        self.assertIsNone(game.engine)
+
+        pool.spawned[0].crashed = True
+        self.assertIsNotNone(game._engine_move())
+        self.assertEqual(len(pool.spawned), 2)
+
+        game.set_skill_level(7)
+        self.assertIsNotNone(game._engine_move())
+        game.close()
+        self.assertEqual(pool.acquire(7, timeout=0).config["Skill Level"], 7)
+
+    def test_games_share_pooled_engine(self):
+        pool = FakeEnginePool(max_engines=1)
+        games = [self._game(pool) for _ in range(3)]
+
+        for game in games:
+            self.assertIsNotNone(game._engine_move())
+        self.assertEqual(len(pool.spawned), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import threading
+import time
+import unittest
+from typing import Optional
+
+import chess
+import chess.engine
+
+from src.core.board import BoardCapture, PhysicalBoard
+from src.core.game import Game, Player
+from src.core.game_loop import GameLoop, LoopState
+from src.mocks.piece_mover import SimulatedPieceMover
+from tests.software.test_engine_pool import FakeEngine
+
+
+class ChangeDetectingCapture(BoardCapture):
+    def __init__(self) -> None:
+        self.board = chess.Board()
+        self.captures = 0
+        self.changed = threading.Event()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        changed = self.changed.wait(timeout)
+        self.changed.clear()
+        return changed
+
+    def capture_board(self, human_color: chess.Color) -> Optional[PhysicalBoard]:
+        self.captures += 1
+        return PhysicalBoard(self.board.copy())
+
+    def play(self, uci: str) -> None:
+        self.board.push_uci(uci)
+        self.changed.set()
+
+
+class PreparingPieceMover(SimulatedPieceMover):
+    def __init__(self) -> None:
+        self.prepared = []
+
+    def prepare(self, square: chess.Square, color: chess.Color) -> bool:
+        self.prepared.append(square)
+        return True
+
+
+class FailingPieceMover(SimulatedPieceMover):
+    def move_piece(self, from_square, to_square, color, origin_offset) -> bool:
+        return False
+
+
+class SlowPieceMover(SimulatedPieceMover):
+    def __init__(self, engine: FakeEngine, duration: float = 0.1, success: bool = True) -> None:
+        self.engine = engine
+        self.duration = duration
+        self.success = success
+        # Analyses started by the time each piece move finished
+        self.analyses_started = []
+
+    def move_piece(self, from_square, to_square, color, origin_offset) -> bool:
+        time.sleep(self.duration)
+        self.analyses_started.append(len(self.engine.analyses))
+        return self.success
+
+
+class ThreadRecordingRecorder:
+    def __init__(self) -> None:
+        self.finished = []
+
+    def finish(self, result, termination=None) -> None:
+        if termination != "abandoned":
+            self.finished.append((result, termination, threading.current_thread()))
+
+
+class StubPonderer:
+    def __init__(self, human_move: str, reply: str) -> None:
+        self.prediction = (chess.Move.from_uci(human_move), chess.Move.from_uci(reply))
+
+    def likely_reply(self):
+        return self.prediction
+
+    def start(self, chess_board, limit, candidates=None) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def lookup(self, chess_board):
+        return None
+
+
+class TestGameLoop(unittest.TestCase):
+    def setUp(self) -> None:
+        self.capture = ChangeDetectingCapture()
+        self.game = Game(self.capture, SimulatedPieceMover(), engine=FakeEngine())
+        self.loop = GameLoop(self.game, min_interval=0.01, max_interval=0.04)
+
+    def test_idle_board_is_not_captured(self):
+        for _ in range(5):
+            self.assertEqual(self.loop.step(), (None, False))
+
+        self.assertEqual(self.capture.captures, 0)
+        self.assertEqual(self.loop.interval, 0.04)
+
+    def test_robot_reuses_human_capture(self):
+        self.capture.play("e2e4")
+        move, legal = self.loop.step()
+        self.assertEqual((move, legal), (chess.Move.from_uci("e2e4"), True))
+        self.assertEqual(self.loop.state, LoopState.ROBOT_TURN)
+
+        move, legal = self.loop.step()
+        self.assertTrue(legal)
+        self.assertEqual(self.capture.captures, 1)
+        self.assertEqual(self.game.current_player, Player.HUMAN)
+        self.assertEqual(self.loop.interval, 0.01)
+
+    def test_resign_wakes_loop(self):
+        states = []
+        timer = threading.Timer(0.05, lambda: (self.game.resign_human(), self.loop.notify()))
+        timer.start()
+
+        self.assertEqual(self.loop.run(on_state=states.append), "resigned")
+        self.assertEqual(states, [LoopState.HUMAN_TURN, LoopState.GAME_OVER])
+
+    def test_resigning_stops_search(self):
+        # The search would run for 10 seconds unless stopped
+        engine = FakeEngine(analysis_time=10.0)
+        game = Game(self.capture, SimulatedPieceMover(), engine=engine, human_color=chess.BLACK)
+        loop = GameLoop(game, min_interval=0.01, max_interval=0.04)
+        timer = threading.Timer(0.05, lambda: (game.resign_human(), loop.notify()))
+        timer.start()
+
+        started = time.monotonic()
+        self.assertEqual(loop.run(), "resigned")
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertTrue(engine.analyses[0].stopped.is_set())
+        self.assertEqual(game.get_chess_board().move_stack, [])
+
+    def test_resignation_recorded_by_loop(self):
+        recorder = ThreadRecordingRecorder()
+        self.game.recorder = recorder
+
+        self.game.resign_human()
+        self.assertEqual(recorder.finished, [])
+
+        self.loop.run()
+        self.game.close()
+        self.assertEqual(recorder.finished, [("0-1", "resigned", threading.current_thread())])
+
+    def test_prepares_arm_for_pondered_reply(self):
+        mover = PreparingPieceMover()
+        game = Game(self.capture, mover, engine=FakeEngine())
+        game.ponderer = StubPonderer("e2e4", "d7d5")
+        loop = GameLoop(game, min_interval=0.01, max_interval=0.04)
+
+        loop.step()
+        loop.step()
+        self.assertEqual(mover.prepared, [chess.D7])
+
+
+class TestCatchUp(unittest.TestCase):
+    def setUp(self) -> None:
+        self.capture = ChangeDetectingCapture()
+        self.capture.play("e2e4")
+        self.game = Game(
+            self.capture,
+            FailingPieceMover(),
+            engine=FakeEngine(),
+            chess_board=self.capture.board.copy(),
+        )
+
+    def test_recovers_unconfirmed_robot_move(self):
+        # The move is reported failed, but was executed and answered by the human
+        self.assertIsNone(self.game.robot_makes_move(chess.Move.from_uci("e7e5")))
+        self.capture.play("e7e5")
+        self.capture.play("g1f3")
+
+        self.assertFalse(self.game.verify_robot_position(self.game.capture_board()))
+        self.assertEqual(
+            [move.uci() for move in self.game.get_chess_board().move_stack],
+            ["e2e4", "e7e5", "g1f3"],
+        )
+        self.assertEqual(self.game.current_player, Player.ROBOT)
+
+    def test_rejects_move_not_sent(self):
+        self.assertIsNone(self.game.robot_makes_move(chess.Move.from_uci("e7e5")))
+        # The human moved another of the robot's pieces
+        self.capture.play("d7d5")
+
+        self.assertFalse(self.game.verify_robot_position(self.game.capture_board()))
+        self.assertEqual(len(self.game.get_chess_board().move_stack), 1)
+
+    def test_rejects_without_sent_move(self):
+        self.capture.play("e7e5")
+
+        self.assertFalse(self.game.catch_up(self.game.capture_board()))
+        self.assertEqual(len(self.game.get_chess_board().move_stack), 1)
+
+
+
+class TestPipelinedExecution(unittest.TestCase):
+    def setUp(self) -> None:
+        # The analysis runs until the robot move is executed
+        self.engine = FakeEngine(analysis_time=10.0)
+        self.mover = SlowPieceMover(self.engine)
+        self.game = Game(
+            ChangeDetectingCapture(),
+            self.mover,
+            engine=self.engine,
+            human_color=chess.BLACK,
+            pipelined=True,
+        )
+        self.addCleanup(self.game.close)
+        self.move = chess.Move.from_uci("e2e4")
+
+    def test_analysis_overlaps_execution(self):
+        started = time.monotonic()
+        self.assertEqual(self.game.robot_makes_move(self.move), self.move)
+
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertEqual(self.mover.analyses_started, [1])
+        self.assertTrue(self.engine.analyses[0].stopped.is_set())
+        self.assertEqual(len(self.game.expected_replies), self.game.reply_count)
+        self.assertEqual(self.game.get_chess_board().move_stack, [self.move])
+
+    def test_analysis_failure_keeps_execution_result(self):
+        self.engine.analysis_error = chess.engine.EngineError("analysis failed")
+        self.assertEqual(self.game.robot_makes_move(self.move), self.move)
+        self.assertEqual(self.game.expected_replies, [])
+
+        self.mover.success = False
+        self.game.reset_state()
+        self.assertIsNone(self.game.robot_makes_move(self.move))
+        self.assertEqual(self.game.get_chess_board().move_stack, [])
+
+if __name__ == "__main__":
+    unittest.main()
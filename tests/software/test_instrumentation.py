@@ -0,0 +1,79 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from src.core import instrumentation
+from src.core.instrumentation import Histogram
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self) -> None:
+        instrumentation.enable(False)
+        instrumentation.reset()
+
+    def test_histogram_percentiles(self):
+        rng = random.Random(0)
+        values = sorted(rng.uniform(0.001, 2.0) for _ in range(10000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual(histogram.min, values[0])
+        self.assertEqual(histogram.max, values[-1])
+        for percentile in (50, 90, 99):
+            expected = values[int(percentile / 100 * len(values)) - 1]
+            self.assertAlmostEqual(
+                histogram.percentile(percentile), expected, delta=expected * 0.02
+            )
+
+    def test_timed_and_timer(self):
+        @instrumentation.timed("stage.function")
+        def function(value):
+            return value * 2
+
+        self.assertEqual(function(2), 4)
+        with instrumentation.timer("stage.block"):
+            pass
+        instrumentation.count("stage.retries", 3)
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary["stage.function"]["count"], 1)
+        self.assertEqual(summary["stage.block"]["count"], 1)
+        self.assertEqual(summary["counters"], {"stage.retries": 3})
+
+    def test_disabled(self):
+        instrumentation.enable(False)
+
+        @instrumentation.timed("stage.function")
+        def function():
+            pass
+
+        function()
+        with instrumentation.timer("stage.block"):
+            pass
+        instrumentation.count("stage.retries")
+
+        self.assertEqual(instrumentation.summary(), {})
+
+    def test_dump_json(self):
+        instrumentation.record("stage", 0.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            instrumentation.dump(path)
+            with open(path) as file:
+                stages = json.load(file)["stages"]
+
+        self.assertEqual(stages["stage"]["count"], 1)
+        self.assertAlmostEqual(stages["stage"]["p50_ms"], 500.0, delta=10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+import unittest
+from collections import Counter
+
+import chess
+
+from src.core.board import OFFSET_SQUARE_CENTER, PieceOffset
+from src.core.game import Game, Player
+from src.core.journal import MoveJournal
+from src.mocks.piece_mover import SimulatedPieceMover
+from tests.software.test_engine_pool import StaticBoardCapture
+
+
+class ReserveCountingMover(SimulatedPieceMover):
+    def __init__(self) -> None:
+        self.off_board = Counter()
+
+    def move_piece(self, from_square, to_square, color, origin_offset) -> bool:
+        if to_square not in chess.SQUARES:
+            self.off_board[to_square] += 1
+        if from_square not in chess.SQUARES:
+            self.off_board[from_square] -= 1
+        return True
+
+    def reset(self) -> bool:
+        self.off_board.clear()
+        return True
+
+
+class TestMoveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.journal")
+        self.offsets = [[OFFSET_SQUARE_CENTER] * 8 for _ in range(8)]
+        self.offsets[4][3] = PieceOffset(0.25, -0.5)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_replay(self):
+        journal = MoveJournal(self.path, sync_every=2)
+        board = chess.Board()
+        journal.begin(board, chess.BLACK, {"depth": 3, "skill_level": 4})
+
+        for uci in ("e2e4", "d7d5", "e4d5"):
+            move = chess.Move.from_uci(uci)
+            journal.record_move(board, move, self.offsets)
+            board.push(move)
+        journal.record_settings({"depth": 5, "skill_level": 4})
+        journal.close()
+
+        # A crash in the middle of writing a line
+        with open(self.path, "a") as file:
+            file.write('{"type": "move", "mo')
+
+        state = MoveJournal.replay(self.path)
+        self.assertEqual(state.chess_board, board)
+        self.assertEqual(state.human_color, chess.BLACK)
+        self.assertEqual(state.piece_offsets, self.offsets)
+        self.assertEqual(state.settings, {"depth": 5, "skill_level": 4})
+        self.assertEqual(state.reserve, [chess.Piece(chess.PAWN, chess.BLACK)])
+        self.assertIsNone(state.result)
+
+    def test_pending_line_synced_by_timer(self):
+        journal = MoveJournal(self.path, sync_every=100, sync_interval=0.2)
+        self.addCleanup(journal.close)
+        board = chess.Board()
+        journal.begin(board, chess.WHITE, {})
+
+        journal.record_move(board, chess.Move.from_uci("e2e4"), self.offsets)
+        self.assertEqual(journal._pending, 1)
+        deadline = time.monotonic() + 5.0
+        while journal._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(journal._pending, 0)
+
+    def test_missing_journal(self):
+        self.assertIsNone(MoveJournal.replay(self.path))
+
+    def test_game_resume(self):
+        capture = StaticBoardCapture()
+        game = Game(
+            capture,
+            SimulatedPieceMover(),
+            engine=None,
+            depth=2,
+            journal=MoveJournal(self.path),
+        )
+        capture.board = chess.Board()
+        capture.board.push_uci("g1f3")
+        self.assertEqual(game.human_made_move(), (chess.Move.from_uci("g1f3"), True))
+        game.close()
+
+        state = MoveJournal.replay(self.path)
+        resumed = Game(
+            capture,
+            SimulatedPieceMover(),
+            engine=None,
+            journal=MoveJournal(self.path),
+        )
+        self.assertTrue(resumed.resume(state))
+        self.assertEqual(resumed.get_chess_board(), capture.board)
+        self.assertEqual(resumed.current_player, Player.ROBOT)
+        self.assertEqual(resumed.depth, 2)
+
+        resumed.resign_human()
+        resumed.record_resignation()
+        self.assertEqual(MoveJournal.replay(self.path).result, "resigned")
+
+    def test_resume_keeps_captured_pieces(self):
+        capture = StaticBoardCapture()
+        mover = ReserveCountingMover()
+        game = Game(capture, mover, engine=None, journal=MoveJournal(self.path))
+        capture.board = chess.Board()
+        for human, robot in (("e2e4", "d7d5"), ("a2a3", "d5e4")):
+            capture.board.push_uci(human)
+            self.assertTrue(game.human_made_move()[1])
+            self.assertIsNotNone(game.robot_makes_move(chess.Move.from_uci(robot)))
+            capture.board.push_uci(robot)
+        game.close()
+        self.assertEqual(sum(mover.off_board.values()), 1)
+
+        state = MoveJournal.replay(self.path)
+        self.assertEqual(state.reserve, [chess.Piece(chess.PAWN, chess.WHITE)])
+        resumed = Game(
+            capture, mover, engine=None, journal=MoveJournal(self.path), reset_mover=False
+        )
+        self.assertTrue(resumed.resume(state))
+        self.assertEqual(resumed.get_chess_board(), capture.board)
+        self.assertEqual(sum(mover.off_board.values()), len(state.reserve))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import unittest
+
+import chess
+
+from src.core import move_cache
+from src.core.move_cache import MoveCache
+
+
+class TestMoveCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = MoveCache(
+            os.path.join(self.directory.name, "moves.sqlite"),
+            min_samples=3,
+            explore_rate=0.0,
+            rng=random.Random(0),
+        )
+        self.board = chess.Board()
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_min_samples(self):
+        move = chess.Move.from_uci("e2e4")
+        for _ in range(2):
+            self.cache.record(self.board, 4, 0, 1.0, move)
+            self.assertIsNone(self.cache.lookup(self.board, 4, 0, 1.0))
+
+        self.cache.record(self.board, 4, 0, 1.0, move)
+        self.assertEqual(self.cache.lookup(self.board, 4, 0, 1.0), move)
+
+    def test_max_skill_level_answers_immediately(self):
+        move = chess.Move.from_uci("d2d4")
+        self.cache.record(self.board, 4, 20, 1.0, move)
+
+        self.assertEqual(self.cache.lookup(self.board, 4, 20, 1.0), move)
+        self.assertIsNone(self.cache.lookup(self.board, 4, 20, 2.0))
+        self.assertIsNone(self.cache.lookup(self.board, 5, 20, 1.0))
+
+    def test_samples_top_moves(self):
+        moves = [chess.Move.from_uci(uci) for uci in ("e2e4", "d2d4", "g1f3")]
+        for move, count in zip(moves, (5, 3, 1)):
+            for _ in range(count):
+                self.cache.record(self.board, 4, 0, 1.0, move)
+
+        self.cache.top_k = 2
+        sampled = {self.cache.lookup(self.board, 4, 0, 1.0) for _ in range(50)}
+        self.assertEqual(sampled, set(moves[:2]))
+
+    def test_explores_cached_keys(self):
+        move = chess.Move.from_uci("d2d4")
+        self.cache.record(self.board, 4, 20, 1.0, move)
+
+        self.cache.explore_rate = 0.5
+        lookups = [self.cache.lookup(self.board, 4, 20, 1.0) for _ in range(100)]
+        self.assertIn(None, lookups)
+        self.assertIn(move, lookups)
+
+    def test_illegal_move_ignored(self):
+        self.board.push_uci("e2e4")
+        self.cache.record(self.board, 4, 20, 1.0, chess.Move.from_uci("e2e4"))
+        self.assertIsNone(self.cache.lookup(self.board, 4, 20, 1.0))
+
+    def test_eviction(self):
+        self.cache.max_entries = 10
+        board = chess.Board()
+        for _ in range(move_cache.EVICTION_INTERVAL):
+            move = next(iter(board.legal_moves))
+            self.cache.record(board, 4, 20, 1.0, move)
+            board.push(move)
+            if board.is_game_over():
+                board.reset()
+
+        (entries,) = self.cache._connection.execute(
+            "SELECT COUNT(*) FROM moves"
+        ).fetchone()
+        self.assertEqual(entries, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
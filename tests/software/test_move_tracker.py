@@ -0,0 +1,161 @@
+import unittest
+import chess
+
+from src.core.recognition import (
+    MoveState,
+    MoveTracker,
+    find_move_sequence,
+    placement_key,
+    recognize_move,
+)
+
+
+def lift(board: chess.Board, *squares: str) -> chess.Board:
+    lifted = board.copy()
+    for square in squares:
+        lifted.remove_piece_at(chess.parse_square(square))
+    return lifted
+
+
+class TestRecognizeMove(unittest.TestCase):
+    def test_idle(self):
+        board = chess.Board()
+        recognition = recognize_move(board, board.copy())
+        self.assertEqual(recognition.state, MoveState.IDLE)
+        self.assertEqual(recognition.watch_squares, chess.BB_EMPTY)
+
+    def test_completed(self):
+        board = chess.Board()
+        after = board.copy()
+        after.push_uci("g1f3")
+        recognition = recognize_move(board, after)
+        self.assertEqual(recognition.state, MoveState.COMPLETED)
+        self.assertEqual(recognition.move, chess.Move.from_uci("g1f3"))
+
+    def test_lifted_piece(self):
+        board = chess.Board()
+        recognition = recognize_move(board, lift(board, "g1"))
+        self.assertEqual(recognition.state, MoveState.IN_PROGRESS)
+        self.assertEqual(
+            recognition.watch_squares, chess.BB_G1 | chess.BB_F3 | chess.BB_H3
+        )
+
+    def test_capture_removed_first(self):
+        board = chess.Board("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2")
+        recognition = recognize_move(board, lift(board, "d5"))
+        self.assertEqual(recognition.state, MoveState.IN_PROGRESS)
+        self.assertTrue(recognition.watch_squares & chess.BB_E4)
+
+    def test_king_moved_before_rook(self):
+        board = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        partial = lift(board, "e1")
+        partial.set_piece_at(chess.G1, chess.Piece(chess.KING, chess.WHITE))
+        recognition = recognize_move(board, partial)
+        self.assertEqual(recognition.state, MoveState.IN_PROGRESS)
+        self.assertTrue(recognition.watch_squares & chess.BB_H1)
+        self.assertTrue(recognition.watch_squares & chess.BB_F1)
+
+    def test_pawn_placed_before_promotion(self):
+        board = chess.Board("3bk3/4P1P1/8/8/8/8/8/4K3 w - - 0 1")
+        partial = lift(board, "g7")
+        partial.set_piece_at(chess.G8, chess.Piece(chess.PAWN, chess.WHITE))
+        recognition = recognize_move(board, partial)
+        self.assertEqual(recognition.state, MoveState.IN_PROGRESS)
+
+    def test_invalid(self):
+        board = chess.Board()
+        after = lift(board, "a1")
+        after.set_piece_at(chess.A3, chess.Piece(chess.ROOK, chess.WHITE))
+        recognition = recognize_move(board, after)
+        self.assertEqual(recognition.state, MoveState.INVALID)
+        self.assertEqual(recognition.move, chess.Move.from_uci("a1a3"))
+
+
+class TestMoveTracker(unittest.TestCase):
+    def test_invalid_after_progress_needs_confirmation(self):
+        board = chess.Board()
+        invalid = lift(board, "b1")
+        invalid.set_piece_at(chess.B3, chess.Piece(chess.KNIGHT, chess.WHITE))
+
+        tracker = MoveTracker(invalid_confirmations=2)
+        self.assertEqual(tracker.update(board, lift(board, "b1")).state, MoveState.IN_PROGRESS)
+        self.assertEqual(tracker.update(board, invalid).state, MoveState.IN_PROGRESS)
+        self.assertEqual(tracker.update(board, invalid).state, MoveState.INVALID)
+
+    def test_invalid_from_rest_is_immediate(self):
+        board = chess.Board()
+        invalid = lift(board, "a1")
+        invalid.set_piece_at(chess.A3, chess.Piece(chess.ROOK, chess.WHITE))
+
+        tracker = MoveTracker()
+        self.assertEqual(tracker.update(board, invalid).state, MoveState.INVALID)
+        self.assertFalse(tracker.in_progress)
+
+    def test_progress_then_completed(self):
+        board = chess.Board()
+        after = board.copy()
+        after.push_uci("e2e4")
+
+        tracker = MoveTracker()
+        tracker.update(board, lift(board, "e2"))
+        self.assertTrue(tracker.in_progress)
+
+        recognition = tracker.update(board, after)
+        self.assertEqual(recognition.state, MoveState.COMPLETED)
+        self.assertEqual(tracker.watch_squares, chess.BB_EMPTY)
+
+
+class TestFindMoveSequence(unittest.TestCase):
+    def assert_sequence(self, board: chess.Board, moves, max_depth: int = 2):
+        after = board.copy()
+        for move in moves:
+            after.push_uci(move)
+
+        sequence = find_move_sequence(board, after, max_depth)
+        self.assertIsNotNone(sequence)
+
+        replayed = board.copy()
+        for move in sequence:
+            replayed.push(move)
+        self.assertEqual(replayed.board_fen(), after.board_fen())
+        return sequence
+
+    def test_unchanged(self):
+        self.assertEqual(find_move_sequence(chess.Board(), chess.Board()), [])
+
+    def test_single_move(self):
+        sequence = self.assert_sequence(chess.Board(), ["e2e4"])
+        self.assertEqual(len(sequence), 1)
+
+    def test_move_and_reply(self):
+        sequence = self.assert_sequence(chess.Board(), ["e2e4", "e7e5"])
+        self.assertEqual(len(sequence), 2)
+
+    def test_capture_and_recapture(self):
+        board = chess.Board("rnbqkbnr/ppp1pppp/8/3p4/4P3/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 2")
+        self.assert_sequence(board, ["e4d5", "d8d5", "c3d5"], max_depth=3)
+
+    def test_too_deep(self):
+        after = chess.Board()
+        for move in ["e2e4", "e7e5", "g1f3"]:
+            after.push_uci(move)
+        self.assertIsNone(find_move_sequence(chess.Board(), after, max_depth=2))
+
+    def test_unreachable(self):
+        after = chess.Board()
+        after.remove_piece_at(chess.A1)
+        self.assertIsNone(find_move_sequence(chess.Board(), after, max_depth=2))
+
+    def test_key_includes_rights(self):
+        board = chess.Board()
+        without_castling = chess.Board("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w kq - 0 1")
+        self.assertNotEqual(placement_key(board), placement_key(without_castling))
+
+        board.push_uci("e2e4")
+        without_en_passant = board.copy()
+        without_en_passant.ep_square = None
+        self.assertNotEqual(placement_key(board), placement_key(without_en_passant))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import unittest
+
+import chess
+
+from src.core.game import Game
+from src.core.orchestrator import TableOrchestrator
+from src.mocks.board_capture import SimulatedBoardCapture
+from src.mocks.piece_mover import SimulatedPieceMover
+from tests.software.test_engine_pool import FakeEngine, FakeEnginePool
+
+
+class TestTableOrchestrator(unittest.TestCase):
+    def setUp(self) -> None:
+        # Fewer engines than tables, games acquire one per search
+        self.pool = FakeEnginePool(max_engines=2)
+        self.games = []
+        for human_color in (chess.WHITE, chess.BLACK, chess.WHITE):
+            board_capture = SimulatedBoardCapture(FakeEngine())
+            game = Game(
+                board_capture,
+                SimulatedPieceMover(),
+                engine=None,
+                human_color=human_color,
+                engine_pool=self.pool,
+            )
+            board_capture.track_game(game)
+            self.games.append(game)
+
+    def test_plays_all_tables(self):
+        orchestrator = TableOrchestrator(self.games, poll_interval=0.01)
+        moves = [0] * len(self.games)
+        lock = threading.Lock()
+
+        def on_move(table: int, move: chess.Move, legal: bool) -> None:
+            self.assertTrue(legal)
+            with lock:
+                moves[table] += 1
+                if min(moves) >= 6:
+                    orchestrator.stop()
+
+        results = orchestrator.run(on_move=on_move)
+
+        self.assertEqual(results, ["*"] * 3)
+        self.assertLessEqual(len(self.pool.spawned), 2)
+        for table, game in enumerate(self.games):
+            self.assertEqual(len(game.get_chess_board().move_stack), moves[table])
+
+    def test_game_over(self):
+        self.games[1].resign_human()
+        finished = []
+
+        def on_game_over(table: int, result: str) -> bool:
+            finished.append((table, result, threading.current_thread().name))
+            return False
+
+        orchestrator = TableOrchestrator(self.games[1:2], poll_interval=0.01)
+        self.assertEqual(orchestrator.run(on_game_over=on_game_over), ["resigned"])
+        self.assertEqual([entry[:2] for entry in finished], [(0, "resigned")])
+        # Game over is handled on a table worker, not the scheduler thread
+        self.assertTrue(finished[0][2].startswith("table"))
+
+
+if __name__ == "__main__":
+    unittest.main()
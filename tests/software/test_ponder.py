@@ -0,0 +1,102 @@
+import time
+import unittest
+from contextlib import contextmanager
+
+import chess
+import chess.engine
+import chess.polyglot
+
+from src.core.game import Game
+from src.core.ponder import Ponderer
+from src.mocks.piece_mover import SimulatedPieceMover
+from tests.software.test_engine_pool import FakeEngine, StaticBoardCapture
+
+
+class CountingEngineSource:
+    def __init__(self, engine: FakeEngine) -> None:
+        self.engine = engine
+        self.acquired = 0
+        self.released = 0
+
+    @contextmanager
+    def __call__(self):
+        self.acquired += 1
+        try:
+            yield self.engine
+        finally:
+            self.released += 1
+
+
+class TestPonderer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = FakeEngine()
+        self.source = CountingEngineSource(self.engine)
+        self.ponderer = Ponderer(self.source, reply_count=2)
+        self.addCleanup(self.ponderer.stop)
+        self.limit = chess.engine.Limit(depth=2)
+
+    def test_replies_cached_by_position(self):
+        board = chess.Board()
+        self.ponderer.start(board, self.limit)
+        self.ponderer._thread.join()
+
+        # The fake engine's likely human moves are the first legal moves
+        candidates = list(board.legal_moves)[:2]
+        self.assertEqual([human for human, _ in self.ponderer.predictions], candidates)
+        self.assertEqual(self.ponderer.likely_reply(), self.ponderer.predictions[0])
+
+        for human_move, reply in self.ponderer.predictions:
+            board.push(human_move)
+            self.assertEqual(self.ponderer.lookup(board), reply)
+            self.assertIn(chess.polyglot.zobrist_hash(board), self.ponderer.replies)
+            board.pop()
+
+        board.push(list(board.legal_moves)[-1])
+        self.assertIsNone(self.ponderer.lookup(board))
+        self.assertEqual(self.source.acquired, self.source.released)
+
+    def test_stop_during_search(self):
+        self.engine.analysis_time = 10.0
+        self.ponderer.start(chess.Board(), self.limit)
+        while not self.engine.analyses:
+            time.sleep(0.01)
+
+        started = time.monotonic()
+        self.ponderer.stop()
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertIsNone(self.ponderer._thread)
+        self.assertTrue(self.engine.analyses[0].stopped.is_set())
+        self.assertEqual(self.source.released, self.source.acquired)
+        self.assertEqual(self.ponderer.replies, {})
+        self.assertIsNone(self.ponderer.likely_reply())
+
+
+class TestGamePondering(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = FakeEngine()
+        self.game = Game(
+            StaticBoardCapture(),
+            SimulatedPieceMover(),
+            engine=self.engine,
+            human_color=chess.BLACK,
+            thinking_time=1.0,
+            ponder=True,
+            ponder_miss_factor=0.5,
+        )
+        self.addCleanup(self.game.close)
+
+    def test_ponder_miss_shortens_search(self):
+        self.assertIsNotNone(self.game._engine_move())
+        self.assertEqual(self.engine.limits[-1].time, 0.5)
+
+    def test_ponder_hit_skips_search(self):
+        board = self.game.get_chess_board()
+        reply = chess.Move.from_uci("d2d4")
+        self.game.ponderer.replies[chess.polyglot.zobrist_hash(board)] = reply
+
+        self.assertEqual(self.game._engine_move(), reply)
+        self.assertEqual(self.engine.limits, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+import chess
+import chess.polyglot
+
+from src.core.probing import OpeningBook
+
+
+def polyglot_move(move: chess.Move) -> int:
+    return (
+        chess.square_file(move.to_square)
+        | chess.square_rank(move.to_square) << 3
+        | chess.square_file(move.from_square) << 6
+        | chess.square_rank(move.from_square) << 9
+    )
+
+
+def write_book(path: str, board: chess.Board, weights: dict) -> None:
+    key = chess.polyglot.zobrist_hash(board)
+    with open(path, "wb") as book:
+        for uci, weight in weights.items():
+            move = chess.Move.from_uci(uci)
+            book.write(struct.pack(">QHHI", key, polyglot_move(move), weight, 0))
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "book.bin")
+        write_book(self.path, chess.Board(), {"e2e4": 100, "d2d4": 1, "g1f3": 0})
+        self.book = OpeningBook(self.path, rng=random.Random(0))
+
+    def tearDown(self) -> None:
+        self.book.close()
+        self.directory.cleanup()
+
+    def test_best_move_at_max_skill(self):
+        for _ in range(10):
+            self.assertEqual(self.book.choose(chess.Board(), 20), chess.Move.from_uci("e2e4"))
+
+    def test_low_skill_samples_all_weighted_moves(self):
+        moves = {self.book.choose(chess.Board(), 0) for _ in range(50)}
+        self.assertEqual(moves, {chess.Move.from_uci("e2e4"), chess.Move.from_uci("d2d4")})
+
+    def test_position_not_in_book(self):
+        board = chess.Board()
+        board.push_uci("a2a3")
+        self.assertIsNone(self.book.choose(board, 20))
+
+    def test_max_ply(self):
+        self.book.max_ply = -1
+        self.assertIsNone(self.book.choose(chess.Board(), 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+import chess
+import chess.pgn
+
+from src.core.game import Game
+from src.core.recording import GameRecorder, MoveTiming, PGNArchive, format_timing
+from src.mocks.piece_mover import SimulatedPieceMover
+from tests.software.test_engine_pool import StaticBoardCapture
+
+
+class TestRecording(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.pgn")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read_games(self, path: str):
+        games = []
+        with open(path) as file:
+            while (game := chess.pgn.read_game(file)) is not None:
+                games.append(game)
+        return games
+
+    def test_format_timing(self):
+        timing = MoveTiming(
+            turn_time=75.5,
+            capture_time=0.8,
+            inference_count=4,
+            engine_time=0.25,
+            execution_time=6.0,
+        )
+        self.assertEqual(
+            format_timing(timing),
+            "[%emt 0:01:15.50] [%capture 0.80] [%inferences 4] [%engine 0.25] [%robot 6.00]",
+        )
+
+    def test_game_recorded_with_timings(self):
+        capture = StaticBoardCapture()
+        game = Game(
+            capture,
+            SimulatedPieceMover(),
+            engine=None,
+            recorder=GameRecorder(PGNArchive(self.path), headers={"Site": "Table 0"}),
+        )
+        capture.board = chess.Board()
+        capture.board.push_uci("e2e4")
+        game.human_made_move()
+        game.resign_human()
+        game.record_resignation()
+
+        (recorded,) = self.read_games(self.path)
+        self.assertEqual(recorded.headers["Result"], "0-1")
+        self.assertEqual(recorded.headers["Termination"], "resigned")
+        self.assertEqual(recorded.headers["Site"], "Table 0")
+        self.assertEqual(recorded.headers["White"], "Human")
+        self.assertEqual(list(recorded.mainline_moves()), [chess.Move.from_uci("e2e4")])
+        self.assertIn("[%inferences 0]", recorded.next().comment)
+
+    def test_empty_games_not_recorded(self):
+        game = Game(
+            StaticBoardCapture(),
+            SimulatedPieceMover(),
+            engine=None,
+            recorder=GameRecorder(PGNArchive(self.path)),
+        )
+        game.reset_state(human_color=chess.BLACK)
+        game.close()
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_archive_rotation(self):
+        archive = PGNArchive(self.path, max_bytes=1, backup_count=2)
+        for _ in range(3):
+            archive.write(chess.pgn.Game())
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(self.read_games(self.path + ".1")), 1)
+        self.assertEqual(len(self.read_games(self.path + ".2")), 1)
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import chess
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.mocks.piece_mover import SimulatedPieceMover
+from src.mocks.robot_benchmark import RobotBenchmark, final_positions, random_games
+from src.mocks.robot_simulator import RobotSimulator
+
+
+class TestRobotBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.simulator = RobotSimulator(time_scale=0, seed=1)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        robot_hand = TCPRobotHand("127.0.0.1", self.simulator.port, timeout=5)
+        self.benchmark = RobotBenchmark(robot_hand, self.simulator, seed=1)
+
+    def test_games(self):
+        games = random_games(2, max_plies=30, seed=1)
+        report = self.benchmark.run_games(games)
+
+        self.assertEqual(report.failures, 0)
+        # A plan per move
+        self.assertEqual(report.commands, 60)
+        self.assertGreaterEqual(report.steps, 60)
+        self.assertEqual(self.simulator.board.board_fen(), games[1].end().board().board_fen())
+        self.assertGreater(report.travel_distance, 0)
+
+    def test_resets(self):
+        report = self.benchmark.run_resets(final_positions(random_games(2, seed=2)))
+
+        self.assertEqual(report.failures, 0)
+        self.assertEqual(report.resets.count, 2)
+        self.assertEqual(self.simulator.board.board_fen(), chess.STARTING_BOARD_FEN)
+
+    def test_rearrangements(self):
+        report = self.benchmark.run_rearrangements(3)
+
+        self.assertEqual(report.failures, 0)
+        self.assertEqual(self.simulator.board.board_fen(), self.benchmark.board.chess_board.board_fen())
+        self.assertNotEqual(self.simulator.board.board_fen(), chess.STARTING_BOARD_FEN)
+
+    def test_mock(self):
+        report = RobotBenchmark(SimulatedPieceMover()).run_rearrangements(2)
+
+        self.assertEqual(report.failures, 0)
+        self.assertGreater(report.summary()["commands_per_s"], 0)
+        self.assertIsNone(report.travel_distance)
+
+
+if __name__ == "__main__":
+    unittest.main()
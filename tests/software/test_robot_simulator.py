@@ -0,0 +1,149 @@
+import socket
+import unittest
+
+import chess
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import PhysicalBoard
+from src.core.moves import execute_move, execute_move_verified, iter_reset_board
+from src.mocks.robot_simulator import (
+    ArmKinematics,
+    FaultInjection,
+    RobotSimulator,
+    SimulatorBoardCapture,
+)
+
+
+class TestArmKinematics(unittest.TestCase):
+    def test_travel_time(self):
+        kinematics = ArmKinematics(max_speed=0.5, acceleration=1.0)
+        self.assertEqual(kinematics.travel_time((0, 0), (0, 0)), 0.0)
+        # Too short to reach the maximum speed
+        self.assertAlmostEqual(kinematics.travel_time((0, 0), (0.04, 0)), 0.4)
+        # Accelerates, cruises for 0.5 s and decelerates
+        self.assertAlmostEqual(kinematics.travel_time((0, 0), (0.5, 0)), 1.5)
+
+
+class TestRobotSimulator(unittest.TestCase):
+    def start(self, chess_board: chess.Board, **kwargs) -> TCPRobotHand:
+        self.simulator = RobotSimulator(
+            chess_board=chess_board, robot_color=chess.BLACK, time_scale=0, seed=0, **kwargs
+        )
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        return TCPRobotHand(ip="127.0.0.1", port=self.simulator.port, timeout=5)
+
+    def test_execute_capture(self):
+        chess_board = chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 b - - 0 1")
+        robot_hand = self.start(chess_board)
+
+        move = chess.Move.from_uci("d5e4")
+        self.assertTrue(
+            execute_move(robot_hand, PhysicalBoard(chess_board), move, chess.BLACK)
+        )
+        chess_board.push(move)
+
+        self.assertEqual(
+            self.simulator.chess_board(chess.BLACK).board_fen(), chess_board.board_fen()
+        )
+        self.assertEqual(self.simulator.reserve, {-6: [chess.Piece(chess.PAWN, chess.WHITE)]})
+        self.assertGreater(self.simulator.arm_time, 0.0)
+
+    def test_failed_grasp(self):
+        chess_board = chess.Board()
+        robot_hand = self.start(chess_board, faults=FaultInjection(failure_rate=1.0))
+
+        self.assertFalse(
+            execute_move(
+                robot_hand, PhysicalBoard(chess_board), chess.Move.from_uci("e2e4"), chess.BLACK
+            )
+        )
+        self.assertEqual(self.simulator.chess_board(chess.BLACK).board_fen(), chess_board.board_fen())
+
+    def test_retries_failed_grasp(self):
+        chess_board = chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 b - - 0 1")
+        robot_hand = self.start(chess_board, faults=FaultInjection(failure_rate=0.5))
+        board_capture = SimulatorBoardCapture(self.simulator)
+
+        move = chess.Move.from_uci("d5e4")
+        self.assertTrue(
+            execute_move_verified(
+                robot_hand, PhysicalBoard(chess_board), move, chess.BLACK, board_capture, 10
+            )
+        )
+        chess_board.push(move)
+        self.assertEqual(
+            self.simulator.chess_board(chess.BLACK).board_fen(), chess_board.board_fen()
+        )
+
+    def test_gives_up_after_retries(self):
+        chess_board = chess.Board()
+        robot_hand = self.start(chess_board, faults=FaultInjection(failure_rate=1.0))
+        board_capture = SimulatorBoardCapture(self.simulator)
+
+        self.assertFalse(
+            execute_move_verified(
+                robot_hand,
+                PhysicalBoard(chess_board),
+                chess.Move.from_uci("e2e4"),
+                chess.BLACK,
+                board_capture,
+                2,
+            )
+        )
+        # The first attempt and two retries
+        self.assertEqual(self.simulator.command_count, 3)
+
+    def test_jitter_keeps_response_order(self):
+        self.start(chess.Board(), faults=FaultInjection(latency=0.01, jitter=0.05))
+
+        with socket.create_connection(("127.0.0.1", self.simulator.port), timeout=5) as client:
+            client.sendall(b"".join(f"{index} ping\n".encode() for index in range(20)))
+            data = b""
+            while data.count(b"\n") < 20:
+                data += client.recv(4096)
+
+        request_ids = [line.split()[0] for line in data.decode().splitlines()]
+        self.assertEqual(request_ids, [str(index) for index in range(20)])
+
+    def test_prepare_shortens_move(self):
+        chess_board = chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 b - - 0 1")
+        robot_hand = self.start(chess_board)
+        move = chess.Move.from_uci("d5e4")
+
+        execute_move(robot_hand, PhysicalBoard(chess_board), move, chess.BLACK)
+        cold_time = self.simulator.arm_time
+
+        self.simulator.set_chess_board(chess_board, chess.BLACK)
+        self.simulator.reserve.clear()
+        robot_hand.reset()
+        self.assertTrue(robot_hand.prepare(chess.E4, chess.BLACK))
+        prepared_time = self.simulator.arm_time
+        execute_move(robot_hand, PhysicalBoard(chess_board), move, chess.BLACK)
+
+        self.assertLess(self.simulator.arm_time - prepared_time, cold_time)
+
+    def test_reset_board(self):
+        # Kings and queens swapped, and pawns advanced
+        current = chess.Board("rnbkqbnr/pppp1ppp/8/4p3/3P4/8/PPP1PPPP/RNBKQBNR w - - 0 1")
+        robot_hand = self.start(current)
+        board_capture = SimulatorBoardCapture(self.simulator)
+        expected_board = PhysicalBoard()
+
+        done = False
+        while not done:
+            captured_board = board_capture.capture_board(chess.WHITE)
+            moved, done = iter_reset_board(
+                robot_hand, captured_board, expected_board, chess.BLACK
+            )
+            if not moved:
+                break
+
+        self.assertTrue(done)
+        self.assertEqual(
+            self.simulator.chess_board(chess.BLACK).board_fen(), chess.Board().board_fen()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
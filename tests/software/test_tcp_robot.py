@@ -0,0 +1,112 @@
+import socket
+import threading
+import unittest
+
+import chess
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import PhysicalBoard, PieceOffset
+from src.core.moves import MoveStep, execute_move
+
+
+class FramedRobotServer:
+    """Robot controller answering framed commands, splitting and merging response frames."""
+
+    def __init__(self, fail_command: str = "") -> None:
+        self.fail_command = fail_command
+        self.commands = []
+        self.plans = 0
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self) -> None:
+        connection, _ = self.server.accept()
+        with connection:
+            buffer = b""
+            responses = b""
+            failed = False
+            while chunk := connection.recv(4096):
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    request_id, command = line.decode().split(" ", 1)
+                    if command.startswith("plan "):
+                        self.plans += 1
+                        steps = ["move " + step for step in command[5:].split(";")]
+                    else:
+                        steps = [command]
+
+                    for index, step in enumerate(steps):
+                        self.commands.append(step)
+                        failed = failed or step == self.fail_command
+                        status = "failure" if failed else "success"
+                        if command.startswith("plan "):
+                            responses += f"{request_id} step {index} {status}\n".encode()
+                    responses += f"{request_id} {status}\n".encode()
+
+                # Send responses in uneven pieces across frame boundaries
+                while len(responses) > 5:
+                    connection.sendall(responses[:5])
+                    responses = responses[5:]
+                connection.sendall(responses)
+                responses = b""
+
+    def close(self) -> None:
+        self.server.close()
+
+
+class TestTCPRobotHand(unittest.TestCase):
+    def connect(self, fail_command: str = "") -> TCPRobotHand:
+        self.server = FramedRobotServer(fail_command)
+        self.addCleanup(self.server.close)
+        return TCPRobotHand(ip="127.0.0.1", port=self.server.port, timeout=5)
+
+    def test_issue_command(self):
+        robot_hand = self.connect()
+        self.assertTrue(robot_hand.reset())
+        self.assertTrue(robot_hand.move_piece(12, 28, chess.WHITE, PieceOffset(0.1, -0.2)))
+        self.assertEqual(self.server.commands, ["reset", "move 12 10 -20 28"])
+
+    def test_target_offset(self):
+        robot_hand = self.connect()
+        steps = [MoveStep(12, 28, PieceOffset(0, 0), PieceOffset(-0.1, 0.25))]
+        self.assertEqual(robot_hand.plan(steps, chess.WHITE), 1)
+        self.assertEqual(self.server.commands, ["move 12 0 0 28 -10 25"])
+
+    def test_execute_capture_plan(self):
+        robot_hand = self.connect()
+        board = PhysicalBoard(chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1"))
+        board.set_piece_offset(chess.E4, chess.WHITE, PieceOffset(0.5, 0.5))
+
+        self.assertTrue(
+            execute_move(robot_hand, board, chess.Move.from_uci("e4d5"), chess.WHITE)
+        )
+        self.assertEqual(self.server.commands, ["move 35 0 0 -6", "move 28 50 50 35"])
+        self.assertEqual(self.server.plans, 1)
+        self.assertEqual(board.get_piece_offset(chess.E4, chess.WHITE), PieceOffset(0, 0))
+
+    def test_failed_step(self):
+        robot_hand = self.connect(fail_command="move 35 0 0 -6")
+        self.assertEqual(
+            robot_hand.issue_commands(["move 28 0 0 36", "move 35 0 0 -6", "reset"]), 1
+        )
+
+    def test_plan_progress(self):
+        robot_hand = self.connect(fail_command="move 35 0 0 -6")
+        steps = [
+            MoveStep(28, 36, PieceOffset(0, 0)),
+            MoveStep(35, -6, PieceOffset(0, 0)),
+            MoveStep(28, 35, PieceOffset(0, 0)),
+        ]
+        progress = []
+        completed = robot_hand.plan(
+            steps, chess.WHITE, lambda index, success: progress.append((index, success))
+        )
+        self.assertEqual(completed, 1)
+        self.assertEqual(progress, [(0, True), (1, False), (2, False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
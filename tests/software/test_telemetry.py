@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+
+import chess
+import numpy as np
+
+from src.communication.tcp_robot import TCPRobotHand
+from src.core.board import OFFSET_SQUARE_CENTER, PhysicalBoard
+from src.core.moves import execute_move, plan_reset_board
+from src.core.telemetry import TelemetryRecorder, TravelTimeModel, load_telemetry
+from src.mocks.robot_simulator import RobotSimulator
+
+
+class TestTelemetryRecorder(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def test_chunks(self):
+        recorder = TelemetryRecorder(self.directory, chunk_size=2)
+        for index in range(3):
+            recorder.record(
+                chess.A2, chess.A4, chess.BLACK, OFFSET_SQUARE_CENTER, index, index + 0.5, True
+            )
+        self.assertEqual(len(load_telemetry(self.directory)["sent"]), 2)
+
+        recorder.close()
+        columns = load_telemetry(self.directory)
+        np.testing.assert_array_equal(columns["sent"], [0, 1, 2])
+        # Stored in the robot's frame
+        self.assertEqual(columns["from_square"][0], chess.H7)
+        self.assertEqual(columns["to_square"][0], chess.H5)
+
+    def test_records_plan_steps(self):
+        simulator = RobotSimulator(
+            chess_board=chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1"), time_scale=0
+        )
+        simulator.start()
+        self.addCleanup(simulator.stop)
+        recorder = TelemetryRecorder(self.directory)
+        robot_hand = TCPRobotHand("127.0.0.1", simulator.port, timeout=5, telemetry=recorder)
+
+        board = PhysicalBoard(chess.Board("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1"))
+        execute_move(robot_hand, board, chess.Move.from_uci("e4d5"), chess.WHITE)
+        recorder.flush()
+
+        columns = load_telemetry(self.directory)
+        np.testing.assert_array_equal(columns["from_square"], [chess.D5, chess.E4])
+        np.testing.assert_array_equal(columns["to_square"], [-6, chess.D5])
+        self.assertTrue(columns["success"].all())
+        self.assertTrue((columns["acked"] >= columns["sent"]).all())
+
+
+def telemetry(moves):
+    """Builds telemetry columns from (from_square, to_square, duration, success) tuples."""
+    from_squares, to_squares, durations, successes = zip(*moves)
+    return {
+        "from_square": np.array(from_squares),
+        "to_square": np.array(to_squares),
+        "sent": np.zeros(len(moves)),
+        "acked": np.array(durations, dtype=float),
+        "success": np.array(successes),
+    }
+
+
+class TestTravelTimeModel(unittest.TestCase):
+    def setUp(self):
+        self.model = TravelTimeModel(min_samples=2)
+        self.model.fit(
+            telemetry(
+                [
+                    (chess.A1, chess.A2, 2.0, True),
+                    (chess.A1, chess.A2, 4.0, True),
+                    (chess.A1, chess.H8, 9.0, True),
+                    (chess.B1, chess.C3, 1.0, True),
+                    (chess.B1, chess.C3, 0.0, False),
+                ]
+            )
+        )
+
+    def test_estimate(self):
+        # Measured pair
+        self.assertAlmostEqual(self.model.estimate(chess.A1, chess.A2), 3.0)
+        # Leaving A1 takes 5 s on average, arriving at C3 takes 1 s
+        self.assertAlmostEqual(self.model.estimate(chess.A1, chess.C3), 3.0)
+        # Never seen squares
+        self.assertAlmostEqual(self.model.estimate(chess.D4, chess.E5), 4.0)
+
+    def test_travel_time_flips_for_black(self):
+        travel_time = self.model.travel_time(chess.BLACK)
+        self.assertAlmostEqual(travel_time(chess.H8, chess.H7), 3.0)
+
+    def test_failures(self):
+        self.assertAlmostEqual(self.model.failure_rate(chess.B1), 0.5)
+        self.assertEqual(self.model.failure_rate(chess.A1), 0.0)
+        self.assertEqual(
+            self.model.failing_squares(), [(chess.B1, 0.5), (chess.C3, 0.5)]
+        )
+        self.assertEqual(self.model.slowest_pairs(1), [(chess.A1, chess.A2, 3.0)])
+
+    def test_plans_quick_reset(self):
+        current = chess.Board("4k3/8/8/8/8/8/8/NQ2K3 w - - 0 1")
+        expected = chess.Board("4k3/8/8/8/8/8/8/QN2K3 w - - 0 1")
+
+        # Parks the knight on the square it reaches quickest instead of the first empty one
+        model = TravelTimeModel(min_samples=1)
+        model.fit(telemetry([(chess.A1, chess.C1, 5.0, True), (chess.A1, chess.D1, 1.0, True)]))
+        squares = plan_reset_board(current, expected, model.travel_time(chess.WHITE))
+
+        self.assertEqual(squares[0], (chess.A1, chess.D1))
+
+
+if __name__ == "__main__":
+    unittest.main()